@@ -47,7 +47,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReadYourWritesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,14 +83,65 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connections persist for DB_CONN_MAX_AGE seconds and are health checked
+# before reuse. Setting DB_POOL_MAX_SIZE instead shares up to that many
+# connections between the threads of a process; requests wait up to
+# DB_POOL_TIMEOUT seconds for one and idle connections close after
+# DB_POOL_MAX_IDLE seconds. Pooled connections go back to the pool after
+# every request, so CONN_MAX_AGE defaults to 0 then, and the pool runs the
+# health check itself on connections idle for over DB_POOL_CHECK_AFTER
+# seconds. Connecting gives up after DB_CONNECT_TIMEOUT seconds, so an
+# unreachable host fails fast instead of hanging on the OS TCP timeout.
+
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+        },
+        'CONN_MAX_AGE': int(os.environ.get(
+            'DB_CONN_MAX_AGE', 0 if DB_POOL_MAX_SIZE else 60
+        )),
+        'CONN_HEALTH_CHECKS': os.environ.get(
+            'DB_CONN_HEALTH_CHECKS', 'true'
+        ).lower() == 'true',
+        'POOL': {
+            'MAX_SIZE': DB_POOL_MAX_SIZE,
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 5)),
+            'MAX_IDLE': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'CHECK_AFTER': float(os.environ.get('DB_POOL_CHECK_AFTER', 1)),
+        },
+    }
+}
+
+# Read replicas, one alias per host in DB_REPLICA_HOSTS, share the
+# primary's other settings. Reads go to a random replica and writes to
+# the primary. After writing, a client reads from the primary for
+# DB_READ_YOUR_WRITES_WINDOW seconds. In tests replicas mirror the
+# primary.
+
+for index, host in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1
+):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['core.db.routers.PrimaryReplicaRouter']
+
+READ_YOUR_WRITES = {
+    'WINDOW': int(os.environ.get('DB_READ_YOUR_WRITES_WINDOW', 5)),
+    'COOKIE_NAME': 'db_primary',
 }
 
 
@@ -136,4 +190,103 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Shared cache. The local memory default is per process; deployments
+# running several workers should point this at memcached or Redis so
+# invalidations reach every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+}
+
+# Token to user resolution cache used by CachedTokenAuthentication.
+# BACKEND is 'django' (CACHES[CACHE_ALIAS], shared between workers) or
+# 'local' (per-process LRU). Token deletions and user updates only clear
+# the local cache of the process that made them, so other workers may
+# keep stale entries for up to user.authentication.LOCAL_MAX_TTL (5)
+# seconds, whatever TTL says.
+
+TOKEN_AUTH_CACHE = {
+    'BACKEND': os.environ.get('TOKEN_AUTH_CACHE_BACKEND', 'django'),
+    'CACHE_ALIAS': os.environ.get('TOKEN_AUTH_CACHE_ALIAS', 'default'),
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 300)),
+}
+
+# Login tokens. MODE 'opaque' issues rest_framework.authtoken tokens;
+# 'signed' issues HMAC-signed access tokens, verified without a query and
+# valid for ACCESS_TTL seconds, plus single-use refresh tokens valid for
+# REFRESH_TTL seconds. Both kinds are accepted in either mode.
+
+AUTH_TOKENS = {
+    'MODE': os.environ.get('AUTH_TOKEN_MODE', 'opaque'),
+    'ACCESS_TTL': int(os.environ.get('AUTH_ACCESS_TOKEN_TTL', 300)),
+    'REFRESH_TTL': int(os.environ.get('AUTH_REFRESH_TOKEN_TTL',
+                                      14 * 24 * 3600)),
+}
+
+# Thread pool verifying passwords for the async token endpoint. Requests
+# beyond MAX_WORKERS running plus MAX_PENDING queued get a 503.
+# Batch registration hashes batches of PARALLEL_THRESHOLD or more new
+# passwords across PROCESSES worker processes.
+
+PASSWORD_HASHER_POOL = {
+    'MAX_WORKERS': int(os.environ.get('PASSWORD_HASHER_WORKERS', 4)),
+    'MAX_PENDING': int(os.environ.get('PASSWORD_HASHER_PENDING', 16)),
+    'PROCESSES': int(os.environ.get('PASSWORD_HASHER_PROCESSES',
+                                    os.cpu_count() or 1)),
+    'PARALLEL_THRESHOLD': int(
+        os.environ.get('PASSWORD_HASHER_PARALLEL_THRESHOLD', 8)
+    ),
+}
+
+# OpenAPI schema served from memory, seeded from the ARTIFACT written by
+# the generate_schema command. Responses are cacheable for MAX_AGE
+# seconds and revalidate with their ETag.
+
+OPENAPI_SCHEMA = {
+    'ARTIFACT': os.environ.get('OPENAPI_SCHEMA_ARTIFACT',
+                               str(BASE_DIR / 'openapi-schema.json')),
+    'MAX_AGE': int(os.environ.get('OPENAPI_SCHEMA_MAX_AGE', 86400)),
+}
+
+# Request metrics served at /metrics in the Prometheus text format. Every
+# request updates the per-view latency histograms; a SAMPLE_RATE fraction
+# of them also records SQL query counts, SQL time and serializer time.
+# Scrapers must send TOKEN as a Bearer token; without one the endpoint
+# returns 404 unless DEBUG is on.
+
+METRICS = {
+    'ENABLED': os.environ.get('METRICS_ENABLED', 'true').lower() == 'true',
+    'SAMPLE_RATE': float(os.environ.get('METRICS_SAMPLE_RATE', 0.1)),
+    'TOKEN': os.environ.get('METRICS_TOKEN', ''),
+}
+
+# Opt-in request profiler. A SAMPLE_RATE fraction of requests, plus staff
+# requests sending the HEADER header, are profiled with cProfile. Staff
+# are recognised with AUTHENTICATION_CLASSES before the request runs. The
+# traces are written as gzipped .prof files to DIRECTORY, which keeps the
+# newest MAX_FILES of them. Summarize them with the profile_report command.
+
+PROFILING = {
+    'ENABLED': os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true',
+    'SAMPLE_RATE': float(os.environ.get('PROFILING_SAMPLE_RATE', 0)),
+    'HEADER': 'X-Profile',
+    'AUTHENTICATION_CLASSES': [
+        'user.authentication.SignedTokenAuthentication',
+        'user.authentication.CachedTokenAuthentication',
+    ],
+    'DIRECTORY': os.environ.get('PROFILING_DIRECTORY',
+                                str(BASE_DIR / 'profiles')),
+    'MAX_FILES': int(os.environ.get('PROFILING_MAX_FILES', 200)),
 }
@@ -16,18 +16,23 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularSwaggerView
+
+from core import views as core_views
+from core.schema import CachedSpectacularAPIView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
+    path('healthz', core_views.healthz, name='healthz'),
+    path('readyz', core_views.readyz, name='readyz'),
+    path('metrics', core_views.metrics, name='metrics'),
+    path('api/schema/', CachedSpectacularAPIView.as_view(),
+         name='api-schema'),
     path(
         'api/docs/', SpectacularSwaggerView.as_view(url_name='api-schema'),
         name='api-docs'
         ),
     path('api/user/', include('user.urls')),
+    path('api/job/', include('job.urls')),
 
 ]
@@ -8,6 +8,14 @@ from django.contrib.auth.forms import UserChangeForm
 from django import forms
 
 from core import models
+from core.paginators import EstimatedCountPaginator
+from job.search import search_jobs
+
+
+class ScaleModelAdmin(admin.ModelAdmin):
+    """Base admin for tables too large for exact counts."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class CustomUserChangeForm(UserChangeForm):
@@ -26,6 +34,10 @@ class UserAdmin(BaseUserAdmin):
     """Define the admin pages for users."""
     ordering = ['id']
     list_display = ['email', 'first_name', 'last_name', 'role']
+    list_filter = ['role']
+    search_fields = ['=email']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     form = CustomUserChangeForm
 
     fieldsets = (
@@ -79,7 +91,42 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class CompanyProfileAdmin(ScaleModelAdmin):
+    """Define the admin pages for company profiles."""
+    ordering = ['-id']
+    list_display = ['name', 'account']
+    list_select_related = ['account']
+    search_fields = ['=account__email']
+    raw_id_fields = ['account']
+
+
+class TalentProfileAdmin(ScaleModelAdmin):
+    """Define the admin pages for talent profiles."""
+    ordering = ['-id']
+    list_display = ['__str__', 'account']
+    list_select_related = ['account']
+    search_fields = ['=account__email']
+    raw_id_fields = ['account']
+
+
+class JobAdmin(ScaleModelAdmin):
+    """Define the admin pages for jobs."""
+    ordering = ['-id']
+    list_display = ['title', 'company', 'seniority', 'employment_type',
+                    'min_salary', 'max_salary']
+    list_select_related = ['company']
+    list_filter = ['seniority', 'employment_type']
+    search_fields = ['title']
+    raw_id_fields = ['company']
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search jobs through the full-text index."""
+        if not search_term.strip():
+            return queryset, False
+        return search_jobs(queryset, search_term), False
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.CompanyProfile)
-admin.site.register(models.TalentProfile)
-admin.site.register(models.Job)
+admin.site.register(models.CompanyProfile, CompanyProfileAdmin)
+admin.site.register(models.TalentProfile, TalentProfileAdmin)
+admin.site.register(models.Job, JobAdmin)
@@ -0,0 +1,180 @@
+"""
+Endpoint benchmark suite.
+
+Runs every scenario against an in-process test client, recording
+throughput, latency percentiles and queries per request, and compares
+them with a stored baseline.
+"""
+import itertools
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from core.models import Job
+from core.seed import SEED_PASSWORD, talent_email
+
+PERCENTILES = (50, 95, 99)
+
+
+class Scenario:
+    """One endpoint call repeated by the suite.
+
+    ``request`` receives the client and the iteration number and returns
+    the response. ``weight`` scales the iterations down for endpoints
+    dominated by password hashing.
+    """
+
+    def __init__(self, name, request, weight=1.0):
+        self.name = name
+        self.request = request
+        self.weight = weight
+
+
+def build_scenarios(client):
+    """Return the scenarios, with fixtures taken from seeded data."""
+    user_email = talent_email(0)
+    token, _ = Token.objects.get_or_create(
+        user=get_user_model().objects.get(email=user_email)
+    )
+    auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+    job_ids = list(Job.objects.order_by('-id')
+                   .values_list('id', flat=True)[:100])
+    cursor = client.get(reverse('job:job-list')).json().get('next')
+    emails = (f'bench{i}@bench.example.com' for i in itertools.count())
+
+    def job_id(i):
+        return job_ids[i % len(job_ids)]
+
+    return [
+        Scenario('user:create', lambda i: client.post(
+            reverse('user:create'),
+            {'email': next(emails), 'password': 'bench-pass-123',
+             'first_name': 'Bench', 'last_name': 'User',
+             'role': 'TALENT'},
+        ), weight=0.1),
+        Scenario('user:token', lambda i: client.post(
+            reverse('user:token'),
+            {'email': user_email, 'password': SEED_PASSWORD},
+        ), weight=0.1),
+        Scenario('user:me', lambda i: client.get(reverse('user:me'), **auth)),
+        Scenario('user:me-async', lambda i: client.get(
+            reverse('user:me-async'), **auth
+        )),
+        Scenario('job:job-list', lambda i: client.get(
+            reverse('job:job-list')
+        )),
+        Scenario('job:job-list:filtered', lambda i: client.get(
+            reverse('job:job-list'),
+            {'seniority': 'SR', 'salary_overlaps': '60000,90000'},
+        )),
+        Scenario('job:job-list:page-2', lambda i: client.get(cursor)),
+        Scenario('job:job-list-async', lambda i: client.get(
+            reverse('job:job-list-async')
+        )),
+        Scenario('job:job-detail', lambda i: client.get(
+            reverse('job:job-detail', args=[job_id(i)])
+        )),
+        Scenario('job:job-search', lambda i: client.get(
+            reverse('job:job-search'), {'q': 'python developer'}
+        )),
+        Scenario('job:job-facets', lambda i: client.get(
+            reverse('job:job-facets')
+        )),
+    ]
+
+
+def percentile(values, pct):
+    """Return the ``pct`` percentile of sorted ``values``."""
+    index = max(0, min(len(values) - 1,
+                       round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_scenario(scenario, iterations):
+    """Run ``scenario`` and return its measurements."""
+    count = max(1, int(iterations * scenario.weight))
+    latencies = []
+    queries = []
+    started = time.perf_counter()
+    for i in range(count):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = scenario.request(i)
+            latencies.append(time.perf_counter() - start)
+        queries.append(len(captured))
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f'{scenario.name} returned {response.status_code}: '
+                f'{response.content[:200]!r}'
+            )
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        'requests': count,
+        'throughput': round(count / elapsed, 1),
+        'queries': max(queries),
+    }
+    for pct in PERCENTILES:
+        result[f'p{pct}_ms'] = round(percentile(latencies, pct) * 1000, 3)
+    return result
+
+
+def run_suite(iterations=100, only=None):
+    """Run every scenario (or those named in ``only``)."""
+    client = Client()
+    results = {}
+    for scenario in build_scenarios(client):
+        if only and scenario.name not in only:
+            continue
+        scenario.request(0)  # Warm up caches and connections.
+        results[scenario.name] = run_scenario(scenario, iterations)
+    return results
+
+
+def compare(results, baseline):
+    """Return query regressions of ``results`` against ``baseline``.
+
+    A scenario regresses when it needs more queries per request than the
+    baseline. Query counts do not depend on the machine, so these are
+    safe to fail a build on.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: {result["queries"]} queries per request, '
+                f'baseline {expected["queries"]}'
+            )
+    return regressions
+
+
+def slowdowns(results, baseline, tolerance=0.25, min_delta_ms=1.0):
+    """Return latency slowdowns of ``results`` against ``baseline``.
+
+    A scenario slows down when its p95 latency grows by more than
+    ``tolerance`` and by at least ``min_delta_ms``, which absorbs jitter
+    on fast endpoints. Baselines without latencies are skipped.
+    """
+    found = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None or 'p95_ms' not in expected:
+            continue
+        limit = max(expected['p95_ms'] * (1 + tolerance),
+                    expected['p95_ms'] + min_delta_ms)
+        if result['p95_ms'] > limit:
+            found.append(
+                f'{name}: p95 {result["p95_ms"]:.1f} ms, '
+                f'baseline {expected["p95_ms"]:.1f} ms'
+            )
+    return found
@@ -0,0 +1,52 @@
+"""
+PostgreSQL backend drawing connections from an in-process pool.
+
+Enabled by a ``POOL`` entry with a positive ``MAX_SIZE`` in the database
+settings. Without it the backend behaves like Django's own.
+"""
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from core.db.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Postgres connection wrapper with optional pooling."""
+
+    def _get_pool(self, conn_params):
+        options = self.settings_dict.get('POOL') or {}
+        if not options.get('MAX_SIZE'):
+            return None
+        return get_pool(
+            self.alias, conn_params,
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            ),
+            options,
+        )
+
+    def get_new_connection(self, conn_params):
+        self._pool = self._get_pool(conn_params)
+        if self._pool is None:
+            return super().get_new_connection(conn_params)
+        connection = self._pool.acquire()
+        # Reused connections skip the parent method, which records the
+        # configured isolation level on the wrapper.
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get(
+                'isolation_level', IsolationLevel.READ_COMMITTED
+            )
+        )
+        return connection
+
+    def _close(self):
+        pool = getattr(self, '_pool', None)
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps a reference to the connection until the
+                # atomic block exits, so it must not be handed out again.
+                pool.discard(self.connection)
+            else:
+                pool.release(self.connection)
@@ -0,0 +1,231 @@
+"""
+In-process database connection pool.
+"""
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+# Upper bounds, in seconds, of the pool wait time histogram.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """No pooled connection became available in time."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of at most ``max_size`` DB-API connections.
+
+    Connections are opened lazily with ``connect``. Idle ones are reused
+    most recently used first, so surplus connections age out after
+    ``max_idle`` seconds, and are checked before reuse once idle for
+    ``check_after`` seconds. Broken connections are discarded and open
+    transactions are rolled back when a connection is released.
+    """
+
+    def __init__(self, connect, max_size, timeout=5.0, max_idle=300.0,
+                 check_after=1.0):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            'created': 0, 'discarded': 0, 'acquired': 0, 'waited': 0,
+            'timeouts': 0, 'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0,
+        }
+        self._wait_buckets = [0] * len(WAIT_BUCKETS)
+
+    def acquire(self):
+        """Return a connection, waiting up to ``timeout`` for one.
+
+        A connection idle for more than ``check_after`` seconds may have
+        been dropped by the server or a proxy, so it must answer
+        ``SELECT 1`` before it is handed out; otherwise it is discarded.
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        while True:
+            stale = []
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    connection, idle_for = self._take_idle(now, stale)
+                    if connection is not None:
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f'No database connection available within '
+                            f'{self.timeout:g} seconds.'
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+            for old in stale:
+                _close_quietly(old)
+            if (connection is None or idle_for <= self.check_after or
+                    _is_usable(connection)):
+                break
+            self.discard(connection)
+        with self._condition:
+            self._record_wait(time.monotonic() - start, waited)
+
+        if connection is None:
+            try:
+                connection = self.connect()
+            except BaseException:
+                self._forget()
+                raise
+            with self._condition:
+                self._stats['created'] += 1
+        return connection
+
+    def release(self, connection):
+        """Give ``connection`` back to the pool, or drop it if broken."""
+        if not _reset(connection):
+            _close_quietly(connection)
+            self._forget()
+            return
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        """Close ``connection`` and free its slot."""
+        _close_quietly(connection)
+        self._forget()
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._stats['discarded'] += len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            _close_quietly(connection)
+
+    def stats(self):
+        """Return a snapshot of the pool size and wait time metrics."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'wait_buckets': dict(zip(WAIT_BUCKETS, self._wait_buckets)),
+            })
+        return stats
+
+    def _take_idle(self, now, stale):
+        """Pop an idle connection and how long it was idle, collecting
+        expired ones."""
+        while self._idle:
+            connection, released_at = self._idle.pop()
+            if connection.closed or now - released_at > self.max_idle:
+                stale.append(connection)
+                self._size -= 1
+                self._stats['discarded'] += 1
+                continue
+            return connection, now - released_at
+        return None, None
+
+    def _forget(self):
+        with self._condition:
+            self._size -= 1
+            self._stats['discarded'] += 1
+            self._condition.notify()
+
+    def _record_wait(self, seconds, waited):
+        self._stats['acquired'] += 1
+        self._stats['waited'] += waited
+        self._stats['wait_seconds_total'] += seconds
+        self._stats['wait_seconds_max'] = max(
+            self._stats['wait_seconds_max'], seconds
+        )
+        for index, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self._wait_buckets[index] += 1
+
+
+def _reset(connection):
+    """Roll back leftover work; return whether ``connection`` is usable."""
+    if connection.closed:
+        return False
+    try:
+        # Anything but psycopg2's TRANSACTION_STATUS_IDLE (0).
+        if connection.get_transaction_status():
+            connection.rollback()
+        return not connection.get_transaction_status()
+    except Exception:
+        return False
+
+
+def _is_usable(connection):
+    """Return whether ``connection`` still answers a trivial query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        return False
+    return _reset(connection)
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def get_pool(alias, conn_params, connect, options):
+    """Return the pool for ``alias`` and its connection parameters.
+
+    Pools are keyed by the parameters too, so switching a database (as
+    the test runner does) never hands out connections to the old one.
+    """
+    key = (alias, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                connect,
+                max_size=options['MAX_SIZE'],
+                timeout=options.get('TIMEOUT', 5.0),
+                max_idle=options.get('MAX_IDLE', 300.0),
+                check_after=options.get('CHECK_AFTER', 1.0),
+            )
+        return _pools[key]
+
+
+def pool_stats():
+    """Return ``{alias: stats}`` for every pool in this process."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    stats = {}
+    for (alias, _), pool in pools:
+        stats[alias] = pool.stats()
+    return stats
+
+
+def close_pools():
+    """Close the idle connections of every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
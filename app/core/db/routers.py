@@ -0,0 +1,79 @@
+"""
+Database router sending reads to replicas and writes to the primary.
+"""
+import contextlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Whether reads in the current context must see the primary.
+_pinned = ContextVar('db_pinned', default=False)
+# Whether the current context routed a write.
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def replicas():
+    """Return the aliases of the configured read replicas."""
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def reads_from_replicas():
+    """Return whether reads in the current context go to a replica."""
+    return bool(replicas()) and not _pinned.get()
+
+
+@contextlib.contextmanager
+def use_primary():
+    """Read from the primary inside the block."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+@contextlib.contextmanager
+def routing_scope(pinned=False):
+    """Scope the routing state, e.g. to one request.
+
+    Yields a callable telling whether a write was routed in the block.
+    Pins set by writes inside the block do not outlive it.
+    """
+    pin = _pinned.set(pinned)
+    wrote = _wrote.set(False)
+    try:
+        yield _wrote.get
+    finally:
+        _wrote.reset(wrote)
+        _pinned.reset(pin)
+
+
+class PrimaryReplicaRouter:
+    """Route reads to a random replica unless pinned to the primary.
+
+    Routing a write pins the rest of the context to the primary, so code
+    reads what it just wrote. Without replicas everything uses the
+    primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not reads_from_replicas():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication.
+        return db not in replicas()
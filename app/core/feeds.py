@@ -0,0 +1,49 @@
+"""
+Helpers for reading JSONL and CSV feeds in management commands.
+"""
+import csv
+import gzip
+import io
+import json
+import sys
+
+
+class RowError(Exception):
+    """A feed row that cannot be imported."""
+
+
+def open_feed(path):
+    """Open ``path`` (``-`` for stdin) as a text stream."""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line_number, row)`` pairs lazily from ``stream``."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, RowError(f'Invalid JSON: {e}')
+            continue
+        if not isinstance(row, dict):
+            yield line_number, RowError('Expected a JSON object.')
+            continue
+        yield line_number, row
+
+
+def feed_format(path):
+    """Guess the feed format from the file extension."""
+    return 'csv' if path.removesuffix('.gz').endswith('.csv') else 'jsonl'
@@ -0,0 +1,42 @@
+"""
+Database health checks.
+"""
+import math
+
+from django.db import connections
+
+# Seconds a ping waits for a new PostgreSQL connection. libpq counts
+# whole seconds and treats anything below 2 as 2.
+PING_TIMEOUT = 2
+
+
+def ping_database(using='default', timeout=PING_TIMEOUT):
+    """Run a trivial query on database ``using``.
+
+    Much cheaper than the system checks: it only opens the connection, if
+    needed, and round-trips ``SELECT 1``. Opening a PostgreSQL connection
+    gives up after ``timeout`` seconds, so an unreachable host cannot
+    block for the OS TCP timeout. Errors from the driver propagate. A
+    connection that failed mid-query is closed so the next ping
+    reconnects.
+    """
+    connection = connections[using]
+    options = connection.settings_dict.setdefault('OPTIONS', {})
+    configured = options.get('connect_timeout')
+    limited = timeout is not None and connection.vendor == 'postgresql'
+    if limited:
+        limit = max(2, math.ceil(timeout))
+        options['connect_timeout'] = min(limit, configured or limit)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception:
+        connection.close()
+        raise
+    finally:
+        if limited:
+            if configured is None:
+                del options['connect_timeout']
+            else:
+                options['connect_timeout'] = configured
@@ -0,0 +1,33 @@
+"""
+HTTP helpers for views that build their own responses.
+"""
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.renderers import FastJSONRenderer
+
+
+def not_modified(request, etag, last_modified=None):
+    """Return a 304/412 response if the client's copy is current.
+
+    Mirrors Django's ``condition`` decorator for views that compute their
+    validators themselves, e.g. async views.
+    """
+    return get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=int(last_modified.timestamp()) if last_modified
+        else None,
+    )
+
+
+def json_response(data, status=200, etag=None, last_modified=None):
+    """Render ``data`` like the API does, with optional validators."""
+    response = HttpResponse(FastJSONRenderer().render(data), status=status,
+                            content_type='application/json')
+    if etag is not None:
+        response['ETag'] = quote_etag(etag)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
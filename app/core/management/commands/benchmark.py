@@ -0,0 +1,156 @@
+"""
+Django command to benchmark the API against seeded data.
+"""
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from core import benchmarks
+from core.models import User
+from core.seed import seed, talent_email
+
+
+class Command(BaseCommand):
+    """Django command to run the benchmark suite.
+
+    Creates a throwaway test database next to the configured one (SQLite
+    or Postgres, no other services needed), seeds it, measures every
+    scenario and fails when one needs more queries than the stored
+    baseline for the database vendor. Latency depends on the machine, so
+    p95 slowdowns are only reported unless ``--fail-on-latency`` is set.
+    """
+    help = 'Seed a test database and benchmark the API endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help='1.0 seeds 100 companies, 1000 talents and 10000 jobs.',
+        )
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument(
+            '--scenario', action='append',
+            help='Only run this scenario; may be repeated.',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(settings.BASE_DIR / 'benchmark-baseline.json'),
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Allowed relative p95 latency growth.',
+        )
+        parser.add_argument(
+            '--fail-on-latency', action='store_true',
+            help='Fail on p95 slowdowns as well as on query regressions.',
+        )
+        parser.add_argument(
+            '--require-baseline', action='store_true',
+            help='Fail when there is no baseline for the database vendor.',
+        )
+        parser.add_argument('--output', help='Write results as JSON here.')
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='Store the results as the new baseline.',
+        )
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Reuse the seeded test database between runs.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be positive.')
+        overrides = override_settings(
+            DEBUG=False,
+            DATABASE_REPLICAS=[],
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        )
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb'],
+        )
+        try:
+            with overrides:
+                self.seed(options['scale'])
+                self.stdout.write('Running scenarios...')
+                results = benchmarks.run_suite(options['iterations'],
+                                               only=options['scenario'])
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options['keepdb'],
+            )
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+        self.check_baseline(results, options)
+
+    def seed(self, scale):
+        if User.objects.filter(email=talent_email(0)).exists():
+            self.stdout.write('Reusing seeded data.')
+            return
+        counts = {
+            'companies': max(1, int(100 * scale)),
+            'talents': max(1, int(1000 * scale)),
+            'jobs': max(1, int(10000 * scale)),
+        }
+        self.stdout.write('Seeding {companies} companies, {talents} '
+                          'talents and {jobs} jobs...'.format(**counts))
+        seed(**counts)
+
+    def report(self, results):
+        header = (f'{"scenario":<26}{"req/s":>9}{"p50 ms":>9}'
+                  f'{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}')
+        self.stdout.write(header)
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<26}{result["throughput"]:>9.1f}'
+                f'{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}'
+                f'{result["p99_ms"]:>9.2f}{result["queries"]:>9}'
+            )
+
+    def check_baseline(self, results, options):
+        path = options['baseline']
+        try:
+            with open(path) as stored:
+                baseline = json.load(stored)
+        except FileNotFoundError:
+            baseline = {}
+        except ValueError as e:
+            raise CommandError(f'Cannot read baseline {path}: {e}')
+
+        vendor = connection.vendor
+        if options['update_baseline']:
+            baseline.setdefault(vendor, {}).update(results)
+            with open(path, 'w') as stored:
+                json.dump(baseline, stored, indent=2, sort_keys=True)
+                stored.write('\n')
+            self.stdout.write(self.style.SUCCESS(
+                f'Stored {vendor} baseline in {path}.'
+            ))
+            return
+        if vendor not in baseline:
+            message = f'No {vendor} baseline in {path}'
+            if options['require_baseline']:
+                raise CommandError(f'{message}.')
+            self.stdout.write(f'{message}, nothing to compare.')
+            return
+
+        regressions = benchmarks.compare(results, baseline[vendor])
+        slowdowns = benchmarks.slowdowns(results, baseline[vendor],
+                                         options['tolerance'])
+        if options['fail_on_latency']:
+            regressions += slowdowns
+        elif slowdowns:
+            self.stdout.write(self.style.WARNING(
+                'Latency slowdowns (not failing):\n' + '\n'.join(slowdowns)
+            ))
+        if regressions:
+            raise CommandError('Performance regressions:\n'
+                               + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
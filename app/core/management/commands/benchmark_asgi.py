@@ -0,0 +1,92 @@
+"""
+Django command to compare sync and async views under ASGI.
+"""
+import asyncio
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+
+# (sync URL name, async URL name) pairs that return the same data.
+VIEW_PAIRS = {
+    'job-list': ('job:job-list', 'job:job-list-async'),
+    'me': ('user:me', 'user:me-async'),
+}
+
+
+async def measure(client, path, total, concurrency, headers):
+    """Send ``total`` GETs, ``concurrency`` at a time.
+
+    Returns the elapsed seconds and the per-request latencies.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise CommandError(
+                    f'GET {path} returned {response.status_code}.'
+                )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(total)))
+    return time.perf_counter() - start, latencies
+
+
+class Command(BaseCommand):
+    """Django command to benchmark sync and async read views.
+
+    Drives the ASGI handler in-process against the configured database,
+    so the numbers cover middleware, views and ORM but no network.
+    """
+    help = 'Compare the throughput of sync and async read views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', choices=VIEW_PAIRS, default='job-list')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument(
+            '--token', default='',
+            help='Auth token, required for the "me" views.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Token {options["token"]}'
+        # The test client always sends Host: testserver.
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        with override_settings(ALLOWED_HOSTS=hosts):
+            asyncio.run(self.compare(options, headers))
+
+    async def compare(self, options, headers):
+        client = AsyncClient()
+        throughput = {}
+        for kind, name in zip(('sync', 'async'),
+                              VIEW_PAIRS[options['view']]):
+            path = reverse(name)
+            await measure(client, path, 1, 1, headers)
+            elapsed, latencies = await measure(
+                client, path, options['requests'], options['concurrency'],
+                headers,
+            )
+            throughput[kind] = options['requests'] / elapsed
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f'{kind}: {throughput[kind]:,.0f} req/s, '
+                f'p50 {statistics.median(latencies) * 1000:.1f} ms, '
+                f'p95 {p95 * 1000:.1f} ms'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'async/sync throughput: '
+            f'{throughput["async"] / throughput["sync"]:.2f}x'
+        ))
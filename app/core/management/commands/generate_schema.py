@@ -0,0 +1,49 @@
+"""
+Django command to precompute the OpenAPI schema.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import schema
+
+
+class Command(BaseCommand):
+    """Django command to write the OpenAPI schema artifact.
+
+    Run it at deploy time so the schema endpoint never introspects the
+    API while serving requests.
+    """
+    help = 'Write the OpenAPI schema artifact if it is out of date.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=None,
+            help='Artifact path, defaults to OPENAPI_SCHEMA["ARTIFACT"].',
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Fail instead of writing when the artifact is stale.',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regenerate even when the artifact is current.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options['path'] or settings.OPENAPI_SCHEMA['ARTIFACT']
+        fingerprint = schema.schema_fingerprint()
+        current = schema.load_artifact(path, fingerprint) is not None
+
+        if current and not options['force']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Schema artifact {path} is up to date.'
+            ))
+            return
+        if options['check']:
+            raise CommandError(f'Schema artifact {path} is out of date.')
+
+        schema.write_artifact(path, schema.generate_schema(), fingerprint)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote schema artifact {path}.'
+        ))
@@ -0,0 +1,130 @@
+"""
+Django command to import jobs from a JSONL or CSV feed.
+"""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from core.enums import Role
+from core.feeds import RowError, feed_format, open_feed, read_rows
+from core.models import Job, User
+from core.signals import jobs_bulk_created
+
+
+JOB_FIELDS = {'company', 'title', 'description', 'main_tasks', 'min_salary',
+              'max_salary', 'seniority', 'employment_type', 'area',
+              'skills'}
+
+
+def build_job(row):
+    """Return an unsaved, field-validated job for ``row``.
+
+    Only field-level validation runs here; the company role check that
+    ``Job.clean()`` does per row is done once per batch by the caller.
+    """
+    if None in row:
+        raise RowError('Row has more values than the header.')
+    unknown = set(row) - JOB_FIELDS
+    if unknown:
+        raise RowError(f'Unknown fields: {", ".join(sorted(unknown))}.')
+    data = dict(row)
+    try:
+        company_id = int(data.pop('company'))
+    except (KeyError, TypeError, ValueError):
+        raise RowError('A valid company id is required.')
+
+    job = Job(company_id=company_id, **data)
+    try:
+        job.clean_fields(exclude=['company'])
+    except ValidationError as e:
+        raise RowError('; '.join(
+            f'{field}: {" ".join(messages)}'
+            for field, messages in e.message_dict.items()
+        ))
+    if job.min_salary > job.max_salary:
+        raise RowError('Minimum salary cannot exceed maximum salary.')
+    return job
+
+
+class Command(BaseCommand):
+    """Django command to stream a partner job feed into the database."""
+    help = 'Import jobs from a JSONL or CSV feed in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Feed file, or - for stdin.')
+        parser.add_argument(
+            '--format', choices=['jsonl', 'csv'],
+            help='Feed format. Defaults to the file extension.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options['path']
+        fmt = options['format'] or feed_format(path)
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+        self.using = options['database']
+        self.created = self.failed = 0
+
+        try:
+            stream = open_feed(path)
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+
+        with stream:
+            batch = []
+            for line_number, row in read_rows(stream, fmt):
+                try:
+                    if isinstance(row, RowError):
+                        raise row
+                    batch.append((line_number, build_job(row)))
+                except RowError as e:
+                    self.report(line_number, e)
+                if len(batch) >= batch_size:
+                    self.flush(batch)
+                    batch = []
+            self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {self.created} jobs, skipped {self.failed} rows.'
+        ))
+
+    def report(self, line_number, error):
+        """Report a rejected row without stopping the import."""
+        self.failed += 1
+        self.stderr.write(f'Line {line_number}: {error}')
+
+    def flush(self, batch):
+        """Check company roles for ``batch`` once and insert valid jobs."""
+        if not batch:
+            return
+        company_ids = {job.company_id for _, job in batch}
+        companies = set(
+            User.objects.using(self.using)
+            .filter(pk__in=company_ids, role=Role.COMPANY)
+            .values_list('pk', flat=True)
+        )
+        jobs = []
+        for line_number, job in batch:
+            if job.company_id in companies:
+                jobs.append(job)
+            else:
+                self.report(line_number, 'Only companies can have jobs.')
+
+        if not jobs:
+            return
+        try:
+            with transaction.atomic(using=self.using):
+                Job.objects.using(self.using).bulk_create(jobs)
+                jobs_bulk_created.send(sender=Job, jobs=jobs,
+                                       using=self.using)
+        except DatabaseError as e:
+            self.failed += len(jobs)
+            self.stderr.write(
+                f'Lines {batch[0][0]}-{batch[-1][0]}: batch failed: {e}'
+            )
+            return
+        self.created += len(jobs)
@@ -0,0 +1,57 @@
+"""
+Django command to summarize stored request profiles.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import ProfileStore, aggregate
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls')
+
+
+class Command(BaseCommand):
+    """Django command printing the hottest functions across profiles.
+
+    Profiles are summed, so functions that are hot in many requests rank
+    above one-off spikes.
+    """
+    help = 'Aggregate stored request profiles and print the top functions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory', default=None,
+            help='Profile directory, defaults to PROFILING["DIRECTORY"].',
+        )
+        parser.add_argument(
+            '--view', default='',
+            help='Only include profiles whose file name contains this, '
+                 'e.g. "PATCH-user.views.ManageUserView".',
+        )
+        parser.add_argument(
+            '--sort', choices=SORT_KEYS, default='cumulative',
+            help='Order functions by this column.',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=30,
+            help='Number of functions to print.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        config = settings.PROFILING
+        store = ProfileStore(options['directory'] or config['DIRECTORY'],
+                             config['MAX_FILES'])
+        paths = [path for path in store.paths()
+                 if options['view'] in os.path.basename(path)]
+        if not paths:
+            raise CommandError(f'No profiles found in {store.directory}.')
+
+        self.stdout.write(f'Aggregated {len(paths)} profiles.')
+        report = io.StringIO()
+        stats = aggregate(paths, stream=report)
+        stats.strip_dirs().sort_stats(options['sort'])
+        stats.print_stats(options['limit'])
+        self.stdout.write(report.getvalue())
@@ -6,22 +6,55 @@ import time
 from psycopg2 import OperationalError as Psycopg2Error
 
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+from core.health import PING_TIMEOUT, ping_database
 
 
 class Command(BaseCommand):
-    """Django command to wait for database."""
+    """Django command to wait for database.
+
+    Probes with ``SELECT 1``, starting after a few tens of milliseconds
+    and doubling the delay up to ``--max-delay``, so a container notices
+    the database within one short delay of it coming up. Each probe gives
+    up on connecting when ``--timeout`` runs out.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument(
+            '--timeout', type=float, default=60,
+            help='Give up after this many seconds (0 waits forever).',
+        )
+        parser.add_argument('--initial-delay', type=float, default=0.05)
+        parser.add_argument('--max-delay', type=float, default=1.0)
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
         """Entrypoint for command."""
         self.stdout.write("Waiting for database...")
-        db_up = False
-        while db_up is False:
+        timeout = options['timeout']
+        deadline = time.monotonic() + timeout if timeout else None
+        delay = options['initial_delay']
+        while True:
+            ping_timeout = PING_TIMEOUT
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'Database unavailable after {timeout:g} seconds.'
+                    )
+                ping_timeout = min(ping_timeout, remaining)
             try:
-                self.check(databases=["default"])
-                db_up = True
+                ping_database(options['database'], timeout=ping_timeout)
+                break
             except (Psycopg2Error, OperationalError):
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
+                pass
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            self.stdout.write(
+                f"Database unavailable, waiting {delay:.2f} seconds..."
+            )
+            time.sleep(delay)
+            delay = min(delay * 2, options['max_delay'])
 
         self.stdout.write(self.style.SUCCESS('Database available!'))
@@ -0,0 +1,159 @@
+"""
+Vectorized talent to job matching over skill bitsets.
+
+Jobs and talents are encoded as packed ``uint64`` bitsets over
+``core.skills.SKILL_CODES`` and held column-wise (one contiguous array per
+64-bit word) so that scoring a candidate against every row is a handful
+of AND + popcount passes over contiguous memory.
+
+A row's score is the fraction of the job's required skills the talent
+has. Rows can additionally be restricted to seniorities within a
+tolerance of a target seniority.
+"""
+import numpy as np
+
+from core.enums import Seniority
+from core.models import Job, TalentProfile
+from core.skills import SKILL_CODES
+
+
+SENIORITY_LEVELS = {value: index
+                    for index, value in enumerate(Seniority.values)}
+
+
+class SkillEncoder:
+    """Map skill codes to bit positions in a packed bitset."""
+
+    def __init__(self, codes=SKILL_CODES):
+        self.positions = {code: index for index, code in enumerate(codes)}
+        self.words = (len(self.positions) + 63) // 64
+
+    def encode(self, codes):
+        """Return the bitset for ``codes`` as a ``(words,)`` array.
+
+        Unknown codes raise ``KeyError``.
+        """
+        bitset = np.zeros(self.words, dtype=np.uint64)
+        for code in codes:
+            position = self.positions[code]
+            bitset[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+        return bitset
+
+
+class MatchIndex:
+    """Skill bitsets for many jobs or talents, ready to be scored."""
+
+    def __init__(self, ids, bitsets, seniorities, encoder):
+        self.encoder = encoder
+        self.ids = np.asarray(ids, dtype=np.int64)
+        # (words, n): each word is contiguous across rows.
+        self.bitsets = np.ascontiguousarray(
+            np.asarray(bitsets, dtype=np.uint64).reshape(
+                len(self.ids), encoder.words
+            ).T
+        )
+        self.seniorities = np.asarray(seniorities, dtype=np.int8)
+        self.counts = np.zeros(len(self.ids), dtype=np.uint16)
+        for word in self.bitsets:
+            self.counts += np.bitwise_count(word)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, rows, encoder=None):
+        """Build an index from ``(id, skill_codes, seniority)`` rows."""
+        encoder = encoder or SkillEncoder()
+        ids, bitsets, seniorities = [], [], []
+        for row_id, codes, seniority in rows:
+            ids.append(row_id)
+            bitsets.append(encoder.encode(codes))
+            seniorities.append(SENIORITY_LEVELS.get(seniority, -1))
+        bitsets = (np.stack(bitsets) if bitsets
+                   else np.zeros((0, encoder.words), dtype=np.uint64))
+        return cls(ids, bitsets, seniorities, encoder)
+
+    def overlap(self, bitset):
+        """Return how many of ``bitset``'s skills each row shares."""
+        overlap = np.zeros(len(self), dtype=np.uint16)
+        scratch = np.empty(len(self), dtype=np.uint64)
+        counts = np.empty(len(self), dtype=np.uint8)
+        for word, value in zip(self.bitsets, bitset):
+            if not value:
+                continue
+            np.bitwise_and(word, value, out=scratch)
+            np.bitwise_count(scratch, out=counts)
+            overlap += counts
+        return overlap
+
+    def seniority_mask(self, seniority, tolerance):
+        """Return which rows are within ``tolerance`` levels of
+        ``seniority``."""
+        level = SENIORITY_LEVELS[seniority]
+        distance = np.abs(self.seniorities.astype(np.int16) - level)
+        return (self.seniorities >= 0) & (distance <= tolerance)
+
+
+def job_index(queryset=None, encoder=None):
+    """Build an index over the skills and seniority of ``queryset``'s
+    jobs (every job by default), reading only those columns."""
+    queryset = Job.objects.all() if queryset is None else queryset
+    rows = queryset.values_list('id', 'skills', 'seniority')
+    return MatchIndex.build(rows.iterator(chunk_size=2000), encoder)
+
+
+def talent_index(queryset=None, encoder=None):
+    """Build an index over the skills of ``queryset``'s talent profiles,
+    keyed by account id. Talents have no seniority."""
+    queryset = TalentProfile.objects.all() if queryset is None else queryset
+    rows = queryset.values_list('account_id', 'skills')
+    return MatchIndex.build(
+        ((pk, codes, None) for pk, codes in rows.iterator(chunk_size=2000)),
+        encoder,
+    )
+
+
+def top_k(ids, scores, k):
+    """Return the ``k`` best ``(id, score)`` pairs, best first.
+
+    Rows scoring zero are never returned.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.argsort(-scores[best], kind='stable')]
+    return [(int(ids[i]), float(scores[i])) for i in best if scores[i] > 0]
+
+
+def match_jobs(job_index, talent_codes, k=20, seniority=None,
+               seniority_tolerance=1):
+    """Score one talent against every job in ``job_index``.
+
+    A job's score is the share of its required skills the talent has.
+    """
+    talent = job_index.encoder.encode(talent_codes)
+    overlap = job_index.overlap(talent).astype(np.float32)
+    scores = np.divide(overlap, job_index.counts, out=np.zeros_like(overlap),
+                       where=job_index.counts > 0)
+    if seniority is not None:
+        scores[~job_index.seniority_mask(seniority,
+                                         seniority_tolerance)] = 0
+    return top_k(job_index.ids, scores, k)
+
+
+def match_talents(talent_index, job_codes, k=20, seniority=None,
+                  seniority_tolerance=1):
+    """Score one job against every talent in ``talent_index``.
+
+    A talent's score is the share of the job's required skills they have.
+    """
+    job = talent_index.encoder.encode(job_codes)
+    required = int(np.bitwise_count(job).sum())
+    if not required:
+        return []
+    scores = talent_index.overlap(job).astype(np.float32) / required
+    if seniority is not None:
+        scores[~talent_index.seniority_mask(seniority,
+                                            seniority_tolerance)] = 0
+    return top_k(talent_index.ids, scores, k)
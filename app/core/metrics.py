@@ -0,0 +1,262 @@
+"""
+In-process request metrics exposed in the Prometheus text format.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core.db.pool import pool_stats
+
+# Upper bounds of the histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+_sample = ContextVar('metrics_sample', default=None)
+
+
+class Counter:
+    """Monotonic count per label set."""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def lines(self):
+        for labels, value in sorted(self._values.items()):
+            yield f'{self.name}{_format(self.labels, labels)} {value:g}'
+
+
+class Histogram:
+    """Cumulative bucketed observations per label set."""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._values = {}
+
+    def observe(self, labels, value):
+        counts = self._values.get(labels)
+        if counts is None:
+            # One slot per bucket, then +Inf and the sum.
+            counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-2] += 1
+        counts[-1] += value
+
+    def lines(self):
+        names = self.labels + ('le',)
+        for labels, counts in sorted(self._values.items()):
+            total = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                total += count
+                le = '+Inf' if bound == math.inf else f'{bound:g}'
+                yield (f'{self.name}_bucket{_format(names, labels + (le,))}'
+                       f' {total}')
+            suffix = _format(self.labels, labels)
+            yield f'{self.name}_sum{suffix} {counts[-1]:g}'
+            yield f'{self.name}_count{suffix} {total}'
+
+
+class Registry:
+    """Metrics of one process, updated under a single lock.
+
+    Each worker process keeps its own registry, so Prometheus should
+    scrape workers individually or aggregate them by instance.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.requests = Counter(
+            'http_requests_total', 'Requests by view, method and status.',
+            ('view', 'method', 'status'),
+        )
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Request latency by view.',
+            ('view', 'method'), LATENCY_BUCKETS,
+        )
+        self.queries = Histogram(
+            'http_request_db_queries', 'SQL queries per sampled request.',
+            ('view',), QUERY_BUCKETS,
+        )
+        self.sql_time = Histogram(
+            'http_request_db_seconds', 'SQL time per sampled request.',
+            ('view',), LATENCY_BUCKETS,
+        )
+        self.serializer_time = Histogram(
+            'http_request_serializer_seconds',
+            'Serializer time per sampled request.',
+            ('view',), LATENCY_BUCKETS,
+        )
+
+    def reset(self):
+        """Forget every observation."""
+        with self._lock:
+            self._reset()
+
+    def record(self, view, method, status, seconds, sample=None):
+        """Record one request and, if it was sampled, its breakdown."""
+        with self._lock:
+            self.requests.inc((view, method, str(status)))
+            self.latency.observe((view, method), seconds)
+            if sample is not None:
+                self.queries.observe((view,), sample.queries)
+                self.sql_time.observe((view,), sample.sql_seconds)
+                self.serializer_time.observe((view,),
+                                             sample.serializer_seconds)
+
+    def render(self):
+        """Return every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = [self.requests, self.latency, self.queries,
+                       self.sql_time, self.serializer_time]
+            lines = []
+            for metric in metrics:
+                lines.append(f'# HELP {metric.name} {metric.documentation}')
+                lines.append(f'# TYPE {metric.name} {metric.type}')
+                lines.extend(metric.lines())
+        lines.extend(_pool_lines())
+        return '\n'.join(lines) + '\n'
+
+
+class Sample:
+    """SQL and serializer time spent by one sampled request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Time one query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - start
+
+
+registry = Registry()
+
+
+def _execute(execute, sql, params, many, context):
+    """Pass queries to the current sample, if any."""
+    sample = _sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    return sample(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_sampler(sender, connection, **kwargs):
+    """Add ``_execute`` to every database connection once.
+
+    Connections are per thread and async views run their queries in
+    ``sync_to_async`` worker threads, so the wrapper is installed where
+    each connection is opened and finds the sample through the context
+    variable, which those threads inherit.
+    """
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute)
+
+
+@contextmanager
+def sampling():
+    """Collect a ``Sample`` of the queries and serializers run inside."""
+    sample = Sample()
+    token = _sample.set(sample)
+    try:
+        yield sample
+    finally:
+        _sample.reset(token)
+
+
+@contextmanager
+def serializer_timer():
+    """Add the time spent inside to the current sample, if any.
+
+    Nested serializers are only counted once, by the outermost call.
+    """
+    sample = _sample.get()
+    if sample is None or sample.serializer_depth:
+        yield
+        return
+    sample.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.serializer_seconds += time.perf_counter() - start
+        sample.serializer_depth -= 1
+
+
+def _format(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"'
+                     for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value):
+    return (str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+
+
+def _pool_lines():
+    """Gauges and counters of the database connection pools."""
+    stats = pool_stats()
+    if not stats:
+        return []
+    gauges = {
+        'db_pool_connections_in_use': 'in_use',
+        'db_pool_connections_idle': 'idle',
+        'db_pool_max_size': 'max_size',
+    }
+    counters = {
+        'db_pool_acquired_total': 'acquired',
+        'db_pool_timeouts_total': 'timeouts',
+        'db_pool_wait_seconds_total': 'wait_seconds_total',
+    }
+    lines = []
+    for kind, metrics in (('gauge', gauges), ('counter', counters)):
+        for name, key in metrics.items():
+            lines.append(f'# TYPE {name} {kind}')
+            for alias, values in sorted(stats.items()):
+                lines.append(f'{name}{_format(("alias",), (alias,))} '
+                             f'{values[key]:g}')
+    # The pool keeps cumulative bucket counts already.
+    name = 'db_pool_wait_seconds'
+    lines.append(f'# TYPE {name} histogram')
+    for alias, values in sorted(stats.items()):
+        buckets = sorted(values['wait_buckets'].items())
+        for bound, count in buckets + [('+Inf', values['acquired'])]:
+            le = bound if bound == '+Inf' else f'{bound:g}'
+            labels = _format(('alias', 'le'), (alias, le))
+            lines.append(f'{name}_bucket{labels} {count}')
+        suffix = _format(('alias',), (alias,))
+        lines.append(f'{name}_sum{suffix} {values["wait_seconds_total"]:g}')
+        lines.append(f'{name}_count{suffix} {values["acquired"]}')
+    return lines
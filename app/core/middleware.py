@@ -0,0 +1,184 @@
+"""
+Middleware shared by the APIs.
+"""
+import cProfile
+import random
+import time
+from contextlib import nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from core import metrics
+from core.db.routers import routing_scope
+from core.profiling import ProfileStore
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Methods recorded under their own metrics label; the rest share 'other'.
+METRIC_METHODS = frozenset(SAFE_METHODS + (
+    'POST', 'PUT', 'PATCH', 'DELETE', 'TRACE', 'CONNECT',
+))
+
+
+class ReadYourWritesMiddleware:
+    """Keep a client's reads on the primary for a while after it writes.
+
+    Unsafe requests read from the primary throughout. A request that
+    writes sets a cookie pinning the client's reads to the primary for
+    ``READ_YOUR_WRITES['WINDOW']`` seconds, which should exceed the
+    replication lag.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing_scope(self.pinned(request)) as wrote:
+            response = self.get_response(request)
+            self.stick(request, response, wrote())
+        return response
+
+    async def __acall__(self, request):
+        with routing_scope(self.pinned(request)) as wrote:
+            response = await self.get_response(request)
+            self.stick(request, response, wrote())
+        return response
+
+    def pinned(self, request):
+        """Return whether ``request`` must read from the primary."""
+        cookie = settings.READ_YOUR_WRITES['COOKIE_NAME']
+        return request.method not in SAFE_METHODS or cookie in request.COOKIES
+
+    def stick(self, request, response, wrote):
+        """Pin the client to the primary if the request wrote."""
+        if wrote:
+            config = settings.READ_YOUR_WRITES
+            response.set_cookie(
+                config['COOKIE_NAME'], '1', max_age=config['WINDOW'],
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+
+
+class MetricsMiddleware:
+    """Record per-view latency and, for sampled requests, SQL and
+    serializer time.
+
+    Every request costs two clock reads and one locked update.
+    ``METRICS['SAMPLE_RATE']`` of them additionally count and time their
+    queries, in whichever thread runs them.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.METRICS['SAMPLE_RATE']
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with self.sampling() as sample:
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, sample)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with self.sampling() as sample:
+            response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, sample)
+        return response
+
+    def sampling(self):
+        if self.sample_rate and random.random() < self.sample_rate:
+            return metrics.sampling()
+        return nullcontext()
+
+    def record(self, request, response, seconds, sample):
+        match = request.resolver_match
+        view = match._func_path if match else 'unmatched'
+        method = (request.method if request.method in METRIC_METHODS
+                  else 'other')
+        metrics.registry.record(view, method, response.status_code,
+                                seconds, sample)
+
+
+class ProfilingMiddleware:
+    """Capture a cProfile trace of sampled or explicitly requested
+    requests.
+
+    ``PROFILING['SAMPLE_RATE']`` of requests are profiled, as are staff
+    requests carrying the ``PROFILING['HEADER']`` header, whose profile's
+    file name is returned in the same header. The header is ignored
+    unless the request authenticates as staff before the view runs, so
+    other clients cannot add profiler overhead. Async requests are not
+    profiled because the profiler would also trace every other task on
+    the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.PROFILING
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        self.header = config['HEADER']
+        self.authenticators = [import_string(path)
+                               for path in config['AUTHENTICATION_CLASSES']]
+        self.store = ProfileStore(config['DIRECTORY'], config['MAX_FILES'])
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        requested = self.requested_by_staff(request)
+        sampled = bool(self.sample_rate) and random.random() < self.sample_rate
+        if not (requested or sampled):
+            return self.get_response(request)
+
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.disable()
+        seconds = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match._func_path if match else 'unmatched'
+        name = self.store.save(profile, f'{request.method}-{view}', seconds)
+        if requested:
+            response[self.header] = name
+        return response
+
+    def requested_by_staff(self, request):
+        """Return whether a staff user sent the profiling header."""
+        if self.header not in request.headers:
+            return False
+        api_request = Request(request, authenticators=[
+            authenticator() for authenticator in self.authenticators
+        ])
+        try:
+            user = api_request.user
+        except APIException:
+            return False
+        return bool(user and user.is_staff)
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-18 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['seniority', 'employment_type', '-id'], name='job_sen_emp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employment_type', '-id'], name='job_emp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['min_salary', 'max_salary'], name='job_salary_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_job ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(main_tasks, '')), 'C')
+    ) STORED
+    """,
+    'CREATE INDEX job_search_vector_idx ON core_job '
+    'USING gin (search_vector)',
+]
+
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS job_search_vector_idx',
+    'ALTER TABLE core_job DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE core_job_fts USING fts5("
+    "title, description, main_tasks, tokenize='porter unicode61')",
+    'INSERT INTO core_job_fts (rowid, title, description, main_tasks) '
+    'SELECT id, title, description, main_tasks FROM core_job',
+]
+
+SQLITE_BACKWARD = [
+    'DROP TABLE IF EXISTS core_job_fts',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(
+            schema_editor.connection.vendor, []
+        )
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_job_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD,
+                  'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD,
+                  'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-18 03:10
+
+from django.db import migrations, models
+
+
+def create_range_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX job_salary_range_idx ON core_job '
+        "USING gist (int4range(min_salary, max_salary, '[]'))"
+    )
+
+
+def drop_range_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS job_salary_range_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_job_search'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.CheckConstraint(check=models.Q(('min_salary__lte', models.F('max_salary'))), name='job_salary_range_valid', violation_error_message='Minimum salary cannot exceed maximum salary.'),
+        ),
+        migrations.RunPython(create_range_index, drop_range_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='CompanySummary',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='hiring_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('job_count', models.IntegerField(default=0)),
+                ('seniority', models.JSONField(default=dict)),
+                ('employment_type', models.JSONField(default=dict)),
+                ('min_salaries', models.JSONField(default=dict)),
+                ('max_salaries', models.JSONField(default=dict)),
+                ('daily_jobs', models.JSONField(default=dict)),
+                ('last_activity_at', models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_companysummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalarySketchBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=32)),
+                ('value', models.CharField(max_length=32)),
+                ('bound', models.CharField(max_length=16)),
+                ('bucket', models.IntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='area',
+            field=models.CharField(blank=True, choices=[('ITS', 'IT Support'), ('WEB', 'Web Development'), ('BACKEND', 'Backend Development'), ('FRONTEND', 'Frontend Development'), ('FULLSTACK', 'Full Stack Development'), ('DEVOPS', 'DevOps'), ('DBA', 'Database Administration'), ('SEC', 'Security'), ('NET', 'Networking'), ('CLOUD', 'Cloud Computing'), ('DATA', 'Data Science'), ('ML', 'Machine Learning'), ('AI', 'Artificial Intelligence'), ('MOBILE', 'Mobile Development'), ('GAME', 'Game Development'), ('SOFTENG', 'Software Engineering'), ('SYSADMIN', 'System Administration'), ('QA', 'QA & Testing'), ('PM', 'Project Management'), ('PRODMAN', 'Product Management'), ('UIUX', 'UI/UX Design'), ('TECHWRITE', 'Technical Writing'), ('BA', 'Business Analysis'), ('TECHSUP', 'Technical Support'), ('CONSULT', 'Consulting'), ('SALESENG', 'Sales Engineering'), ('ITTRAIN', 'IT Training')], default='', max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='salarysketchbucket',
+            constraint=models.UniqueConstraint(fields=('dimension', 'value', 'bound', 'bucket'), name='salary_sketch_bucket_unique'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-18 04:14
+
+import core.models
+from django.db import migrations
+
+
+SKILL_INDEXES = [
+    ('job_skills_idx', 'core_job'),
+    ('talent_skills_idx', 'core_talentprofile'),
+]
+
+
+def create_skill_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in SKILL_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON {table} USING gin (skills)'
+        )
+
+
+def drop_skill_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in SKILL_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_salary_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='skills',
+            field=core.models.SkillsField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='talentprofile',
+            name='skills',
+            field=core.models.SkillsField(blank=True, default=list, expand_languages=True),
+        ),
+        migrations.RunPython(create_skill_indexes, drop_skill_indexes),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.6 on 2026-10-18 05:20
+
+import math
+
+from django.db import migrations, models
+
+
+# Must match job.summaries.SALARY_ACCURACY.
+RELATIVE_ACCURACY = 0.01
+SALARY_FIELDS = {'min_salaries': 'min_salary', 'max_salaries': 'max_salary'}
+
+
+def bucket(amount):
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    return math.ceil(math.log(max(amount, 1)) / math.log(gamma))
+
+
+def to_sketches(apps, schema_editor):
+    """Replace ``{amount: count}`` salary maps with sketch buckets."""
+    CompanySummary = apps.get_model('core', 'CompanySummary')
+    summaries = CompanySummary.objects.using(schema_editor.connection.alias)
+    for summary in summaries.iterator():
+        for field, attname in SALARY_FIELDS.items():
+            amounts = {int(amount): count
+                       for amount, count in getattr(summary, field).items()
+                       if count > 0}
+            counts = {}
+            for amount, count in amounts.items():
+                key = str(bucket(amount))
+                counts[key] = counts.get(key, 0) + count
+            setattr(summary, field, counts)
+            if amounts:
+                summary.salary_range[attname] = [min(amounts), max(amounts)]
+        summary.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_skills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companysummary',
+            name='salary_range',
+            field=models.JSONField(default=dict),
+        ),
+        # Exact amounts cannot be recovered from buckets; going back needs
+        # rebuild_company_summaries.
+        migrations.RunPython(to_sketches, migrations.RunPython.noop),
+    ]
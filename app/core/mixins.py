@@ -0,0 +1,49 @@
+"""
+Reusable view mixins.
+"""
+from rest_framework.response import Response
+
+from core.metrics import serializer_timer
+
+
+class ValuesListMixin:
+    """Read-only list path that builds rows from ``QuerySet.values()``.
+
+    Skips model instantiation and per-field serializer calls. Only use it
+    with serializers whose fields are plain model columns that render
+    unchanged, so the output matches the serializer's.
+    """
+
+    def get_values_fields(self):
+        """Return the columns to read, taken from the serializer."""
+        return self.get_serializer_class().Meta.fields
+
+    def get_rows(self, queryset):
+        """Return ``queryset`` as dictionaries of the serializer fields."""
+        return queryset.values(*self.get_values_fields())
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+
+        return Response(list(rows))
+
+
+class TimedSerializerMixin:
+    """Count a serializer's validation, saving and rendering time
+    towards the request metrics when the request is sampled."""
+
+    def run_validation(self, *args, **kwargs):
+        with serializer_timer():
+            return super().run_validation(*args, **kwargs)
+
+    def to_representation(self, *args, **kwargs):
+        with serializer_timer():
+            return super().to_representation(*args, **kwargs)
+
+    def save(self, **kwargs):
+        with serializer_timer():
+            return super().save(**kwargs)
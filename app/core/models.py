@@ -1,8 +1,14 @@
 """
 Database models.
 """
+import json
+
 from django.conf import settings
-from django.db import models
+from django.db import connections, models
+from django.db.models.functions import Cast, Upper
+from django.utils import timezone
+from django.contrib.postgres.fields import ArrayField, IntegerRangeField
+from django.db.backends.postgresql.psycopg_any import NumericRange
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -10,7 +16,8 @@ from django.contrib.auth.models import (
     PermissionsMixin
 )
 
-from core.enums import Role, Seniority, Employment
+from core.enums import Area, Role, Seniority, Employment
+from core.skills import SKILL_CODE_SET, language_codes_from, normalize_codes
 
 
 class UserManager(BaseUserManager):
@@ -50,6 +57,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     role = models.CharField(max_length=255, choices=Role.choices)
 
     objects = UserManager()
@@ -57,6 +65,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
 
+    class Meta:
+        indexes = [
+            # Serves case-insensitive email lookups (admin search).
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+            models.Index(fields=['role', 'id'], name='user_role_id_idx'),
+        ]
+
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -92,11 +107,134 @@ class CompanyProfile(models.Model):
         return f"COMPANY | {self.name}"
 
 
+class SkillsField(ArrayField):
+    """Skill codes from ``core.skills``, kept sorted and unique.
+
+    Stored as a ``varchar[]`` with a GIN index on PostgreSQL and as a
+    JSON array in a text column elsewhere. Besides lists, it accepts a
+    JSON array or comma separated codes, as found in import feeds.
+    """
+
+    def __init__(self, expand_languages=False, **kwargs):
+        self.expand_languages = expand_languages
+        kwargs['base_field'] = models.CharField(max_length=16)
+        kwargs.setdefault('default', list)
+        kwargs.setdefault('blank', True)
+        super().__init__(**kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['base_field']
+        if kwargs.get('size') is None:
+            kwargs.pop('size', None)
+        if self.expand_languages:
+            kwargs['expand_languages'] = True
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return super().db_type(connection)
+        return 'text'
+
+    def cast_db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return super().cast_db_type(connection)
+        return models.TextField().cast_db_type(connection)
+
+    def get_placeholder(self, value, compiler, connection):
+        if connection.vendor == 'postgresql':
+            return super().get_placeholder(value, compiler, connection)
+        return '%s'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if connection.vendor == 'postgresql' or value is None:
+            return super().get_db_prep_value(value, connection, prepared)
+        return json.dumps(list(value))
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    def to_python(self, value):
+        if isinstance(value, str) and not value.startswith('['):
+            value = [code.strip() for code in value.split(',')
+                     if code.strip()]
+        return super().to_python(value)
+
+    def validate(self, value, model_instance):
+        super().validate(value, model_instance)
+        unknown = sorted(set(value or []) - SKILL_CODE_SET)
+        if unknown:
+            raise ValidationError(
+                'Unknown skill codes: %(codes)s.',
+                code='invalid_skill',
+                params={'codes': ', '.join(unknown)},
+            )
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if value is not None:
+            value = normalize_codes(value, self.expand_languages)
+            setattr(model_instance, self.attname, value)
+        return value
+
+
+class SkillQuerySet(models.QuerySet):
+    """Queryset for models with a ``skills`` field.
+
+    On PostgreSQL the filters are array containment and overlap, which
+    the GIN index answers. Other backends match the quoted codes in the
+    stored JSON text instead.
+    """
+
+    def _uses_arrays(self):
+        return connections[self.db].vendor == 'postgresql'
+
+    def _code_filters(self, codes):
+        return [models.Q(skills_text__contains=json.dumps(code))
+                for code in codes]
+
+    def _skills_text(self):
+        return self.alias(skills_text=Cast('skills', models.TextField()))
+
+    def has_all_skills(self, codes):
+        """Rows holding every one of ``codes``."""
+        codes = sorted(set(codes))
+        if self._uses_arrays():
+            return self.filter(skills__contains=codes)
+        queryset = self._skills_text()
+        for condition in self._code_filters(codes):
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def has_any_skills(self, codes):
+        """Rows holding at least one of ``codes``."""
+        codes = sorted(set(codes))
+        if not codes:
+            return self.none()
+        if self._uses_arrays():
+            return self.filter(skills__overlap=codes)
+        condition = models.Q()
+        for code in self._code_filters(codes):
+            condition |= code
+        return self._skills_text().filter(condition)
+
+    def speaks(self, language, level):
+        """Rows with ``language`` at ``level`` or better: talents who
+        speak it that well, or jobs asking for at least that level."""
+        return self.has_any_skills(language_codes_from(language, level))
+
+
 class TalentProfile(models.Model):
     """Profile for talent users."""
     account = models.OneToOneField(User, on_delete=models.CASCADE,
                                    related_name='talent_profile')
     profile_description = models.TextField()
+    # Languages are stored with every level up to the talent's own.
+    skills = SkillsField(expand_languages=True)
+
+    objects = SkillQuerySet.as_manager()
 
     def clean(self, *args, **kwargs):
         if self.account.role != Role.TALENT:
@@ -111,6 +249,40 @@ class TalentProfile(models.Model):
         return f"TALENT | {self.account.get_full_name()}"
 
 
+class SalaryRange(models.Func):
+    """Inclusive ``int4range`` over a job's salary bounds (PostgreSQL)."""
+    function = 'int4range'
+    output_field = IntegerRangeField()
+
+    def __init__(self, **extra):
+        super().__init__(models.F('min_salary'), models.F('max_salary'),
+                         models.Value('[]'), **extra)
+
+
+class JobQuerySet(SkillQuerySet):
+    """Queryset for jobs."""
+
+    def _uses_ranges(self):
+        return connections[self.db].vendor == 'postgresql'
+
+    def salary_overlaps(self, lower, upper):
+        """Jobs whose salary range shares at least one value with
+        [lower, upper]."""
+        if self._uses_ranges():
+            return self.alias(salary_range=SalaryRange()).filter(
+                salary_range__overlap=NumericRange(lower, upper, '[]')
+            )
+        return self.filter(min_salary__lte=upper, max_salary__gte=lower)
+
+    def salary_contains(self, lower, upper):
+        """Jobs whose salary range fully covers [lower, upper]."""
+        if self._uses_ranges():
+            return self.alias(salary_range=SalaryRange()).filter(
+                salary_range__contains=NumericRange(lower, upper, '[]')
+            )
+        return self.filter(min_salary__lte=lower, max_salary__gte=upper)
+
+
 class Job(models.Model):
     """Job object."""
     company = models.ForeignKey(
@@ -126,6 +298,35 @@ class Job(models.Model):
     seniority = models.CharField(max_length=255, choices=Seniority.choices)
     employment_type = models.CharField(max_length=255,
                                        choices=Employment.choices)
+    area = models.CharField(max_length=255, choices=Area.choices,
+                            blank=True, default='')
+    # Required skills; a language is required at a single minimum level.
+    skills = SkillsField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        # Every index ends with the keyset pagination column so filtered
+        # listings can seek straight to the requested page.
+        indexes = [
+            models.Index(fields=['seniority', 'employment_type', '-id'],
+                         name='job_sen_emp_id_idx'),
+            models.Index(fields=['employment_type', '-id'],
+                         name='job_emp_id_idx'),
+            models.Index(fields=['min_salary', 'max_salary'],
+                         name='job_salary_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(min_salary__lte=models.F('max_salary')),
+                name='job_salary_range_valid',
+                violation_error_message=(
+                    'Minimum salary cannot exceed maximum salary.'
+                ),
+            ),
+        ]
 
     def clean(self, *args, **kwargs):
         if self.company.role != Role.COMPANY:
@@ -138,3 +339,133 @@ class Job(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class JobFacetCount(models.Model):
+    """Number of jobs per facet value, maintained incrementally."""
+    facet = models.CharField(max_length=32)
+    value = models.CharField(max_length=32)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'],
+                                    name='job_facet_value_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+
+class SalarySketchBucket(models.Model):
+    """Number of jobs in one bucket of a salary quantile sketch.
+
+    A sketch covers one salary ``bound`` of the jobs with ``value`` in
+    ``dimension``; see ``core.sketches.QuantileSketch``.
+    """
+    dimension = models.CharField(max_length=32)
+    value = models.CharField(max_length=32)
+    bound = models.CharField(max_length=16)
+    bucket = models.IntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dimension', 'value', 'bound', 'bucket'],
+                name='salary_sketch_bucket_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return (f"{self.dimension}={self.value} {self.bound}"
+                f"[{self.bucket}]: {self.count}")
+
+
+class CompanySummary(models.Model):
+    """Hiring dashboard figures of one company, maintained incrementally.
+
+    Distributions are stored as ``{value: job count}`` maps and salaries
+    as ``{sketch bucket: job count}`` maps with their exact range, so job
+    updates and deletes can be undone without rescanning the company's
+    jobs.
+    """
+    company = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='hiring_summary',
+    )
+    job_count = models.IntegerField(default=0)
+    seniority = models.JSONField(default=dict)
+    employment_type = models.JSONField(default=dict)
+    min_salaries = models.JSONField(default=dict)
+    max_salaries = models.JSONField(default=dict)
+    # ``{'min_salary': [lowest, highest], 'max_salary': [...]}``.
+    salary_range = models.JSONField(default=dict)
+    # Jobs still listed, by the day they were posted, for recent days only.
+    daily_jobs = models.JSONField(default=dict)
+    last_activity_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"Summary of company {self.company_id}"
+
+
+class CollectionVersion(models.Model):
+    """Version counter bumped whenever a collection changes.
+
+    Lets list endpoints answer conditional requests from a single row
+    instead of looking at the collection itself.
+    """
+    JOBS = 'jobs'
+
+    name = models.CharField(max_length=64, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def bump(cls, name, using='default'):
+        """Increment the version of collection ``name``."""
+        now = timezone.now()
+        manager = cls.objects.using(using)
+        updated = manager.filter(name=name).update(
+            version=models.F('version') + 1, updated_at=now
+        )
+        if not updated:
+            manager.get_or_create(name=name)
+            manager.filter(name=name).update(
+                version=models.F('version') + 1, updated_at=now
+            )
+
+    @classmethod
+    def current(cls, name, using=None):
+        """Return ``(version, updated_at)`` of collection ``name``."""
+        row = cls.objects.using(using).filter(name=name).values_list(
+            'version', 'updated_at'
+        ).first()
+        return row or (0, None)
+
+    @classmethod
+    async def acurrent(cls, name, using=None):
+        """Async version of ``current``."""
+        row = await cls.objects.using(using).filter(name=name).values_list(
+            'version', 'updated_at'
+        ).afirst()
+        return row or (0, None)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class RevokedToken(models.Model):
+    """Signed token that must no longer be accepted.
+
+    Rows are only needed until the token would have expired anyway, so
+    the table stays as small as the number of recent logouts and
+    refreshes.
+    """
+    jti = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,58 @@
+"""
+Paginators for large tables.
+"""
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for ``queryset``, or None.
+
+    Unfiltered querysets read the table statistics from ``pg_class``;
+    filtered ones ask ``EXPLAIN`` for the plan's row estimate. Only
+    PostgreSQL is supported.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # reltuples is -1 until the table is first analyzed.
+            if row is None or row[0] < 0:
+                return None
+            return row[0]
+
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses estimated counts for large result sets.
+
+    An exact ``COUNT(*)`` only runs when the estimate is below
+    ``exact_count_threshold`` rows or no estimate is available.
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = None
+        if hasattr(self.object_list, 'query'):
+            estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
@@ -0,0 +1,78 @@
+"""
+Request profiles stored as compressed cProfile dumps.
+"""
+import gzip
+import marshal
+import os
+import pstats
+import re
+import time
+import uuid
+
+SUFFIX = '.prof.gz'
+
+
+class ProfileStore:
+    """Directory of at most ``max_files`` gzipped profiles.
+
+    File names start with the capture time, so the oldest profiles are
+    the first ones in sorted order and are the ones evicted.
+    """
+
+    def __init__(self, directory, max_files):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, profile, label, seconds):
+        """Write ``profile`` and return the new file name."""
+        os.makedirs(self.directory, exist_ok=True)
+        name = (f'{time.strftime("%Y%m%dT%H%M%S")}-{uuid.uuid4().hex[:8]}-'
+                f'{_slug(label)}-{seconds * 1000:.0f}ms{SUFFIX}')
+        profile.create_stats()
+        with gzip.open(os.path.join(self.directory, name), 'wb') as dump:
+            marshal.dump(profile.stats, dump)
+        self.prune()
+        return name
+
+    def paths(self):
+        """Return the stored profile paths, oldest first."""
+        try:
+            names = sorted(name for name in os.listdir(self.directory)
+                           if name.endswith(SUFFIX))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names]
+
+    def prune(self):
+        """Delete the oldest profiles beyond ``max_files``."""
+        paths = self.paths()
+        for path in paths[:max(len(paths) - self.max_files, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class _Dump:
+    """Loaded profile in the shape ``pstats.Stats`` accepts."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def load(path):
+    """Return the raw profile stored at ``path``."""
+    with gzip.open(path, 'rb') as dump:
+        return _Dump(marshal.load(dump))
+
+
+def aggregate(paths, stream=None):
+    """Return ``pstats.Stats`` summing every profile in ``paths``."""
+    return pstats.Stats(*(load(path) for path in paths), stream=stream)
+
+
+def _slug(label):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_')[:80]
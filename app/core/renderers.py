@@ -0,0 +1,30 @@
+"""
+Renderers shared by the APIs.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson when it is installed.
+
+    Falls back to the stock renderer when orjson is missing or the client
+    asks for indented output.
+    """
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        indent = self.get_indent(accepted_media_type or '',
+                                 renderer_context or {})
+        if indent:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        return orjson.dumps(data, default=self.encoder.default)
@@ -0,0 +1,180 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is
+built once per code version and kept in a small in-memory LRU.
+``generate_schema`` writes it to an artifact at deploy time, which the
+first request loads instead of introspecting.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from importlib import import_module
+from pathlib import Path
+
+import drf_spectacular
+from django.conf import settings
+from django.apps import apps
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+
+# Parts of an app that cannot change the schema.
+SKIPPED_DIRS = {'tests', 'migrations', 'management'}
+# Schemas and rendered responses kept per version, language and format.
+MAX_CACHED = 8
+
+_fingerprint = None
+_schemas = OrderedDict()
+_rendered = OrderedDict()
+
+
+def _cached(cache, key, build):
+    """Return ``cache[key]``, building it and evicting the oldest entry."""
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = cache[key] = build()
+    while len(cache) > MAX_CACHED:
+        cache.popitem(last=False)
+    return value
+
+
+def _source_files():
+    """Return the project sources the schema is derived from."""
+    base = Path(settings.BASE_DIR).resolve()
+    files = {Path(import_module(settings.ROOT_URLCONF).__file__).resolve()}
+    for config in apps.get_app_configs():
+        path = Path(config.path).resolve()
+        if not path.is_relative_to(base):
+            continue
+        files.update(
+            source for source in path.rglob('*.py')
+            if not SKIPPED_DIRS.intersection(source.relative_to(path).parts)
+        )
+    return base, sorted(files)
+
+
+def schema_fingerprint():
+    """Return a hash of everything the schema depends on.
+
+    Covers the URLconf, views, serializers and models of the project
+    apps plus the drf-spectacular version and settings and the REST
+    framework settings.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+        digest.update(drf_spectacular.__version__.encode())
+        digest.update(repr(sorted(
+            getattr(settings, 'SPECTACULAR_SETTINGS', {}).items()
+        )).encode())
+        digest.update(repr(sorted(
+            getattr(settings, 'REST_FRAMEWORK', {}).items()
+        )).encode())
+        base, files = _source_files()
+        for path in files:
+            digest.update(str(path.relative_to(base)).encode())
+            digest.update(path.read_bytes())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+def clear_schema_cache():
+    """Forget the fingerprint and every cached schema."""
+    global _fingerprint
+    _fingerprint = None
+    _schemas.clear()
+    _rendered.clear()
+
+
+def generate_schema(version=None):
+    """Introspect the API and return the schema as a dictionary."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        api_version=version
+    )
+    return generator.get_schema(request=None, public=True)
+
+
+def write_artifact(path, schema, fingerprint):
+    """Atomically write ``schema`` and its fingerprint to ``path``."""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as artifact:
+        json.dump({'fingerprint': fingerprint, 'schema': schema}, artifact)
+    os.replace(tmp, path)
+
+
+def load_artifact(path, fingerprint):
+    """Return the schema stored at ``path`` if it is still current."""
+    try:
+        with open(path) as artifact:
+            data = json.load(artifact)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('fingerprint') != fingerprint:
+        return None
+    return data.get('schema')
+
+
+def get_schema(version=None):
+    """Return the schema for ``version`` in the active language."""
+    fingerprint = schema_fingerprint()
+    language = translation.get_language()
+
+    def build():
+        schema = None
+        if version is None and language == settings.LANGUAGE_CODE:
+            schema = load_artifact(settings.OPENAPI_SCHEMA['ARTIFACT'],
+                                   fingerprint)
+        return schema or generate_schema(version)
+
+    return _cached(_schemas, (fingerprint, version, language), build)
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """Schema view serving a precomputed schema with HTTP caching.
+
+    Unknown ``?version=`` values are rejected and responses are rendered
+    for the renderer's own media type, so clients cannot grow the cache.
+    """
+
+    def _get_version_parameter(self, request):
+        version = request.GET.get('version')
+        if version and version not in (api_settings.ALLOWED_VERSIONS or ()):
+            raise NotFound('Invalid version.')
+        return version or None
+
+    def _get_schema_response(self, request):
+        if not self.serve_public or self.urlconf or self.patterns:
+            return super()._get_schema_response(request)
+
+        version = (self.api_version or request.version
+                   or self._get_version_parameter(request))
+        renderer = request.accepted_renderer
+        key = (schema_fingerprint(), version, translation.get_language(),
+               renderer.format)
+        tag = hashlib.md5(repr(key).encode(), usedforsecurity=False)
+        etag = f'"{tag.hexdigest()}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content = _cached(_rendered, key, lambda: renderer.render(
+                get_schema(version), renderer.media_type,
+                self.get_renderer_context(),
+            ))
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(content, content_type=content_type)
+            response['Content-Disposition'] = (
+                f'inline; filename="{self._get_filename(request, version)}"'
+            )
+        response['ETag'] = etag
+        patch_cache_control(response, public=True,
+                            max_age=settings.OPENAPI_SCHEMA['MAX_AGE'])
+        return response
@@ -0,0 +1,243 @@
+"""
+Realistic synthetic data for benchmarks and local development.
+"""
+import io
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import NotSupportedError, connections, transaction
+
+from core.enums import (
+    Area, Employment, LangProf, LangSkill, PersSkill, Role, Seniority,
+    TechSkill,
+)
+from core.models import CompanyProfile, Job, TalentProfile, User
+from core.signals import jobs_bulk_created
+from core.skills import language_code
+
+SEED_PASSWORD = 'seed-pass-123'
+
+TECHNOLOGIES = ['Python', 'Django', 'Java', 'Go', 'React', 'TypeScript',
+                'Kubernetes', 'PostgreSQL', 'Rust', 'Kotlin', 'Swift',
+                'AWS', 'Terraform', 'Spark', 'Node.js', 'C#']
+ROLES = ['Developer', 'Engineer', 'Architect', 'Consultant', 'Analyst',
+         'Administrator', 'Specialist']
+TASKS = ['design APIs', 'review code', 'mentor colleagues',
+         'run deployments', 'tune databases', 'write tests',
+         'plan releases', 'talk to customers', 'automate pipelines']
+# Weights for seniority and employment, roughly like a real job board.
+SENIORITY_WEIGHTS = {
+    Seniority.INTERN: 3, Seniority.JUNIOR: 15, Seniority.MID_LEVEL: 30,
+    Seniority.SENIOR: 30, Seniority.LEAD: 10, Seniority.PRINCIPAL: 3,
+    Seniority.ARCHITECT: 3, Seniority.MANAGER: 4, Seniority.DIRECTOR: 1,
+    Seniority.VICE_PRESIDENT: 0.5, Seniority.C_LEVEL: 0.5,
+}
+EMPLOYMENT_WEIGHTS = {
+    Employment.FULL_TIME: 60, Employment.PART_TIME: 8,
+    Employment.CONTRACT: 12, Employment.FREELANCE: 6,
+    Employment.INTERNSHIP: 3, Employment.TEMPORARY: 2,
+    Employment.REMOTE: 9,
+}
+
+
+def random_skills(rng, technical, personal):
+    """Return random technical and personal skills and one language at a
+    random level."""
+    return (rng.sample(TechSkill.values, technical) +
+            rng.sample(PersSkill.values, personal) +
+            [language_code(rng.choice(LangSkill.values),
+                           rng.choice(LangProf.values))])
+
+
+def company_email(index):
+    return f'company{index}@seed.example.com'
+
+
+def talent_email(index):
+    return f'talent{index}@seed.example.com'
+
+
+def build_job(rng, company_id):
+    """Return an unsaved random job for company ``company_id``."""
+    technology = rng.choice(TECHNOLOGIES)
+    seniority = rng.choices(list(SENIORITY_WEIGHTS),
+                            weights=SENIORITY_WEIGHTS.values())[0]
+    employment_type = rng.choices(list(EMPLOYMENT_WEIGHTS),
+                                  weights=EMPLOYMENT_WEIGHTS.values())[0]
+    min_salary = rng.randrange(20000, 150000, 1000)
+    return Job(
+        company_id=company_id,
+        title=f'{seniority.label} {technology} {rng.choice(ROLES)}',
+        description=(
+            f'We are looking for a {technology} expert to join a team '
+            f'using {rng.choice(TECHNOLOGIES)} and '
+            f'{rng.choice(TECHNOLOGIES)}.'
+        ),
+        main_tasks=', '.join(rng.sample(TASKS, 3)).capitalize() + '.',
+        min_salary=min_salary,
+        max_salary=min_salary + rng.randrange(0, 60000, 1000),
+        seniority=seniority,
+        employment_type=employment_type,
+        # One job in five leaves the optional area empty.
+        area=rng.choice(Area.values) if rng.random() < 0.8 else '',
+        skills=random_skills(rng, rng.randint(2, 5), 1),
+    )
+
+
+def csv_value(value):
+    """Encode ``value`` as a PostgreSQL CSV field.
+
+    NULL is an unquoted empty field; everything else is quoted, so empty
+    strings stay empty strings. Lists become array literals.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        value = 't' if value else 'f'
+    if isinstance(value, list):
+        value = '{' + ','.join(f'"{item}"' for item in value) + '}'
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class BulkCreateWriter:
+    """Insert model instances with ``bulk_create``."""
+
+    def __init__(self, using):
+        self.using = using
+
+    def write(self, model, objs):
+        created = model.objects.using(self.using).bulk_create(objs)
+        if created and created[0].pk is None:
+            raise NotSupportedError(
+                'This database cannot return ids from bulk inserts.'
+            )
+        return created
+
+
+class CopyWriter:
+    """Insert model instances with PostgreSQL ``COPY FROM STDIN``.
+
+    Primary keys are drawn from the table's sequence up front, so related
+    rows can be copied without reading anything back. Field values go
+    through ``pre_save``, which fills ``auto_now`` timestamps.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        self.connection = connections[using]
+
+    def allocate_ids(self, model, count):
+        table = model._meta.db_table
+        column = model._meta.pk.column
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+                'FROM generate_series(1, %s)',
+                [table, column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def write(self, model, objs):
+        if not objs:
+            return objs
+        for obj, pk in zip(objs, self.allocate_ids(model, len(objs))):
+            obj.pk = pk
+        fields = model._meta.concrete_fields
+        quote = self.connection.ops.quote_name
+        sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields),
+        )
+        buffer = io.StringIO()
+        for obj in objs:
+            buffer.write(','.join(
+                csv_value(field.get_db_prep_save(
+                    field.pre_save(obj, add=True), self.connection
+                ))
+                for field in fields
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        with self.connection.cursor() as cursor:
+            if hasattr(cursor.cursor, 'copy_expert'):
+                cursor.cursor.copy_expert(sql, buffer)
+            else:
+                with cursor.cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        return objs
+
+
+def get_writer(using, method='auto'):
+    """Return the row writer for ``method``: copy, bulk or auto."""
+    if method == 'auto':
+        postgres = connections[using].vendor == 'postgresql'
+        method = 'copy' if postgres else 'bulk'
+    if method == 'copy':
+        return CopyWriter(using)
+    return BulkCreateWriter(using)
+
+
+def batches(total, size):
+    """Yield ``(start, count)`` pairs covering ``total`` items."""
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def generate(companies, talents, jobs, using='default', seed=0,
+             batch_size=1000, method='auto', company_email=company_email,
+             talent_email=talent_email, progress=None):
+    """Create ``companies``, ``talents`` and ``jobs`` of random data.
+
+    Rows are built in memory and written in batches by the writer for
+    ``method``. Model ``clean()`` rules hold by construction instead of
+    per-row ``full_clean()``: profiles only go to users of the matching
+    role, jobs only to companies, and salary ranges are ordered. Every
+    user gets the password ``SEED_PASSWORD``, hashed once and shared.
+    Job derived data (search index, facets, versions) is updated through
+    ``jobs_bulk_created``. ``progress`` is called with the model and the
+    number of rows written after every batch.
+    """
+    rng = random.Random(seed)
+    writer = get_writer(using, method)
+    password = make_password(SEED_PASSWORD)
+    progress = progress or (lambda model, count: None)
+
+    def write_users(role, count, email, profile_model, profile_values):
+        ids = []
+        for start, size in batches(count, batch_size):
+            with transaction.atomic(using=using):
+                users = writer.write(User, [
+                    User(email=email(i), role=role, password=password,
+                         first_name=email(i).split('@')[0], last_name='Seed')
+                    for i in range(start, start + size)
+                ])
+                writer.write(profile_model, [
+                    profile_model(account=user, **profile_values(start + i))
+                    for i, user in enumerate(users)
+                ])
+            ids.extend(user.pk for user in users)
+            progress(User, size)
+        return ids
+
+    company_ids = write_users(Role.COMPANY, companies, company_email,
+                              CompanyProfile,
+                              lambda i: {'name': f'Company {i}'})
+    write_users(Role.TALENT, talents, talent_email, TalentProfile,
+                lambda i: {'profile_description': 'Seeded talent.',
+                           'skills': random_skills(rng, rng.randint(3, 8),
+                                                   2)})
+
+    for start, size in batches(jobs if company_ids else 0, batch_size):
+        batch = [build_job(rng, rng.choice(company_ids))
+                 for _ in range(size)]
+        with transaction.atomic(using=using):
+            created = writer.write(Job, batch)
+            jobs_bulk_created.send(sender=Job, jobs=created, using=using)
+        progress(Job, size)
+
+
+def seed(companies, talents, jobs, using='default', seed=0,
+         batch_size=1000):
+    """Create a small data set with predictable emails for benchmarks."""
+    generate(companies, talents, jobs, using=using, seed=seed,
+             batch_size=batch_size)
@@ -0,0 +1,9 @@
+"""
+Custom signals for core models.
+"""
+from django.dispatch import Signal
+
+
+# Sent after jobs are written with ``bulk_create``, which skips the regular
+# model signals. Receivers get ``jobs`` (saved instances) and ``using``.
+jobs_bulk_created = Signal()
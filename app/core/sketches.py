@@ -0,0 +1,68 @@
+"""
+Mergeable quantile sketches.
+
+``QuantileSketch`` follows DDSketch: values are counted in logarithmic
+buckets, so any quantile it returns is within ``relative_accuracy`` of
+the exact one. Unlike t-digest or KLL sketches, bucket counts can be
+decremented, which lets a stored sketch follow updates and deletes, and
+merging two sketches is adding their counts.
+"""
+import math
+
+
+class QuantileSketch:
+    """Counts of positive values in buckets ``(gamma**(i-1), gamma**i]``.
+
+    Values below 1 are counted as 1.
+    """
+
+    def __init__(self, relative_accuracy=0.01, counts=None):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.counts = dict(counts or {})
+
+    def key(self, value):
+        """Return the bucket index of ``value``."""
+        return math.ceil(math.log(max(value, 1)) / self._log_gamma)
+
+    def value(self, key):
+        """Return the estimate for values in bucket ``key``."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value, count=1):
+        """Count ``value`` ``count`` times; a negative count removes it."""
+        key = self.key(value)
+        total = self.counts.get(key, 0) + count
+        if total:
+            self.counts[key] = total
+        else:
+            self.counts.pop(key, None)
+
+    def merge(self, other):
+        """Add the counts of ``other``, which must share the accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Cannot merge sketches of different accuracy.')
+        for key, count in other.counts.items():
+            total = self.counts.get(key, 0) + count
+            if total:
+                self.counts[key] = total
+            else:
+                self.counts.pop(key, None)
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    def quantile(self, q):
+        """Return the estimated ``q``-quantile, or None when empty."""
+        total = self.count
+        if total <= 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen > rank:
+                return self.value(key)
+        return self.value(max(self.counts))
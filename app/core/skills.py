@@ -0,0 +1,58 @@
+"""
+Skill codes for talents and jobs.
+
+Technical and personal skills use their enum values as codes. Languages
+use ``<language>:<level>`` codes that mean "speaks the language at this
+proficiency or above": a talent holds one code per level up to their own,
+while a job requires the single code for its minimum level. A talent then
+meets a job's requirements exactly when their codes are a superset.
+"""
+from core.enums import TechSkill, PersSkill, LangSkill, LangProf
+
+
+LANG_LEVELS = list(LangProf.values)
+
+
+def language_code(language, level):
+    """Return the code for ``language`` at ``level`` or above."""
+    return f'{language}:{level}'
+
+
+def language_codes(language, level):
+    """Return every code held by someone speaking ``language`` at
+    ``level``."""
+    index = LANG_LEVELS.index(level)
+    return [language_code(language, lvl) for lvl in LANG_LEVELS[:index + 1]]
+
+
+SKILL_CODES = (
+    TechSkill.values +
+    PersSkill.values +
+    [language_code(language, level)
+     for language in LangSkill.values for level in LANG_LEVELS]
+)
+
+SKILL_CODE_SET = frozenset(SKILL_CODES)
+_LANGUAGES = {language_code(language, level): (language, level)
+              for language in LangSkill.values for level in LANG_LEVELS}
+
+
+def language_codes_from(language, level):
+    """Return the codes for ``language`` at ``level`` and every level
+    above it. Holding any of them means speaking ``level`` or better."""
+    index = LANG_LEVELS.index(level)
+    return [language_code(language, lvl) for lvl in LANG_LEVELS[index:]]
+
+
+def normalize_codes(codes, expand_languages=False):
+    """Return ``codes`` sorted and without duplicates.
+
+    With ``expand_languages`` every language code also brings the codes
+    of the levels below it, which is how talents store languages.
+    """
+    codes = set(codes)
+    if expand_languages:
+        for code in list(codes):
+            if code in _LANGUAGES:
+                codes.update(language_codes(*_LANGUAGES[code]))
+    return sorted(codes)
@@ -2,10 +2,16 @@
 Test for the Django admin modifications.
 """
 
+from unittest.mock import patch
+
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from core.enums import Role
+from core.enums import Role, Seniority, Employment
+from core import models
+from core.paginators import EstimatedCountPaginator
 
 
 class AdminSiteTests(TestCase):
@@ -48,3 +54,118 @@ class AdminSiteTests(TestCase):
         url = reverse('admin:core_user_add')
         res = self.client.get(url)
         self.assertEqual(res.status_code, 200)
+
+
+class ScaleAdminTests(TestCase):
+    """Test admin changelists for large tables."""
+
+    def setUp(self):
+        self.client = Client()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="testpass123",
+        )
+        self.client.force_login(self.admin_user)
+
+    def create_jobs(self, count, start=0):
+        for i in range(start, start + count):
+            company = get_user_model().objects.create_user(
+                email=f'company{i}@test.com',
+                password='testpass123',
+                role=Role.COMPANY,
+            )
+            models.CompanyProfile.objects.create(account=company,
+                                                 name=f'Company {i}')
+            models.Job.objects.create(
+                company=company,
+                title=f'Python developer {i}',
+                description='Description',
+                main_tasks='Tasks',
+                min_salary=50000,
+                max_salary=80000,
+                seniority=Seniority.JUNIOR,
+                employment_type=Employment.FULL_TIME,
+            )
+            talent = get_user_model().objects.create_user(
+                email=f'talent{i}@test.com',
+                password='testpass123',
+                role=Role.TALENT,
+                first_name='Talent',
+                last_name=str(i),
+            )
+            models.TalentProfile.objects.create(account=talent,
+                                                profile_description='Hi')
+
+    def count_changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Test changelists use a constant number of queries."""
+        self.create_jobs(1)
+        urls = [
+            reverse('admin:core_job_changelist'),
+            reverse('admin:core_talentprofile_changelist'),
+            reverse('admin:core_companyprofile_changelist'),
+        ]
+        baseline = [self.count_changelist_queries(url) for url in urls]
+
+        self.create_jobs(5, start=1)
+
+        self.assertEqual(
+            [self.count_changelist_queries(url) for url in urls], baseline
+        )
+
+    def test_job_changelist_search_and_filters(self):
+        """Test job search and filters narrow the changelist."""
+        self.create_jobs(2)
+        job = models.Job.objects.first()
+        job.title = 'Rust engineer'
+        job.save()
+        url = reverse('admin:core_job_changelist')
+
+        res = self.client.get(url, {'q': 'rust',
+                                    'seniority__exact': Seniority.JUNIOR})
+
+        self.assertContains(res, 'Rust engineer')
+        self.assertNotContains(res, 'Python developer')
+
+    def test_user_search_by_email(self):
+        """Test users can be found by exact email."""
+        self.create_jobs(2)
+        url = reverse('admin:core_user_changelist')
+
+        res = self.client.get(url, {'q': 'TALENT1@test.com'})
+
+        self.assertContains(res, 'talent1@test.com')
+        self.assertNotContains(res, 'talent0@test.com')
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """Test the estimated count paginator."""
+
+    @patch('core.paginators.estimate_count', return_value=5000000)
+    def test_large_estimates_skip_exact_count(self, patched_estimate):
+        """Test a large estimate is used without running COUNT(*)."""
+        paginator = EstimatedCountPaginator(
+            get_user_model().objects.all(), 100
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 5000000)
+
+    @patch('core.paginators.estimate_count', return_value=10)
+    def test_small_estimates_use_exact_count(self, patched_estimate):
+        """Test small tables still get an exact count."""
+        get_user_model().objects.create_user(
+            email='user@test.com',
+            password='testpass123',
+            role=Role.TALENT,
+        )
+        paginator = EstimatedCountPaginator(
+            get_user_model().objects.all(), 100
+        )
+
+        self.assertEqual(paginator.count, 1)
@@ -0,0 +1,234 @@
+"""
+Tests for the seed data and benchmark suite.
+"""
+import contextlib
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from core import benchmarks
+from core.enums import Role
+from core.models import CompanyProfile, Job, JobFacetCount, User
+from core.seed import (
+    SEED_PASSWORD,
+    CopyWriter,
+    csv_value,
+    generate,
+    seed,
+    talent_email,
+)
+
+
+RESULT = {'requests': 10, 'throughput': 100.0, 'queries': 2,
+          'p50_ms': 5.0, 'p95_ms': 10.0, 'p99_ms': 12.0}
+
+
+class SeedTests(TestCase):
+    """Test seeding synthetic data."""
+
+    def test_seed_counts_and_derived_data(self):
+        """Test seeding creates users, profiles, jobs and facet counts."""
+        seed(companies=2, talents=3, jobs=25, batch_size=10)
+
+        self.assertEqual(User.objects.filter(role=Role.COMPANY).count(), 2)
+        self.assertEqual(User.objects.filter(role=Role.TALENT).count(), 3)
+        self.assertEqual(CompanyProfile.objects.count(), 2)
+        self.assertEqual(Job.objects.count(), 25)
+        total = sum(JobFacetCount.objects.filter(
+            facet='seniority'
+        ).values_list('count', flat=True))
+        self.assertEqual(total, 25)
+
+    def test_seeded_users_can_log_in(self):
+        """Test the shared password hash works for every user."""
+        seed(companies=1, talents=2, jobs=0)
+
+        user = authenticate(email=talent_email(1), password=SEED_PASSWORD)
+
+        self.assertIsNotNone(user)
+
+    def test_seed_is_deterministic(self):
+        """Test the same seed produces the same jobs."""
+        seed(companies=1, talents=1, jobs=5, seed=7)
+        titles = list(Job.objects.order_by('id').values_list('title',
+                                                             flat=True))
+        Job.objects.all().delete()
+        User.objects.all().delete()
+
+        seed(companies=1, talents=1, jobs=5, seed=7)
+
+        self.assertEqual(titles, list(Job.objects.order_by('id')
+                                      .values_list('title', flat=True)))
+
+    def test_generate_with_custom_emails(self):
+        """Test generated users follow the given email patterns."""
+        written = []
+
+        generate(1, 2, 3, company_email=lambda i: f'c{i}@x.example.com',
+                 talent_email=lambda i: f't{i}@x.example.com',
+                 progress=lambda model, count: written.append(count))
+
+        self.assertTrue(User.objects.filter(email='t1@x.example.com',
+                                            role=Role.TALENT).exists())
+        self.assertEqual(written, [1, 2, 3])
+
+
+class CopyWriterTests(TestCase):
+    """Test writing rows with COPY."""
+
+    def test_csv_value(self):
+        """Test NULLs, empty strings, quotes and booleans are encoded."""
+        self.assertEqual(csv_value(None), '')
+        self.assertEqual(csv_value(''), '""')
+        self.assertEqual(csv_value('say "hi"'), '"say ""hi"""')
+        self.assertEqual(csv_value(True), '"t"')
+        self.assertEqual(csv_value(42), '"42"')
+
+    def test_copy_rows_with_allocated_ids(self):
+        """Test ids come from the sequence and rows are sent as CSV."""
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [(101,), (102,)]
+        copied = {}
+        cursor.cursor.copy_expert.side_effect = (
+            lambda sql, buffer: copied.update(sql=sql, data=buffer.read())
+        )
+        fake = MagicMock(ops=connection.ops, features=connection.features)
+        fake.cursor.return_value = contextlib.nullcontext(cursor)
+        users = [User(email=f'user{i}@example.com', role=Role.TALENT,
+                      password='hash') for i in range(2)]
+
+        with patch.dict('core.seed.connections', {'default': fake}):
+            CopyWriter('default').write(User, users)
+
+        self.assertEqual([user.pk for user in users], [101, 102])
+        self.assertIn('pg_get_serial_sequence', cursor.execute.call_args[0][0])
+        self.assertTrue(copied['sql'].startswith('COPY "core_user" ("id"'))
+        lines = copied['data'].splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('"101","hash",,'))
+        self.assertIn('"user0@example.com"', lines[0])
+
+
+class BenchmarkSuiteTests(TestCase):
+    """Test running and comparing benchmarks."""
+
+    def test_run_suite(self):
+        """Test every scenario runs and reports its measurements."""
+        seed(companies=2, talents=2, jobs=30)
+
+        results = benchmarks.run_suite(iterations=2)
+
+        self.assertIn('user:me', results)
+        self.assertIn('job:job-search', results)
+        for result in results.values():
+            self.assertEqual(set(result), set(RESULT))
+        self.assertEqual(results['user:me']['queries'], 0)
+
+    def test_compare_flags_query_regressions(self):
+        """Test more queries per request count as regressions."""
+        baseline = {'a': RESULT, 'b': RESULT, 'c': RESULT}
+        results = {
+            'a': {**RESULT, 'queries': 3},
+            'b': {**RESULT, 'p95_ms': 13.0},
+            'c': {**RESULT, 'queries': 1},
+            'new': RESULT,
+        }
+
+        regressions = benchmarks.compare(results, baseline)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('a:'))
+
+    def test_slowdowns_flags_p95_growth(self):
+        """Test a slower p95 beyond the tolerance is a slowdown."""
+        baseline = {'a': RESULT, 'b': RESULT, 'counts': {'queries': 2}}
+        results = {
+            'a': {**RESULT, 'p95_ms': 13.0},
+            'b': {**RESULT, 'p95_ms': 12.0},
+            'counts': RESULT,
+        }
+
+        found = benchmarks.slowdowns(results, baseline, tolerance=0.25)
+
+        self.assertEqual(len(found), 1)
+        self.assertTrue(found[0].startswith('a:'))
+
+    def test_slowdowns_ignores_jitter_on_fast_endpoints(self):
+        """Test sub-millisecond growth is not a slowdown."""
+        baseline = {'fast': {**RESULT, 'p95_ms': 1.0}}
+        results = {'fast': {**RESULT, 'p95_ms': 1.8}}
+
+        self.assertEqual(benchmarks.slowdowns(results, baseline), [])
+
+
+@patch.object(connection.creation, 'destroy_test_db')
+@patch.object(connection.creation, 'create_test_db')
+class BenchmarkCommandTests(TestCase):
+    """Test the benchmark command."""
+
+    def setUp(self):
+        fd, self.baseline = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        os.remove(self.baseline)
+        self.addCleanup(lambda: os.path.exists(self.baseline)
+                        and os.remove(self.baseline))
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('benchmark', '--scale', '0.02', '--iterations', '1',
+                     '--scenario', 'job:job-list', '--baseline',
+                     self.baseline, *args, stdout=out)
+        return out.getvalue()
+
+    def test_update_then_compare(self, create_db, destroy_db):
+        """Test storing a baseline and passing against it."""
+        self.run_command('--update-baseline')
+        with open(self.baseline) as stored:
+            baseline = json.load(stored)
+
+        out = self.run_command()
+
+        self.assertIn('job:job-list', baseline[connection.vendor])
+        self.assertIn('No regressions.', out)
+        create_db.assert_called()
+        destroy_db.assert_called()
+
+    def test_regression_fails(self, create_db, destroy_db):
+        """Test a regression against the baseline is an error."""
+        with open(self.baseline, 'w') as stored:
+            json.dump({connection.vendor: {
+                'job:job-list': {**RESULT, 'queries': 0, 'p95_ms': 1000},
+            }}, stored)
+
+        with self.assertRaisesMessage(CommandError, 'job:job-list: 2'):
+            self.run_command()
+
+    def test_slowdown_only_warns(self, create_db, destroy_db):
+        """Test a latency slowdown is reported without failing."""
+        with open(self.baseline, 'w') as stored:
+            json.dump({connection.vendor: {'job:job-list': RESULT}}, stored)
+        slow = {'job:job-list': {**RESULT, 'p95_ms': 100.0}}
+
+        with patch.object(benchmarks, 'run_suite', return_value=slow):
+            out = self.run_command()
+            self.assertIn('Latency slowdowns (not failing):', out)
+            self.assertIn('No regressions.', out)
+            with self.assertRaisesMessage(CommandError,
+                                          'job:job-list: p95'):
+                self.run_command('--fail-on-latency')
+
+    def test_missing_baseline(self, create_db, destroy_db):
+        """Test a missing vendor baseline fails only when required."""
+        out = self.run_command()
+
+        self.assertIn('nothing to compare', out)
+        with self.assertRaisesMessage(CommandError, 'No '):
+            self.run_command('--require-baseline')
@@ -1,34 +1,267 @@
 """
 Test custom Django management commands.
 """
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
 
+from core.enums import Role, Seniority, Employment, TechSkill
+from core.models import Job, JobFacetCount, User
+from job.search import search_jobs
 
-@patch('core.management.commands.wait_for_db.Command.check')
+
+@patch('core.management.commands.wait_for_db.ping_database')
 class CommandTests(SimpleTestCase):
     """Test commands."""
 
-    def test_wait_for_db(self, patched_check):
+    def test_wait_for_db(self, patched_ping):
         """Test waiting for database if database is ready."""
-        patched_check.return_value = True
-
-        call_command('wait_for_db')
+        call_command('wait_for_db', stdout=StringIO())
 
-        patched_check.assert_called_once_with(databases=['default'])
+        patched_ping.assert_called_once_with('default', timeout=2)
 
     @patch('time.sleep')
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
+    def test_wait_for_db_delay(self, patched_sleep, patched_ping):
         """Test waiting for database when getting OperationalError."""
-        patched_check.side_effect = [Psycopg2Error] * 2 + \
-            [OperationalError] * 3 + [True]
+        patched_ping.side_effect = [Psycopg2Error] * 2 + \
+            [OperationalError] * 3 + [None]
+
+        call_command('wait_for_db', stdout=StringIO())
+
+        self.assertEqual(patched_ping.call_count, 6)
+        patched_ping.assert_called_with('default', timeout=2)
+
+    @patch('time.sleep')
+    def test_wait_for_db_backs_off(self, patched_sleep, patched_ping):
+        """Test probes start fast and back off up to the maximum delay."""
+        patched_ping.side_effect = [OperationalError] * 6 + [None]
+
+        call_command('wait_for_db', stdout=StringIO())
+
+        delays = [call.args[0] for call in patched_sleep.call_args_list]
+        self.assertEqual(delays, [0.05, 0.1, 0.2, 0.4, 0.8, 1.0])
+
+    @patch('time.monotonic')
+    @patch('time.sleep')
+    def test_wait_for_db_timeout(self, patched_sleep, patched_monotonic,
+                                 patched_ping):
+        """Test the command gives up after the deadline."""
+        patched_ping.side_effect = OperationalError
+        clock = (step / 2 for step in range(100))
+        patched_monotonic.side_effect = lambda: next(clock)
+
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db', '--timeout', '3',
+                         stdout=StringIO())
+
+        self.assertEqual(patched_ping.call_count, 3)
+
+    @patch('time.monotonic')
+    @patch('time.sleep')
+    def test_wait_for_db_deadline_holds(self, patched_sleep,
+                                        patched_monotonic, patched_ping):
+        """Test probes stop connecting when the deadline runs out."""
+        clock = [0.0]
+
+        def advance(seconds):
+            clock[0] += seconds
+
+        def hang(using, timeout):
+            advance(timeout)
+            raise OperationalError
+
+        patched_monotonic.side_effect = lambda: clock[0]
+        patched_sleep.side_effect = advance
+        patched_ping.side_effect = hang
+
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db', '--timeout', '3',
+                         stdout=StringIO())
+
+        self.assertLessEqual(clock[0], 3)
+
+
+class ImportJobsCommandTests(TestCase):
+    """Test the import_jobs command."""
+
+    def setUp(self):
+        self.company = User.objects.create_user(
+            email='company@example.com',
+            password='testpass123',
+            role=Role.COMPANY,
+        )
+        self.talent = User.objects.create_user(
+            email='talent@example.com',
+            password='testpass123',
+            role=Role.TALENT,
+        )
+
+    def job_row(self, **params):
+        row = {
+            'company': self.company.id,
+            'title': 'Imported job',
+            'description': 'Imported description',
+            'main_tasks': 'Imported tasks',
+            'min_salary': 50000,
+            'max_salary': 80000,
+            'seniority': Seniority.JUNIOR.value,
+            'employment_type': Employment.FULL_TIME.value,
+        }
+        row.update(params)
+        return row
+
+    def write_feed(self, content, suffix):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w') as feed:
+            feed.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_jobs', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_jsonl(self):
+        """Test importing a JSONL feed creates the jobs."""
+        rows = [self.job_row(title=f'Job {i}') for i in range(3)]
+        path = self.write_feed(
+            '\n'.join(json.dumps(row) for row in rows), '.jsonl'
+        )
+
+        out, err = self.run_import(path)
+
+        self.assertEqual(err, '')
+        self.assertIn('Imported 3 jobs, skipped 0 rows.', out)
+        self.assertEqual(
+            list(Job.objects.order_by('id').values_list('title', flat=True)),
+            ['Job 0', 'Job 1', 'Job 2'],
+        )
+        self.assertEqual(
+            search_jobs(Job.objects.all(), 'imported').count(), 3
+        )
+
+    def test_import_csv(self):
+        """Test importing a CSV feed converts values."""
+        row = self.job_row(skills=TechSkill.PYTHON.value)
+        path = self.write_feed(
+            ','.join(row) + '\n' + ','.join(str(v) for v in row.values()),
+            '.csv',
+        )
+
+        self.run_import(path)
+
+        job = Job.objects.get()
+        self.assertEqual(job.company, self.company)
+        self.assertEqual(job.min_salary, 50000)
+        self.assertEqual(job.skills, [TechSkill.PYTHON])
+
+    def test_csv_row_with_extra_values_is_skipped(self):
+        """Test a CSV row longer than the header is rejected alone."""
+        row = self.job_row()
+        values = ','.join(str(v) for v in row.values())
+        path = self.write_feed(
+            ','.join(row) + '\n' + values + ',extra\n' + values, '.csv',
+        )
+
+        out, err = self.run_import(path)
+
+        self.assertIn('Imported 1 jobs, skipped 1 rows.', out)
+        self.assertIn('Line 2: Row has more values than the header.', err)
+
+    def test_bad_rows_are_reported_and_skipped(self):
+        """Test invalid rows are reported without aborting the import."""
+        lines = [
+            json.dumps(self.job_row(title='Good')),
+            'not json',
+            json.dumps(self.job_row(seniority='NOPE')),
+            json.dumps(self.job_row(company=self.talent.id)),
+            json.dumps(self.job_row(min_salary=90000)),
+            json.dumps(self.job_row(title='Also good')),
+        ]
+        path = self.write_feed('\n'.join(lines), '.jsonl')
+
+        out, err = self.run_import(path, '--batch-size', '2')
+
+        self.assertIn('Imported 2 jobs, skipped 4 rows.', out)
+        for line_number in [2, 3, 4, 5]:
+            self.assertIn(f'Line {line_number}:', err)
+        self.assertCountEqual(
+            Job.objects.values_list('title', flat=True),
+            ['Good', 'Also good'],
+        )
+
+    def test_company_roles_checked_once_per_batch(self):
+        """Test each batch costs one role lookup and one insert."""
+        rows = [self.job_row(title=f'Job {i}') for i in range(10)]
+        path = self.write_feed(
+            '\n'.join(json.dumps(row) for row in rows), '.jsonl'
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.run_import(path, '--batch-size', '5')
+
+        sql = [query['sql'] for query in ctx.captured_queries]
+        self.assertEqual(Job.objects.count(), 10)
+        self.assertEqual(
+            len([q for q in sql if q.startswith('SELECT') and
+                 '"core_user"' in q]), 2
+        )
+        self.assertEqual(
+            len([q for q in sql if q.startswith('INSERT INTO "core_job"')]),
+            2
+        )
+
+
+class GenerateDataCommandTests(TestCase):
+    """Test the generate_data command."""
+
+    def run_generate(self, *args):
+        out = StringIO()
+        call_command('generate_data', *args, stdout=out)
+        return out.getvalue()
+
+    def test_generate_data(self):
+        """Test users, profiles and jobs are created respecting roles."""
+        out = self.run_generate('--companies', '3', '--talents', '5',
+                                '--jobs', '20', '--batch-size', '4',
+                                '--label', 'test')
+
+        self.assertIn('Generated 8 users, 20 jobs', out)
+        self.assertEqual(User.objects.filter(role=Role.COMPANY,
+                                             company_profile__isnull=False)
+                         .count(), 3)
+        self.assertEqual(User.objects.filter(role=Role.TALENT,
+                                             talent_profile__isnull=False)
+                         .count(), 5)
+        self.assertFalse(Job.objects.exclude(
+            company__role=Role.COMPANY
+        ).exists())
+        self.assertEqual(sum(JobFacetCount.objects.filter(
+            facet='seniority'
+        ).values_list('count', flat=True)), 20)
+
+    def test_repeated_runs_do_not_collide(self):
+        """Test a second run with a new label adds more users."""
+        self.run_generate('--companies', '1', '--talents', '1',
+                          '--jobs', '0')
+        self.run_generate('--companies', '1', '--talents', '1',
+                          '--jobs', '0')
 
-        call_command('wait_for_db')
+        self.assertEqual(User.objects.count(), 4)
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
+    def test_jobs_need_companies(self):
+        """Test jobs cannot be generated without companies."""
+        with self.assertRaises(CommandError):
+            self.run_generate('--companies', '0', '--jobs', '5')
@@ -0,0 +1,72 @@
+"""
+Tests for the health check endpoints.
+"""
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.utils import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+
+from core.health import ping_database
+
+
+HEALTHZ_URL = reverse('healthz')
+READYZ_URL = reverse('readyz')
+
+
+class HealthCheckTests(TestCase):
+    """Test liveness and readiness probes."""
+
+    def test_healthz(self):
+        """Test liveness does not touch the database."""
+        with self.assertNumQueries(0):
+            res = self.client.get(HEALTHZ_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {'status': 'ok'})
+        self.assertIn('no-cache', res['Cache-Control'])
+
+    def test_readyz(self):
+        """Test readiness runs a single trivial query."""
+        with self.assertNumQueries(1):
+            res = self.client.get(READYZ_URL)
+
+        self.assertEqual(res.status_code, 200)
+
+    @patch('core.views.ping_database', side_effect=OperationalError)
+    def test_readyz_database_down(self, patched_ping):
+        """Test readiness fails while the database is unreachable."""
+        res = self.client.get(READYZ_URL)
+
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.json(), {'status': 'unavailable'})
+
+    def test_ping_closes_broken_connection(self):
+        """Test a failed ping drops the connection so the next reconnects."""
+        with patch('django.db.backends.utils.CursorWrapper.execute',
+                   side_effect=OperationalError), \
+                patch('django.db.connection.close') as close:
+            with self.assertRaises(OperationalError):
+                ping_database()
+
+        close.assert_called_once()
+
+    def test_ping_limits_connect_timeout(self):
+        """Test a ping gives up connecting to PostgreSQL after timeout."""
+        seen = []
+
+        def connect():
+            options = connection.settings_dict['OPTIONS']
+            seen.append(options.get('connect_timeout'))
+            raise OperationalError
+
+        with patch.object(connection, 'vendor', 'postgresql'), \
+                patch.object(connection, 'cursor', side_effect=connect), \
+                patch.object(connection, 'close'):
+            with self.assertRaises(OperationalError):
+                ping_database(timeout=0.5)
+
+        self.assertEqual(seen, [2])
+        self.assertNotIn('connect_timeout',
+                         connection.settings_dict['OPTIONS'])
@@ -0,0 +1,135 @@
+"""
+Tests for the matching engine.
+"""
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from core.enums import (
+    TechSkill, PersSkill, LangSkill, LangProf, Seniority, Employment, Role,
+)
+from core.matching import (
+    MatchIndex,
+    SkillEncoder,
+    job_index,
+    match_jobs,
+    match_talents,
+    talent_index,
+)
+from core.models import Job, TalentProfile
+from core.skills import SKILL_CODES, language_code, language_codes
+
+
+class SkillCodeTests(SimpleTestCase):
+    """Test the skill vocabulary."""
+
+    def test_language_codes_are_cumulative(self):
+        """Test a speaker holds every level up to their own."""
+        self.assertEqual(
+            language_codes(LangSkill.ENGLISH, LangProf.INTERMEDIATE),
+            ['EN:BEG', 'EN:INT'],
+        )
+
+    def test_encoder_fits_every_code(self):
+        """Test every skill code gets its own bit."""
+        encoder = SkillEncoder()
+
+        self.assertEqual(len(encoder.positions), len(set(SKILL_CODES)))
+        self.assertEqual(encoder.words, (len(SKILL_CODES) + 63) // 64)
+        with self.assertRaises(KeyError):
+            encoder.encode(['NOT_A_SKILL'])
+
+
+class MatchingTests(SimpleTestCase):
+    """Test scoring talents and jobs."""
+
+    def setUp(self):
+        self.jobs = MatchIndex.build([
+            (1, [TechSkill.PYTHON, TechSkill.DJANGO], Seniority.SENIOR),
+            (2, [TechSkill.PYTHON, TechSkill.DJANGO, TechSkill.DOCKER,
+                 language_code(LangSkill.GERMAN, LangProf.FLUENT)],
+             Seniority.SENIOR),
+            (3, [TechSkill.JAVA], Seniority.JUNIOR),
+            (4, [TechSkill.PYTHON, PersSkill.TEAMWORK], Seniority.INTERN),
+            (5, [], Seniority.SENIOR),
+        ])
+
+    def test_match_jobs_ranks_by_requirement_coverage(self):
+        """Test jobs are ranked by the share of requirements met."""
+        talent = ([TechSkill.PYTHON, TechSkill.DJANGO, TechSkill.DOCKER] +
+                  language_codes(LangSkill.GERMAN, LangProf.ADVANCED))
+
+        matches = match_jobs(self.jobs, talent, k=10)
+
+        self.assertEqual([job_id for job_id, _ in matches], [1, 2, 4])
+        self.assertEqual(matches[0][1], 1.0)
+        self.assertAlmostEqual(matches[1][1], 0.75)
+        self.assertAlmostEqual(matches[2][1], 0.5)
+
+    def test_language_level_requirement(self):
+        """Test a higher language level satisfies a lower requirement."""
+        talent = ([TechSkill.PYTHON, TechSkill.DJANGO, TechSkill.DOCKER] +
+                  language_codes(LangSkill.GERMAN, LangProf.NATIVE))
+
+        matches = dict(match_jobs(self.jobs, talent))
+
+        self.assertEqual(matches[2], 1.0)
+
+    def test_match_jobs_top_k_and_seniority(self):
+        """Test results are capped and restricted by seniority."""
+        talent = [TechSkill.PYTHON, TechSkill.DJANGO, PersSkill.TEAMWORK]
+
+        self.assertEqual(len(match_jobs(self.jobs, talent, k=1)), 1)
+        matches = match_jobs(self.jobs, talent, seniority=Seniority.JUNIOR,
+                             seniority_tolerance=1)
+        self.assertEqual([job_id for job_id, _ in matches], [4])
+
+    def test_match_talents(self):
+        """Test talents are ranked by how much of the job they cover."""
+        talents = MatchIndex.build([
+            (10, [TechSkill.PYTHON], None),
+            (11, [TechSkill.PYTHON, TechSkill.DJANGO, TechSkill.REACT], None),
+            (12, [TechSkill.JAVA], None),
+        ])
+
+        matches = match_talents(talents,
+                                [TechSkill.PYTHON, TechSkill.DJANGO])
+
+        self.assertEqual(matches, [(11, 1.0), (10, 0.5)])
+
+    def test_empty_index(self):
+        """Test matching against an empty index returns nothing."""
+        index = MatchIndex.build([])
+
+        self.assertEqual(match_jobs(index, [TechSkill.PYTHON]), [])
+
+
+class IndexBuilderTests(TestCase):
+    """Test building indexes from the database."""
+
+    def test_job_and_talent_indexes(self):
+        """Test the indexes hold the stored skills."""
+        User = get_user_model()
+        company = User.objects.create_user(
+            email='company@example.com', password='pass', role=Role.COMPANY
+        )
+        talent = User.objects.create_user(
+            email='talent@example.com', password='pass', role=Role.TALENT
+        )
+        TalentProfile.objects.create(account=talent,
+                                     profile_description='Developer',
+                                     skills=[TechSkill.PYTHON])
+        job = Job.objects.create(
+            company=company, title='Job', description='Job',
+            main_tasks='Tasks', min_salary=1, max_salary=2,
+            seniority=Seniority.SENIOR, employment_type=Employment.FULL_TIME,
+            skills=[TechSkill.PYTHON, TechSkill.DJANGO],
+        )
+
+        with self.assertNumQueries(1):
+            jobs = job_index()
+        talents = talent_index()
+
+        self.assertEqual(match_jobs(jobs, [TechSkill.PYTHON]),
+                         [(job.id, 0.5)])
+        self.assertEqual(match_talents(talents, [TechSkill.PYTHON]),
+                         [(talent.id, 1.0)])
@@ -0,0 +1,216 @@
+"""
+Tests for the request metrics.
+"""
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+from core.metrics import Histogram, Registry
+
+
+METRICS_URL = reverse('metrics')
+CREATE_USER_URL = reverse('user:create')
+JOBS_ASYNC_URL = reverse('job:job-list-async')
+TOKEN_URL = reverse('user:token')
+
+CREATE_USER_VIEW = 'user.views.CreateUserView'
+JOBS_ASYNC_VIEW = 'job.views.job_list_async'
+
+
+def metrics_settings(**params):
+    """Return METRICS settings with ``params`` overridden."""
+    defaults = {'ENABLED': True, 'SAMPLE_RATE': 1.0, 'TOKEN': 'secret'}
+    defaults.update(params)
+    return defaults
+
+
+def sample_value(text, line_prefix):
+    """Return the value of the first exposition line starting with
+    ``line_prefix``."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(' ', 1)[1])
+    raise AssertionError(f'{line_prefix!r} not found in:\n{text}')
+
+
+class HistogramTests(SimpleTestCase):
+    """Test the histogram exposition."""
+
+    def test_buckets_are_cumulative(self):
+        """Test bucket counts include every smaller bucket."""
+        histogram = Histogram('latency', 'Latency.', ('view',), (0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(('a',), value)
+
+        lines = list(histogram.lines())
+
+        self.assertEqual(lines, [
+            'latency_bucket{view="a",le="0.1"} 1',
+            'latency_bucket{view="a",le="1"} 3',
+            'latency_bucket{view="a",le="+Inf"} 4',
+            'latency_sum{view="a"} 4.05',
+            'latency_count{view="a"} 4',
+        ])
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes in labels are escaped."""
+        registry = Registry()
+        registry.record('a"b\\c', 'GET', 200, 0.01)
+
+        self.assertIn('view="a\\"b\\\\c"', registry.render())
+
+
+@override_settings(METRICS=metrics_settings())
+class MetricsMiddlewareTests(TestCase):
+    """Test requests are recorded per view."""
+
+    def setUp(self):
+        metrics.registry.reset()
+
+    def create_user(self):
+        return self.client.post(CREATE_USER_URL, {
+            'email': 'metrics@example.com',
+            'password': 'testpass123',
+            'first_name': 'Test',
+            'last_name': 'User',
+            'role': 'TALENT',
+        })
+
+    def test_records_latency_queries_and_serializer_time(self):
+        """Test a sampled request records its SQL and serializer time."""
+        res = self.create_user()
+
+        self.assertEqual(res.status_code, 201)
+        text = metrics.registry.render()
+        self.assertEqual(sample_value(
+            text, 'http_requests_total{view="%s",method="POST",'
+                  'status="201"}' % CREATE_USER_VIEW), 1)
+        self.assertEqual(sample_value(
+            text, 'http_request_duration_seconds_count{view="%s",'
+                  'method="POST"}' % CREATE_USER_VIEW), 1)
+        self.assertGreaterEqual(sample_value(
+            text, 'http_request_db_queries_sum{view="%s"}'
+                  % CREATE_USER_VIEW), 2)
+        self.assertGreater(sample_value(
+            text, 'http_request_db_seconds_sum{view="%s"}'
+                  % CREATE_USER_VIEW), 0)
+        self.assertGreater(sample_value(
+            text, 'http_request_serializer_seconds_sum{view="%s"}'
+                  % CREATE_USER_VIEW), 0)
+
+    async def test_async_request_records_queries(self):
+        """Test queries run in sync_to_async threads are sampled."""
+        res = await self.async_client.get(JOBS_ASYNC_URL)
+
+        self.assertEqual(res.status_code, 200)
+        text = metrics.registry.render()
+        self.assertGreaterEqual(sample_value(
+            text, 'http_request_db_queries_sum{view="%s"}'
+                  % JOBS_ASYNC_VIEW), 2)
+        self.assertGreater(sample_value(
+            text, 'http_request_db_seconds_sum{view="%s"}'
+                  % JOBS_ASYNC_VIEW), 0)
+
+    @override_settings(METRICS=metrics_settings(SAMPLE_RATE=0))
+    def test_unsampled_request_skips_breakdown(self):
+        """Test only latency is recorded when sampling is off."""
+        with mock.patch('core.metrics.sampling') as patched_sampling:
+            self.create_user()
+
+        patched_sampling.assert_not_called()
+        text = metrics.registry.render()
+        self.assertIn('http_request_duration_seconds_count', text)
+        self.assertNotIn('http_request_db_queries_count', text)
+
+    def test_unmatched_urls_share_a_label(self):
+        """Test 404s do not create a label per path."""
+        self.client.get('/no/such/path/')
+        self.client.get('/another/missing/path/')
+
+        self.assertEqual(sample_value(
+            metrics.registry.render(),
+            'http_requests_total{view="unmatched",method="GET",'
+            'status="404"}'), 2)
+
+    def test_unknown_methods_share_a_label(self):
+        """Test arbitrary methods do not create a label each."""
+        self.client.generic('FOO', '/no/such/path/')
+        self.client.generic('BAR', '/no/such/path/')
+
+        text = metrics.registry.render()
+        self.assertEqual(sample_value(
+            text, 'http_requests_total{view="unmatched",method="other",'
+                  'status="404"}'), 2)
+        self.assertNotIn('FOO', text)
+
+    def test_failed_login_is_recorded(self):
+        """Test the token view is labelled with its class."""
+        self.client.post(TOKEN_URL, {'email': 'x@example.com',
+                                     'password': 'wrong'})
+
+        self.assertIn('view="user.views.CreateTokenView"',
+                      metrics.registry.render())
+
+
+@override_settings(METRICS=metrics_settings())
+class MetricsEndpointTests(TestCase):
+    """Test the Prometheus endpoint."""
+
+    def setUp(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = 'Bearer secret'
+
+    def test_exposition_format(self):
+        """Test metrics are served as Prometheus text."""
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'# TYPE http_request_duration_seconds histogram',
+                      res.content)
+
+    def test_includes_pool_stats(self):
+        """Test connection pool metrics are exported per alias."""
+        stats = {'default': {'in_use': 2, 'idle': 1, 'max_size': 5,
+                             'acquired': 10, 'timeouts': 0,
+                             'wait_seconds_total': 0.25,
+                             'wait_buckets': {0.01: 8, 1.0: 9}}}
+        with mock.patch('core.metrics.pool_stats', return_value=stats):
+            res = self.client.get(METRICS_URL)
+
+        self.assertIn(b'db_pool_connections_in_use{alias="default"} 2',
+                      res.content)
+        self.assertIn(b'db_pool_wait_seconds_total{alias="default"} 0.25',
+                      res.content)
+        self.assertIn(
+            b'db_pool_wait_seconds_bucket{alias="default",le="0.01"} 8',
+            res.content,
+        )
+        self.assertIn(
+            b'db_pool_wait_seconds_bucket{alias="default",le="+Inf"} 10',
+            res.content,
+        )
+
+    def test_token_required(self):
+        """Test a configured token must be presented."""
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='')
+        self.assertEqual(res.status_code, 401)
+
+        res = self.client.get(METRICS_URL,
+                              HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(res.status_code, 401)
+
+    @override_settings(METRICS=metrics_settings(TOKEN=''))
+    def test_hidden_without_token(self):
+        """Test the endpoint fails closed when no token is configured."""
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 404)
+
+    @override_settings(METRICS=metrics_settings(TOKEN=''), DEBUG=True)
+    def test_open_without_token_in_debug(self):
+        """Test local development can scrape without a token."""
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='')
+
+        self.assertEqual(res.status_code, 200)
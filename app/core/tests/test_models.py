@@ -5,7 +5,10 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model as User
 from django.core.exceptions import ValidationError
 
-from core.enums import Role, Seniority, Employment
+from core.enums import (
+    Role, Seniority, Employment, TechSkill, PersSkill, LangSkill, LangProf,
+)
+from core.skills import language_code
 from core import models
 
 
@@ -220,3 +223,132 @@ class ModelTests(TestCase):
                 seniority=Seniority.JUNIOR,
                 employment_type=Employment.FULL_TIME
             )
+
+    def test_create_job_min_salary_above_max_raises_error(self):
+        """Test creating a job with an inverted salary range
+            raises ValidationError."""
+        user = User().objects.create_user(
+            email='test@example.com',
+            password='test123',
+            role=Role.COMPANY
+        )
+
+        with self.assertRaises(ValidationError):
+            models.Job.objects.create(
+                company=user,
+                title="Test Title",
+                description="Test Description",
+                main_tasks='Test Task #1',
+                min_salary=150000,
+                max_salary=50000,
+                seniority=Seniority.JUNIOR,
+                employment_type=Employment.FULL_TIME
+            )
+
+    def test_job_salary_range_queries(self):
+        """Test salary overlap and containment queries."""
+        user = User().objects.create_user(
+            email='test@example.com',
+            password='test123',
+            role=Role.COMPANY
+        )
+        jobs = {}
+        for name, (low, high) in {
+            'below': (30000, 59999),
+            'edge': (40000, 60000),
+            'inside': (65000, 75000),
+            'around': (50000, 90000),
+            'above': (80001, 120000),
+        }.items():
+            jobs[name] = models.Job.objects.create(
+                company=user,
+                title=name,
+                description="Test Description",
+                main_tasks='Test Task #1',
+                min_salary=low,
+                max_salary=high,
+                seniority=Seniority.JUNIOR,
+                employment_type=Employment.FULL_TIME
+            )
+
+        overlapping = models.Job.objects.salary_overlaps(60000, 80000)
+        containing = models.Job.objects.salary_contains(60000, 80000)
+
+        self.assertCountEqual(
+            [job.title for job in overlapping],
+            ['edge', 'inside', 'around']
+        )
+        self.assertEqual([job.title for job in containing], ['around'])
+
+
+def create_talent(email, skills):
+    """Create and return a talent profile with ``skills``."""
+    account = User().objects.create_user(
+        email=email, password='test123', role=Role.TALENT
+    )
+    return models.TalentProfile.objects.create(
+        account=account, profile_description='Test', skills=skills
+    )
+
+
+class SkillStorageTests(TestCase):
+    """Test storing and filtering skill codes."""
+
+    def setUp(self):
+        self.alice = create_talent('alice@example.com', [
+            TechSkill.PYTHON, TechSkill.DJANGO, TechSkill.PYTHON,
+            language_code(LangSkill.ENGLISH, LangProf.ADVANCED),
+        ])
+        self.bob = create_talent('bob@example.com', [
+            TechSkill.JAVA, PersSkill.TEAMWORK,
+            language_code(LangSkill.ENGLISH, LangProf.BEGINNER),
+        ])
+        self.talents = models.TalentProfile.objects.all()
+
+    def test_codes_are_normalized(self):
+        """Test codes are sorted, unique and hold lower language
+        levels."""
+        self.alice.refresh_from_db()
+
+        self.assertEqual(self.alice.skills, [
+            'EN:ADV', 'EN:BEG', 'EN:INT', TechSkill.DJANGO,
+            TechSkill.PYTHON,
+        ])
+
+    def test_unknown_code_raises_error(self):
+        """Test saving an unknown skill code fails validation."""
+        self.alice.skills = [TechSkill.PYTHON, 'TECH_NOPE']
+
+        with self.assertRaises(ValidationError):
+            self.alice.save()
+
+    def test_has_all_and_any_skills(self):
+        """Test filtering by every or any of several skills."""
+        self.assertEqual(
+            list(self.talents.has_all_skills(
+                [TechSkill.PYTHON, TechSkill.DJANGO]
+            )), [self.alice],
+        )
+        self.assertFalse(self.talents.has_all_skills(
+            [TechSkill.PYTHON, TechSkill.JAVA]
+        ).exists())
+        self.assertCountEqual(
+            self.talents.has_any_skills([TechSkill.DJANGO, TechSkill.JAVA]),
+            [self.alice, self.bob],
+        )
+        self.assertFalse(self.talents.has_any_skills([]).exists())
+
+    def test_speaks(self):
+        """Test filtering by a minimum language level."""
+        self.assertCountEqual(
+            self.talents.speaks(LangSkill.ENGLISH, LangProf.BEGINNER),
+            [self.alice, self.bob],
+        )
+        self.assertEqual(
+            list(self.talents.speaks(LangSkill.ENGLISH,
+                                     LangProf.INTERMEDIATE)),
+            [self.alice],
+        )
+        self.assertFalse(
+            self.talents.speaks(LangSkill.GERMAN, LangProf.BEGINNER).exists()
+        )
@@ -0,0 +1,243 @@
+"""
+Tests for the database connection pool.
+"""
+import threading
+from unittest.mock import patch
+
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase
+
+from core.db import pool as pool_module
+from core.db.backends.postgresql.base import DatabaseWrapper
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    """Stand-in for a psycopg2 cursor."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql):
+        if self.connection.dropped:
+            raise OperationalError('server closed the connection')
+        self.connection.queries.append(sql)
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection."""
+
+    def __init__(self):
+        self.closed = 0
+        self.status = 0
+        self.rollbacks = 0
+        self.dropped = False
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = 0
+
+    def close(self):
+        self.closed = 1
+
+
+def create_pool(**kwargs):
+    """Create a pool of fake connections."""
+    kwargs.setdefault('max_size', 2)
+    kwargs.setdefault('timeout', 0.05)
+    return ConnectionPool(FakeConnection, **kwargs)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """Test the connection pool."""
+
+    def test_released_connection_is_reused(self):
+        """Test a released connection is handed out again."""
+        pool = create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(pool.stats()['created'], 1)
+
+    def test_acquire_times_out_when_exhausted(self):
+        """Test acquiring beyond the maximum size waits then fails."""
+        pool = create_pool(max_size=1)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        stats = pool.stats()
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['in_use'], 1)
+        self.assertIsInstance(PoolTimeout(), OperationalError)
+
+    def test_waiter_gets_released_connection(self):
+        """Test a waiting thread receives the next released connection."""
+        pool = create_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(
+            target=lambda: acquired.append(pool.acquire())
+        )
+        waiter.start()
+        threading.Event().wait(0.05)
+
+        pool.release(connection)
+        waiter.join(5)
+
+        self.assertEqual(acquired, [connection])
+        stats = pool.stats()
+        self.assertEqual(stats['waited'], 1)
+        self.assertGreater(stats['wait_seconds_max'], 0.01)
+        self.assertEqual(stats['wait_buckets'][5.0], 2)
+
+    def test_dirty_connection_rolled_back(self):
+        """Test released connections in a transaction are rolled back."""
+        pool = create_pool()
+        connection = pool.acquire()
+        connection.status = 2
+
+        pool.release(connection)
+
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertIs(pool.acquire(), connection)
+
+    def test_broken_connection_discarded(self):
+        """Test closed connections free their slot and are not reused."""
+        pool = create_pool(max_size=1)
+        connection = pool.acquire()
+        connection.closed = 2
+
+        pool.release(connection)
+
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertEqual(pool.stats()['discarded'], 1)
+
+    def test_idle_connections_expire(self):
+        """Test connections idle longer than max_idle are closed."""
+        pool = create_pool(max_idle=0)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_recently_used_connection_not_checked(self):
+        """Test connections idle for a moment are reused unchecked."""
+        pool = create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(connection.queries, [])
+
+    def test_idle_connection_checked_before_reuse(self):
+        """Test a long idle connection must answer a query first."""
+        pool = create_pool(check_after=0)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(connection.queries, ['SELECT 1'])
+
+    def test_dropped_connection_discarded(self):
+        """Test a connection the server dropped is replaced."""
+        pool = create_pool(max_size=1, check_after=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.dropped = True
+
+        replacement = pool.acquire()
+
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+        stats = pool.stats()
+        self.assertEqual(stats['discarded'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_failed_connect_frees_slot(self):
+        """Test a failed connection attempt does not leak a slot."""
+        pool = create_pool(max_size=1)
+
+        with patch.object(pool, 'connect', side_effect=OperationalError):
+            with self.assertRaises(OperationalError):
+                pool.acquire()
+
+        self.assertIsInstance(pool.acquire(), FakeConnection)
+
+    def test_close_all(self):
+        """Test idle connections are closed."""
+        pool = create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        pool.close_all()
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Test the pooling PostgreSQL backend."""
+
+    def setUp(self):
+        patcher = patch.dict(pool_module._pools, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_wrapper(self, pool_options):
+        wrapper = DatabaseWrapper({
+            'NAME': 'pooled', 'USER': '', 'PASSWORD': '', 'HOST': '',
+            'PORT': '', 'OPTIONS': {}, 'TIME_ZONE': None,
+            'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+            'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False, 'TEST': {},
+            'POOL': pool_options,
+        }, alias='pooled')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    @patch('django.db.backends.postgresql.base.DatabaseWrapper'
+           '.get_new_connection')
+    def test_connections_return_to_pool(self, connect):
+        """Test closing the wrapper releases its connection."""
+        connect.side_effect = lambda params: FakeConnection()
+        wrapper = self.create_wrapper({'MAX_SIZE': 2})
+
+        first = wrapper.get_new_connection({'dbname': 'pooled'})
+        wrapper.connection = first
+        wrapper._close()
+        second = wrapper.get_new_connection({'dbname': 'pooled'})
+        wrapper.connection = second
+
+        self.assertIs(first, second)
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(pool_module.pool_stats()['pooled']['in_use'], 1)
+
+    @patch('django.db.backends.postgresql.base.DatabaseWrapper'
+           '.get_new_connection')
+    def test_pool_disabled_by_default(self, connect):
+        """Test without a pool size every connection is new."""
+        connect.side_effect = lambda params: FakeConnection()
+        wrapper = self.create_wrapper({'MAX_SIZE': 0})
+
+        wrapper.get_new_connection({'dbname': 'pooled'})
+        wrapper.get_new_connection({'dbname': 'pooled'})
+
+        self.assertEqual(connect.call_count, 2)
+        self.assertEqual(pool_module.pool_stats(), {})
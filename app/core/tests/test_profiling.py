@@ -0,0 +1,182 @@
+"""
+Tests for the request profiler.
+"""
+import cProfile
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.enums import Role
+from core.models import User
+from core.profiling import ProfileStore, aggregate
+
+
+ME_URL = reverse('user:me')
+HEALTHZ_URL = reverse('healthz')
+
+
+def profiling_settings(directory, **params):
+    """Return PROFILING settings writing to ``directory``."""
+    defaults = {
+        'ENABLED': True, 'SAMPLE_RATE': 0, 'HEADER': 'X-Profile',
+        'AUTHENTICATION_CLASSES': [
+            'user.authentication.SignedTokenAuthentication',
+            'user.authentication.CachedTokenAuthentication',
+        ],
+        'DIRECTORY': directory, 'MAX_FILES': 10,
+    }
+    defaults.update(params)
+    return defaults
+
+
+def busy_profile():
+    """Return a profile of some trivial work."""
+    profile = cProfile.Profile()
+    profile.enable()
+    sorted(str(number) for number in range(1000))
+    profile.disable()
+    return profile
+
+
+class ProfileStoreTests(SimpleTestCase):
+    """Test the on-disk profile store."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_save_and_aggregate(self):
+        """Test saved profiles load back and sum up."""
+        store = ProfileStore(self.directory, max_files=5)
+        name = store.save(busy_profile(), 'GET-core.views.healthz', 0.0123)
+        store.save(busy_profile(), 'GET-core.views.healthz', 0.01)
+
+        self.assertTrue(name.endswith('-GET-core.views.healthz-12ms.prof.gz'))
+        stats = aggregate(store.paths())
+        calls = [
+            value[1] for func, value in stats.stats.items()
+            if func[2] == "<built-in method builtins.sorted>"
+        ]
+        self.assertEqual(calls, [2])
+
+    def test_retention(self):
+        """Test only the newest profiles are kept."""
+        store = ProfileStore(self.directory, max_files=3)
+        names = [store.save(busy_profile(), f'view{index}', 0.001)
+                 for index in range(5)]
+
+        kept = sorted(os.listdir(self.directory))
+        self.assertEqual(len(kept), 3)
+        self.assertTrue(set(kept) <= set(names))
+
+
+class ProfilingMiddlewareTests(TestCase):
+    """Test requests are profiled when sampled or requested."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def stored(self):
+        return os.listdir(self.directory)
+
+    def test_sampled_requests_are_profiled(self):
+        """Test a sample rate of one profiles every request."""
+        config = profiling_settings(self.directory, SAMPLE_RATE=1.0)
+        with override_settings(PROFILING=config):
+            self.client.get(HEALTHZ_URL)
+
+        self.assertEqual(len(self.stored()), 1)
+        self.assertIn('GET-core.views.healthz', self.stored()[0])
+
+    def test_unsampled_requests_are_not_profiled(self):
+        """Test nothing is written when sampling is off."""
+        with override_settings(PROFILING=profiling_settings(self.directory)):
+            res = self.client.get(HEALTHZ_URL)
+
+        self.assertEqual(self.stored(), [])
+        self.assertNotIn('X-Profile', res)
+
+    def test_header_from_staff_is_profiled(self):
+        """Test staff can request a profile of one request."""
+        staff = User.objects.create_user(
+            email='staff@example.com', password='testpass123',
+            role=Role.ADMIN, is_staff=True,
+        )
+        client = APIClient()
+        client.force_authenticate(staff)
+
+        with override_settings(PROFILING=profiling_settings(self.directory)):
+            res = client.patch(ME_URL, {'first_name': 'New'},
+                               HTTP_X_PROFILE='1')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.stored(), [res['X-Profile']])
+        self.assertIn('PATCH-user.views.ManageUserView', res['X-Profile'])
+
+    def test_header_with_staff_token_is_profiled(self):
+        """Test staff are recognised from their API token."""
+        staff = User.objects.create_user(
+            email='staff@example.com', password='testpass123',
+            role=Role.ADMIN, is_staff=True,
+        )
+        token = Token.objects.create(user=staff)
+
+        with override_settings(PROFILING=profiling_settings(self.directory)):
+            res = self.client.get(ME_URL, HTTP_AUTHORIZATION=f'Token {token}',
+                                  HTTP_X_PROFILE='1')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.stored(), [res['X-Profile']])
+
+    def test_header_from_others_is_ignored(self):
+        """Test non-staff and anonymous clients never start the
+        profiler."""
+        user = User.objects.create_user(
+            email='talent@example.com', password='testpass123',
+            role=Role.TALENT,
+        )
+        token = Token.objects.create(user=user)
+
+        with override_settings(PROFILING=profiling_settings(self.directory)), \
+                mock.patch('cProfile.Profile') as profile:
+            res = self.client.get(ME_URL, HTTP_AUTHORIZATION=f'Token {token}',
+                                  HTTP_X_PROFILE='1')
+            self.client.get(HEALTHZ_URL, HTTP_X_PROFILE='1')
+            self.client.get(ME_URL, HTTP_AUTHORIZATION='Token bogus',
+                            HTTP_X_PROFILE='1')
+
+        profile.assert_not_called()
+        self.assertEqual(self.stored(), [])
+        self.assertNotIn('X-Profile', res)
+
+
+class ProfileReportCommandTests(SimpleTestCase):
+    """Test the profile_report command."""
+
+    def test_report(self):
+        """Test the report lists functions from matching profiles."""
+        directory = tempfile.mkdtemp()
+        store = ProfileStore(directory, max_files=10)
+        store.save(busy_profile(), 'PATCH-user.views.ManageUserView', 0.2)
+        store.save(cProfile.Profile(), 'GET-core.views.healthz', 0.001)
+        out = StringIO()
+
+        call_command('profile_report', directory=directory,
+                     view='ManageUserView', sort='tottime', stdout=out)
+
+        self.assertIn('Aggregated 1 profiles.', out.getvalue())
+        self.assertIn('builtins.sorted', out.getvalue())
+
+    def test_no_profiles(self):
+        """Test an empty store is an error."""
+        with self.assertRaises(CommandError):
+            call_command('profile_report', directory=tempfile.mkdtemp(),
+                         stdout=StringIO())
@@ -0,0 +1,47 @@
+"""
+Tests for the API renderers.
+"""
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Test the orjson backed renderer."""
+
+    def test_renders_same_document_as_stock_renderer(self):
+        """Test output decodes to what JSONRenderer produces."""
+        data = {'results': [{'id': 1, 'title': 'Développeur'}],
+                'price': Decimal('1.50'), 'detail': gettext_lazy('Hello')}
+
+        fast = FastJSONRenderer().render(data)
+        stock = JSONRenderer().render(data)
+
+        self.assertEqual(json.loads(fast), json.loads(stock))
+
+    def test_indent_uses_stock_renderer(self):
+        """Test indented output requests are honoured."""
+        rendered = FastJSONRenderer().render(
+            {'id': 1}, 'application/json; indent=4'
+        )
+
+        self.assertEqual(rendered, b'{\n    "id": 1\n}')
+
+    def test_falls_back_without_orjson(self):
+        """Test the renderer works when orjson is not installed."""
+        with mock.patch.object(renderers, 'orjson', None):
+            rendered = FastJSONRenderer().render({'id': 1})
+
+        self.assertEqual(rendered, b'{"id":1}')
+
+    def test_none_renders_empty_body(self):
+        """Test empty responses render no content."""
+        self.assertEqual(FastJSONRenderer().render(None), b'')
@@ -0,0 +1,180 @@
+"""
+Tests for read replica routing.
+"""
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.db.routers import PrimaryReplicaRouter, routing_scope, use_primary
+from core.enums import Role
+from core.middleware import ReadYourWritesMiddleware
+from core.models import Job
+
+
+def write_view(request):
+    """View routing a write, like any save would."""
+    router.db_for_write(Job)
+    return HttpResponse(router.db_for_read(Job))
+
+
+def read_view(request):
+    """View reporting where its reads go."""
+    return HttpResponse(router.db_for_read(Job))
+
+
+async def async_write_view(request):
+    """Async view routing a write."""
+    return write_view(request)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """Test routing decisions."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        scope = routing_scope()
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+
+    def test_reads_use_replicas(self):
+        """Test reads are spread over the replicas."""
+        aliases = {self.router.db_for_read(Job) for _ in range(50)}
+
+        self.assertEqual(aliases, {'replica1', 'replica2'})
+
+    def test_writes_pin_reads_to_primary(self):
+        """Test reads after a write in the same context use the primary."""
+        self.assertEqual(self.router.db_for_write(Job), 'default')
+
+        self.assertEqual(self.router.db_for_read(Job), 'default')
+
+    def test_scope_forgets_writes(self):
+        """Test a write inside a scope does not pin the outer context."""
+        with routing_scope() as wrote:
+            self.router.db_for_write(Job)
+            self.assertTrue(wrote())
+
+        self.assertIn(self.router.db_for_read(Job), ['replica1', 'replica2'])
+
+    def test_use_primary(self):
+        """Test reads inside use_primary go to the primary."""
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Job), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Test everything uses the primary without replicas."""
+        self.assertEqual(self.router.db_for_read(Job), 'default')
+
+    def test_migrations_only_on_primary(self):
+        """Test replicas are never migrated directly."""
+        self.assertTrue(self.router.allow_migrate('default', 'core'))
+        self.assertFalse(self.router.allow_migrate('replica1', 'core'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReadYourWritesMiddlewareTests(SimpleTestCase):
+    """Test read-your-writes stickiness."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_safe_request_reads_replica(self):
+        """Test reads without a recent write go to a replica."""
+        res = ReadYourWritesMiddleware(read_view)(self.factory.get('/'))
+
+        self.assertEqual(res.content, b'replica1')
+        self.assertNotIn(settings.READ_YOUR_WRITES['COOKIE_NAME'],
+                         res.cookies)
+
+    def test_write_sets_sticky_cookie(self):
+        """Test a write pins the client to the primary for the window."""
+        res = ReadYourWritesMiddleware(write_view)(self.factory.get('/'))
+
+        cookie = res.cookies[settings.READ_YOUR_WRITES['COOKIE_NAME']]
+        self.assertEqual(res.content, b'default')
+        self.assertEqual(cookie['max-age'],
+                         settings.READ_YOUR_WRITES['WINDOW'])
+        self.assertTrue(cookie['httponly'])
+
+    def test_sticky_cookie_reads_primary(self):
+        """Test a client that wrote recently reads from the primary."""
+        request = self.factory.get('/')
+        request.COOKIES[settings.READ_YOUR_WRITES['COOKIE_NAME']] = '1'
+
+        res = ReadYourWritesMiddleware(read_view)(request)
+
+        self.assertEqual(res.content, b'default')
+
+    def test_unsafe_request_reads_primary(self):
+        """Test reads during unsafe requests use the primary."""
+        res = ReadYourWritesMiddleware(read_view)(self.factory.post('/'))
+
+        self.assertEqual(res.content, b'default')
+
+    async def test_async_write_sets_sticky_cookie(self):
+        """Test async views get the same stickiness."""
+        middleware = ReadYourWritesMiddleware(async_write_view)
+
+        res = await middleware(self.factory.get('/'))
+
+        self.assertIn(settings.READ_YOUR_WRITES['COOKIE_NAME'], res.cookies)
+
+    def test_pins_do_not_leak_between_requests(self):
+        """Test the next request starts unpinned."""
+        middleware = ReadYourWritesMiddleware(write_view)
+        middleware(self.factory.get('/'))
+
+        res = ReadYourWritesMiddleware(read_view)(self.factory.get('/'))
+
+        self.assertEqual(res.content, b'replica1')
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'No read replica configured.')
+class ReplicaIntegrationTests(TransactionTestCase):
+    """Test the API against replicas mirroring the test database.
+
+    Run with DB_REPLICA_HOSTS set, e.g. to the primary's own host.
+    Mirrors use their own connections, so only committed data is
+    visible on them.
+    """
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+            role=Role.TALENT,
+        )
+
+    def test_token_then_profile(self):
+        """Test a client can use its token right after creating it."""
+        res = self.client.post(reverse('user:token'), {
+            'email': 'user@example.com', 'password': 'testpass123',
+        })
+        token = res.data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+        profile = self.client.get(reverse('user:me'))
+
+        self.assertEqual(profile.status_code, 200)
+        self.assertIn(settings.READ_YOUR_WRITES['COOKIE_NAME'], res.cookies)
+
+    def test_job_list_reads_replica(self):
+        """Test anonymous job listings are served by a replica."""
+        with CaptureQueriesContext(connections['default']) as primary:
+            res = self.client.get(reverse('job:job-list'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(primary), 0)
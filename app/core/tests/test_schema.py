@@ -0,0 +1,171 @@
+"""
+Tests for the precomputed OpenAPI schema.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from drf_spectacular.drainage import GENERATOR_STATS
+from rest_framework.test import APIClient
+
+from core import schema
+
+
+SCHEMA_URL = reverse('api-schema')
+
+
+class CachedSchemaTests(TestCase):
+    """Test the cached schema endpoint and artifact."""
+
+    def setUp(self):
+        self.client = APIClient()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.artifact = os.path.join(tmp.name, 'schema.json')
+        settings = override_settings(
+            OPENAPI_SCHEMA={'ARTIFACT': self.artifact, 'MAX_AGE': 600}
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        schema.clear_schema_cache()
+        self.addCleanup(schema.clear_schema_cache)
+
+    def test_schema_served_with_cache_headers(self):
+        """Test the schema is cacheable and revalidates with its ETag."""
+        res = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('/api/job/', json.loads(res.content)['paths'])
+        self.assertIn('max-age=600', res['Cache-Control'])
+        self.assertIn('public', res['Cache-Control'])
+
+        cached = self.client.get(SCHEMA_URL, {'format': 'json'},
+                                 HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], res['ETag'])
+
+    def test_formats_have_distinct_etags(self):
+        """Test YAML and JSON responses are cached separately."""
+        yaml = self.client.get(SCHEMA_URL)
+        json_res = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        self.assertTrue(yaml.content.startswith(b'openapi:'))
+        self.assertNotEqual(yaml['ETag'], json_res['ETag'])
+
+    def test_schema_generated_once(self):
+        """Test repeated requests reuse the generated schema."""
+        with patch.object(schema, 'generate_schema',
+                          wraps=schema.generate_schema) as generate:
+            self.client.get(SCHEMA_URL)
+            self.client.get(SCHEMA_URL)
+            self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        generate.assert_called_once()
+
+    def test_unknown_version_rejected(self):
+        """Test a version outside ALLOWED_VERSIONS is not generated."""
+        with patch.object(schema, 'generate_schema') as generate:
+            res = self.client.get(SCHEMA_URL, {'version': 'v99'})
+
+        self.assertEqual(res.status_code, 404)
+        generate.assert_not_called()
+
+    def test_cache_is_bounded(self):
+        """Test Accept parameters do not add cache entries."""
+        for indent in range(schema.MAX_CACHED + 2):
+            res = self.client.get(
+                SCHEMA_URL, HTTP_ACCEPT=f'application/json; indent={indent}'
+            )
+            self.assertEqual(res.status_code, 200)
+
+        self.assertEqual(len(schema._rendered), 1)
+        self.assertLessEqual(len(schema._schemas), schema.MAX_CACHED)
+
+    def test_current_artifact_is_served(self):
+        """Test a matching artifact is used instead of introspection."""
+        fake = {'openapi': '3.0.3', 'paths': {'/from-artifact/': {}}}
+        schema.write_artifact(self.artifact, fake,
+                              schema.schema_fingerprint())
+
+        with patch.object(schema, 'generate_schema') as generate:
+            res = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        generate.assert_not_called()
+        self.assertEqual(json.loads(res.content)['paths'], fake['paths'])
+
+    def test_stale_artifact_is_ignored(self):
+        """Test an artifact from other code is regenerated from scratch."""
+        fake = {'openapi': '3.0.3', 'paths': {'/from-artifact/': {}}}
+        schema.write_artifact(self.artifact, fake, 'old-fingerprint')
+
+        res = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        self.assertNotIn('/from-artifact/', json.loads(res.content)['paths'])
+
+    def test_fingerprint_tracks_spectacular_settings(self):
+        """Test schema settings are part of the fingerprint."""
+        before = schema.schema_fingerprint()
+        schema.clear_schema_cache()
+
+        with override_settings(SPECTACULAR_SETTINGS={'TITLE': 'Other'}):
+            after = schema.schema_fingerprint()
+
+        self.assertNotEqual(before, after)
+
+    def test_fingerprint_tracks_rest_framework_settings(self):
+        """Test REST framework settings are part of the fingerprint."""
+        before = schema.schema_fingerprint()
+        schema.clear_schema_cache()
+
+        with override_settings(REST_FRAMEWORK={'PAGE_SIZE': 5}):
+            after = schema.schema_fingerprint()
+
+        self.assertNotEqual(before, after)
+
+    def test_generate_schema_command(self):
+        """Test the command writes the artifact only when stale."""
+        with self.assertRaises(CommandError):
+            call_command('generate_schema', '--check', stdout=StringIO())
+
+        call_command('generate_schema', stdout=StringIO())
+        with open(self.artifact) as artifact:
+            written = json.load(artifact)
+        out = StringIO()
+        call_command('generate_schema', '--check', stdout=out)
+
+        self.assertEqual(written['fingerprint'], schema.schema_fingerprint())
+        self.assertIn('/api/job/', written['schema']['paths'])
+        self.assertIn('up to date', out.getvalue())
+
+
+class SchemaGenerationTests(TestCase):
+    """Test the generated schema itself."""
+
+    def test_schema_has_no_warnings(self):
+        """Test schema generation succeeds with warnings as errors."""
+        GENERATOR_STATS.reset()
+        self.addCleanup(GENERATOR_STATS.reset)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'schema.json')
+            call_command('spectacular', '--fail-on-warn', '--format',
+                         'openapi-json', '--file', path, stderr=StringIO())
+            with open(path) as output:
+                generated = json.load(output)
+
+        response = generated['paths']['/api/job/salary-stats/']['get'][
+            'responses']['200']['content']['application/json']['schema']
+        self.assertEqual(response['$ref'],
+                         '#/components/schemas/SalaryPercentiles')
+        self.assertIn(
+            'relative_accuracy',
+            generated['components']['schemas']['SalaryPercentiles'][
+                'properties'],
+        )
@@ -0,0 +1,66 @@
+"""
+Tests for the quantile sketches.
+"""
+import random
+
+from django.test import SimpleTestCase
+
+from core.sketches import QuantileSketch
+
+
+def exact_quantile(values, q):
+    """Return the exact lower ``q``-quantile of ``values``."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class QuantileSketchTests(SimpleTestCase):
+    """Test the DDSketch style quantile sketch."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.lognormvariate(11, 0.5) for _ in range(5000)]
+
+    def test_relative_accuracy(self):
+        """Test quantiles are within the relative accuracy."""
+        sketch = QuantileSketch(0.01)
+        for value in self.values:
+            sketch.add(value)
+
+        for q in (0, 0.1, 0.5, 0.9, 0.99, 1):
+            exact = exact_quantile(self.values, q)
+            self.assertAlmostEqual(sketch.quantile(q) / exact, 1, delta=0.01)
+
+    def test_merge_equals_single_sketch(self):
+        """Test merging sketches of two halves gives the whole."""
+        whole = QuantileSketch(0.01)
+        left = QuantileSketch(0.01)
+        right = QuantileSketch(0.01)
+        for index, value in enumerate(self.values):
+            whole.add(value)
+            (left if index % 2 else right).add(value)
+
+        left.merge(right)
+
+        self.assertEqual(left.counts, whole.counts)
+
+    def test_remove(self):
+        """Test removed values no longer count."""
+        sketch = QuantileSketch(0.01)
+        sketch.add(50000)
+        sketch.add(90000)
+
+        sketch.add(90000, count=-1)
+
+        self.assertEqual(sketch.count, 1)
+        self.assertEqual(len(sketch.counts), 1)
+        self.assertAlmostEqual(sketch.quantile(0.9) / 50000, 1, delta=0.01)
+
+    def test_empty(self):
+        """Test an empty sketch has no quantiles."""
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+    def test_merge_requires_same_accuracy(self):
+        """Test sketches with different buckets cannot be merged."""
+        with self.assertRaises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
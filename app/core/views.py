@@ -0,0 +1,54 @@
+"""
+Operational views: health checks and metrics.
+"""
+from psycopg2 import OperationalError as Psycopg2Error
+
+from django.conf import settings
+from django.db.utils import OperationalError
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from core.health import ping_database
+from core.metrics import registry
+
+
+@never_cache
+@require_GET
+def healthz(request):
+    """Liveness: the process is up and serving requests."""
+    return JsonResponse({'status': 'ok'})
+
+
+@never_cache
+@require_GET
+def readyz(request):
+    """Readiness: the process can reach its database."""
+    try:
+        ping_database()
+    except (Psycopg2Error, OperationalError):
+        return JsonResponse({'status': 'unavailable'}, status=503)
+    return JsonResponse({'status': 'ok'})
+
+
+@never_cache
+@require_GET
+def metrics(request):
+    """Request and connection pool metrics for Prometheus.
+
+    Scrapers must send ``METRICS['TOKEN']`` as a Bearer token. Without a
+    configured token the endpoint is hidden, except under ``DEBUG``.
+    """
+    token = settings.METRICS['TOKEN']
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    else:
+        header = request.headers.get('Authorization', '')
+        if not constant_time_compare(header, f'Bearer {token}'):
+            return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
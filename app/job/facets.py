@@ -0,0 +1,136 @@
+"""
+Facet counts for job search.
+
+Counts live in ``JobFacetCount`` and are adjusted by the job signal
+handlers on every create, update and delete, so reading them costs one
+query over a table with one row per facet value. Writes that bypass the
+signals (``QuerySet.update()``, raw SQL) are corrected by the
+``reconcile_job_facets`` command.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+
+from core.models import Job, JobFacetCount
+
+
+FACET_FIELDS = ['seniority', 'employment_type']
+SALARY_FACET = 'salary'
+# Lower bounds of the salary buckets, applied to ``min_salary``.
+SALARY_BUCKETS = [0, 25000, 50000, 75000, 100000, 150000, 200000]
+
+
+def _bucket_label(index):
+    lower = SALARY_BUCKETS[index]
+    if index + 1 == len(SALARY_BUCKETS):
+        return f'{lower}+'
+    return f'{lower}-{SALARY_BUCKETS[index + 1] - 1}'
+
+
+SALARY_BUCKET_LABELS = [_bucket_label(i) for i in range(len(SALARY_BUCKETS))]
+
+
+def salary_bucket(salary):
+    """Return the salary bucket label for ``salary``."""
+    for index in range(len(SALARY_BUCKETS) - 1, 0, -1):
+        if salary >= SALARY_BUCKETS[index]:
+            return SALARY_BUCKET_LABELS[index]
+    return SALARY_BUCKET_LABELS[0]
+
+
+def job_facets(values):
+    """Return the ``(facet, value)`` pairs a job counts towards.
+
+    ``values`` maps field names to the job's values.
+    """
+    facets = [(field, values[field]) for field in FACET_FIELDS]
+    facets.append((SALARY_FACET, salary_bucket(values['min_salary'])))
+    return facets
+
+
+def apply_deltas(deltas, using='default'):
+    """Add ``deltas`` (a mapping of ``(facet, value)`` to change) to the
+    stored counts."""
+    manager = JobFacetCount.objects.using(using)
+    with transaction.atomic(using=using):
+        for (facet, value), delta in sorted(deltas.items()):
+            if not delta:
+                continue
+            updated = manager.filter(facet=facet, value=value).update(
+                count=F('count') + delta
+            )
+            if not updated:
+                manager.get_or_create(facet=facet, value=value)
+                manager.filter(facet=facet, value=value).update(
+                    count=F('count') + delta
+                )
+
+
+def record_change(before, after, using='default'):
+    """Update counts for a job going from ``before`` to ``after``.
+
+    Either side may be None for a created or deleted job.
+    """
+    deltas = Counter()
+    if before is not None:
+        deltas.subtract(job_facets(before))
+    if after is not None:
+        deltas.update(job_facets(after))
+    apply_deltas(deltas, using=using)
+
+
+def get_facets(using=None):
+    """Return ``{facet: {value: count}}`` for non-empty facet values."""
+    facets = {facet: {} for facet in FACET_FIELDS + [SALARY_FACET]}
+    rows = JobFacetCount.objects.using(using).filter(count__gt=0)
+    for facet, value, count in rows.values_list('facet', 'value', 'count'):
+        facets.setdefault(facet, {})[value] = count
+    return facets
+
+
+def compute_facets(using='default'):
+    """Count jobs per facet value with ``GROUP BY`` queries."""
+    jobs = Job.objects.using(using)
+    counts = {}
+    for field in FACET_FIELDS:
+        for row in jobs.values(field).annotate(n=Count('id')).order_by():
+            counts[(field, row[field])] = row['n']
+
+    bucket = Case(
+        *[When(min_salary__gte=lower, then=Value(label))
+          for lower, label in reversed(list(zip(SALARY_BUCKETS[1:],
+                                                SALARY_BUCKET_LABELS[1:])))],
+        default=Value(SALARY_BUCKET_LABELS[0]),
+    )
+    rows = jobs.annotate(bucket=bucket).values('bucket').annotate(
+        n=Count('id')
+    ).order_by()
+    for row in rows:
+        counts[(SALARY_FACET, row['bucket'])] = row['n']
+    return counts
+
+
+def reconcile(using='default'):
+    """Rewrite stored counts from the job table.
+
+    Return the ``(facet, value)`` pairs whose stored count was wrong.
+    """
+    with transaction.atomic(using=using):
+        expected = compute_facets(using=using)
+        manager = JobFacetCount.objects.using(using)
+        stored = {(row.facet, row.value): row
+                  for row in manager.select_for_update()}
+        drifted = []
+        for key in set(expected) | set(stored):
+            count = expected.get(key, 0)
+            row = stored.get(key)
+            if row is None:
+                manager.create(facet=key[0], value=key[1], count=count)
+            elif row.count != count:
+                row.count = count
+                row.save(update_fields=['count'])
+            else:
+                continue
+            drifted.append(key)
+    return sorted(drifted)
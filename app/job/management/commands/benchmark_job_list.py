@@ -0,0 +1,61 @@
+"""
+Django command to compare the job list serialization paths.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Job
+from core.renderers import FastJSONRenderer
+from job.serializers import JobSerializer
+
+
+class Command(BaseCommand):
+    """Django command to benchmark rendering a page of jobs.
+
+    Reads the newest jobs already in the database, so load some first
+    (e.g. with import_jobs).
+    """
+    help = 'Compare ModelSerializer and values() rendering of job pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        queryset = Job.objects.using(options['database']).order_by('-id')
+        queryset = queryset[:options['rows']]
+        rows = queryset.count()
+        if not rows:
+            raise CommandError('No jobs to benchmark, import some first.')
+
+        fields = JobSerializer.Meta.fields
+        paths = {
+            'serializer': lambda: JSONRenderer().render(
+                JobSerializer(queryset.all(), many=True).data
+            ),
+            'values': lambda: FastJSONRenderer().render(
+                list(queryset.values(*fields))
+            ),
+        }
+
+        timings = {}
+        for name, render in paths.items():
+            render()
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                render()
+            timings[name] = (time.perf_counter() - start) / options['repeat']
+            self.stdout.write(
+                f'{name}: {timings[name] * 1000:.2f} ms per page, '
+                f'{rows / timings[name]:,.0f} rows/s'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{rows}-row pages: values() path is '
+            f'{timings["serializer"] / timings["values"]:.1f}x faster.'
+        ))
@@ -0,0 +1,30 @@
+"""
+Django command to rebuild the company hiring summaries.
+"""
+from django.core.management.base import BaseCommand
+
+from job import summaries
+
+
+class Command(BaseCommand):
+    """Django command to recompute company summaries from the job table.
+
+    Run it once after deploying the summaries to fill them for existing
+    jobs, and whenever writes have bypassed the job signals.
+    """
+    help = 'Recompute company hiring summaries from the job table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--company', type=int, action='append', dest='companies',
+            help='Only rebuild this company; may be repeated.',
+        )
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        written = summaries.rebuild(options['companies'],
+                                    using=options['database'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} company summaries.'
+        ))
@@ -0,0 +1,25 @@
+"""
+Django command to rebuild the salary quantile sketches.
+"""
+from django.core.management.base import BaseCommand
+
+from job import salary_stats
+
+
+class Command(BaseCommand):
+    """Django command to recompute the salary sketches from the job table.
+
+    Run it once after deploying the sketches to fill them for existing
+    jobs, and whenever writes have bypassed the job signals.
+    """
+    help = 'Recompute salary percentile sketches from the job table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        written = salary_stats.rebuild(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt salary sketches, {written} buckets.'
+        ))
@@ -0,0 +1,27 @@
+"""
+Django command to reconcile job facet counts with the job table.
+"""
+from django.core.management.base import BaseCommand
+
+from job import facets
+
+
+class Command(BaseCommand):
+    """Django command to recompute job facet counts.
+
+    Meant to run periodically (e.g. from cron) to correct drift from writes
+    that bypass the job signals.
+    """
+    help = 'Recompute job facet counts from the job table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        drifted = facets.reconcile(using=options['database'])
+        for facet, value in drifted:
+            self.stdout.write(f'Corrected {facet}={value}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Facet counts reconciled, {len(drifted)} corrected.'
+        ))
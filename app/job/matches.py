@@ -0,0 +1,41 @@
+"""
+Matching a talent against every job.
+
+The job index is built from one ``values_list`` query and kept in the
+process until the job collection version changes, so a match costs a
+version lookup plus the vectorized scoring in ``core.matching``.
+"""
+import threading
+
+from core.matching import job_index, match_jobs
+from core.models import CollectionVersion
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_job_index(version=None):
+    """Return the job index for collection ``version``, rebuilding it
+    when the jobs changed since it was built."""
+    global _index
+    if version is None:
+        version = CollectionVersion.current(CollectionVersion.JOBS)[0]
+    with _lock:
+        if _index is None or _index[0] != version:
+            _index = (version, job_index())
+        return _index[1]
+
+
+def clear_job_index():
+    """Forget the cached job index."""
+    global _index
+    with _lock:
+        _index = None
+
+
+def matching_jobs(skills, k=20, seniority=None, seniority_tolerance=1,
+                  version=None):
+    """Return the ``k`` best ``(job_id, score)`` pairs for ``skills``."""
+    return match_jobs(get_job_index(version), skills, k=k,
+                      seniority=seniority,
+                      seniority_tolerance=seniority_tolerance)
@@ -0,0 +1,16 @@
+"""
+Pagination for the job API.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class JobCursorPagination(CursorPagination):
+    """Keyset pagination over the job primary key.
+
+    Pages are fetched with ``WHERE id < <cursor> ORDER BY id DESC LIMIT n``,
+    so the cost of a page does not depend on how deep it is.
+    """
+    ordering = '-id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
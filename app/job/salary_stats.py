@@ -0,0 +1,181 @@
+"""
+Salary percentiles per seniority, employment type and area.
+
+Each ``(dimension, value, bound)`` keeps a ``QuantileSketch`` whose
+bucket counts live in ``SalarySketchBucket`` and are adjusted by the job
+signal handlers, like the facet counts. Serving the statistics reads the
+buckets in one query instead of sorting the job table; the board-wide
+figures merge the per-seniority sketches. Writes that bypass the signals
+are corrected by the ``rebuild_salary_stats`` command.
+"""
+from collections import Counter, defaultdict
+
+from django.db import connections, transaction
+from django.db.models import Count, F
+
+from core.models import Job, SalarySketchBucket
+from core.sketches import QuantileSketch
+
+
+DIMENSIONS = ['seniority', 'employment_type', 'area']
+BOUNDS = ['min_salary', 'max_salary']
+PERCENTILES = {'p10': 0.1, 'p50': 0.5, 'p90': 0.9}
+# Quantiles are within 1% of the exact salary.
+RELATIVE_ACCURACY = 0.01
+
+_sketch = QuantileSketch(RELATIVE_ACCURACY)
+
+
+def job_buckets(values):
+    """Return the ``(dimension, value, bound, bucket)`` keys a job
+    counts towards. Jobs without an area are left out of that
+    dimension."""
+    keys = []
+    for dimension in DIMENSIONS:
+        if not values[dimension]:
+            continue
+        for bound in BOUNDS:
+            keys.append((dimension, values[dimension], bound,
+                         _sketch.key(values[bound])))
+    return keys
+
+
+# Vendors that can add to a count with INSERT ... ON CONFLICT DO UPDATE.
+UPSERT_VENDORS = ('postgresql', 'sqlite')
+UPSERT_BATCH_SIZE = 500
+
+
+def apply_deltas(deltas, using='default'):
+    """Add ``deltas`` (a mapping of bucket key to change) to the stored
+    counts.
+
+    A bulk insert of thousands of jobs touches thousands of buckets, so
+    where supported every bucket of a batch is incremented by a single
+    upsert statement. Keys are written in sorted order so concurrent
+    writers lock rows in the same order.
+    """
+    rows = [key + (delta,) for key, delta in sorted(deltas.items())
+            if delta]
+    if not rows:
+        return
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor in UPSERT_VENDORS:
+            _upsert(connection, rows)
+            return
+        manager = SalarySketchBucket.objects.using(using)
+        for dimension, value, bound, bucket, delta in rows:
+            lookup = {'dimension': dimension, 'value': value,
+                      'bound': bound, 'bucket': bucket}
+            updated = manager.filter(**lookup).update(
+                count=F('count') + delta
+            )
+            if not updated:
+                manager.get_or_create(**lookup)
+                manager.filter(**lookup).update(count=F('count') + delta)
+
+
+def _upsert(connection, rows):
+    table = connection.ops.quote_name(SalarySketchBucket._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            values = ', '.join(['(%s, %s, %s, %s, %s)'] * len(batch))
+            cursor.execute(
+                f'INSERT INTO {table} '
+                f'(dimension, value, bound, bucket, count) '
+                f'VALUES {values} '
+                f'ON CONFLICT (dimension, value, bound, bucket) '
+                f'DO UPDATE SET count = {table}.count + EXCLUDED.count',
+                [field for row in batch for field in row],
+            )
+
+
+def record_change(before, after, using='default'):
+    """Update the sketches for a job going from ``before`` to ``after``.
+
+    Either side may be None for a created or deleted job.
+    """
+    deltas = Counter()
+    if before is not None:
+        deltas.subtract(job_buckets(before))
+    if after is not None:
+        deltas.update(job_buckets(after))
+    apply_deltas(deltas, using=using)
+
+
+def load_sketches(using=None):
+    """Return ``{(dimension, value, bound): QuantileSketch}``."""
+    sketches = defaultdict(lambda: QuantileSketch(RELATIVE_ACCURACY))
+    rows = SalarySketchBucket.objects.using(using).filter(
+        count__gt=0
+    ).values_list('dimension', 'value', 'bound', 'bucket', 'count')
+    for dimension, value, bound, bucket, count in rows:
+        sketches[(dimension, value, bound)].counts[bucket] = count
+    return sketches
+
+
+def _figures(sketches):
+    """Return the job count and percentiles of ``{bound: sketch}``."""
+    figures = {'count': sketches[BOUNDS[0]].count}
+    for bound in BOUNDS:
+        figures[bound] = {
+            name: _round(sketches[bound].quantile(q))
+            for name, q in PERCENTILES.items()
+        }
+    return figures
+
+
+def _round(value):
+    return None if value is None else round(value)
+
+
+def get_salary_stats(using=None):
+    """Return salary percentiles overall and per dimension value."""
+    sketches = load_sketches(using=using)
+    overall = {bound: QuantileSketch(RELATIVE_ACCURACY) for bound in BOUNDS}
+    stats = {dimension: {} for dimension in DIMENSIONS}
+    values = sorted({(dimension, value)
+                     for dimension, value, _ in sketches})
+    for dimension, value in values:
+        by_bound = {bound: sketches[(dimension, value, bound)]
+                    for bound in BOUNDS}
+        stats[dimension][value] = _figures(by_bound)
+        if dimension == DIMENSIONS[0]:
+            for bound in BOUNDS:
+                overall[bound].merge(by_bound[bound])
+    return {
+        'relative_accuracy': RELATIVE_ACCURACY,
+        'overall': _figures(overall),
+        **stats,
+    }
+
+
+def compute_buckets(using='default'):
+    """Count jobs per sketch bucket with ``GROUP BY`` queries over each
+    dimension and exact salary."""
+    counts = Counter()
+    for dimension in DIMENSIONS:
+        jobs = Job.objects.using(using).exclude(**{dimension: ''})
+        for bound in BOUNDS:
+            rows = jobs.values_list(dimension, bound).annotate(
+                n=Count('id')
+            ).order_by()
+            for value, salary, n in rows:
+                counts[(dimension, value, bound, _sketch.key(salary))] += n
+    return counts
+
+
+def rebuild(using='default'):
+    """Replace stored bucket counts with ones computed from the job
+    table. Returns the number of buckets written."""
+    with transaction.atomic(using=using):
+        counts = compute_buckets(using=using)
+        manager = SalarySketchBucket.objects.using(using)
+        manager.all().delete()
+        manager.bulk_create([
+            SalarySketchBucket(dimension=dimension, value=value, bound=bound,
+                               bucket=bucket, count=count)
+            for (dimension, value, bound, bucket), count in counts.items()
+        ], batch_size=1000)
+    return len(counts)
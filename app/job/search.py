@@ -0,0 +1,103 @@
+"""
+Full-text search over jobs.
+
+On PostgreSQL the search document is a stored, generated ``tsvector``
+column on the job table with a GIN index, so the database refreshes it on
+every write, ``Job.save()`` and ``bulk_create`` alike. On SQLite an FTS5
+table keyed by job id stands in for it and is refreshed from the job
+signals. Other backends fall back to ``icontains``.
+"""
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from core.models import Job
+
+
+SEARCH_CONFIG = 'english'
+SEARCH_FIELDS = ['title', 'description', 'main_tasks']
+FTS_TABLE = 'core_job_fts'
+
+
+def _vendor(using):
+    return connections[using].vendor
+
+
+def _fts_match_expression(query):
+    """Quote every term so user input cannot inject FTS5 syntax."""
+    terms = ['"%s"' % term.replace('"', '""') for term in query.split()]
+    return ' '.join(terms)
+
+
+def index_jobs(jobs, using='default'):
+    """Refresh the search index for ``jobs``."""
+    if _vendor(using) != 'sqlite':
+        return
+    rows = [(job.pk, job.title, job.description, job.main_tasks)
+            for job in jobs]
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, '
+            'main_tasks) VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+
+
+def unindex_jobs(job_ids, using='default'):
+    """Remove ``job_ids`` from the search index."""
+    if _vendor(using) != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(job_id,) for job_id in job_ids],
+        )
+
+
+def search_jobs(queryset, query):
+    """Filter ``queryset`` to jobs matching ``query``, best match first.
+
+    Matching jobs are annotated with ``rank``; higher is better.
+    """
+    table = Job._meta.db_table
+    vendor = _vendor(queryset.db)
+
+    if vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        queryset = queryset.filter(RawSQL(
+            f'"{table}"."search_vector" @@ {tsquery}', [query],
+            output_field=BooleanField(),
+        )).annotate(rank=RawSQL(
+            f'ts_rank("{table}"."search_vector", {tsquery})', [query],
+            output_field=FloatField(),
+        ))
+    elif vendor == 'sqlite':
+        match = _fts_match_expression(query)
+        if not match:
+            return queryset.none()
+        queryset = queryset.filter(RawSQL(
+            f'"{table}"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)', [match],
+            output_field=BooleanField(),
+        )).annotate(rank=RawSQL(
+            f'(SELECT -bm25({FTS_TABLE}, 10.0, 4.0, 2.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id")',
+            [match],
+            output_field=FloatField(),
+        ))
+    else:
+        condition = Q()
+        for term in query.split():
+            term_condition = Q()
+            for field in SEARCH_FIELDS:
+                term_condition |= Q(**{f'{field}__icontains': term})
+            condition &= term_condition
+        queryset = queryset.filter(condition).annotate(
+            rank=RawSQL('0', [], output_field=FloatField())
+        )
+
+    return queryset.order_by('-rank', '-id')
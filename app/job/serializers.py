@@ -0,0 +1,107 @@
+"""
+Serializers for the job API.
+"""
+from rest_framework import serializers
+
+from core.mixins import TimedSerializerMixin
+from core.models import Job
+
+
+class JobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Serializer for job listings."""
+
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'min_salary', 'max_salary', 'seniority',
+                  'employment_type']
+        read_only_fields = fields
+
+
+class JobDetailSerializer(JobSerializer):
+    """Serializer for job detail view."""
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ['company', 'description',
+                                              'main_tasks', 'area',
+                                              'skills']
+        read_only_fields = fields
+
+
+class JobMatchSerializer(JobSerializer):
+    """Serializer for a job matched to a talent."""
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ['score']
+        read_only_fields = fields
+
+
+class JobFacetsSerializer(serializers.Serializer):
+    """Schema for job facet counts."""
+    seniority = serializers.DictField(child=serializers.IntegerField())
+    employment_type = serializers.DictField(
+        child=serializers.IntegerField()
+    )
+    salary = serializers.DictField(child=serializers.IntegerField())
+
+
+class JobSearchResultSerializer(serializers.Serializer):
+    """Schema for job search results."""
+    results = JobSerializer(many=True)
+    facets = JobFacetsSerializer()
+
+
+class SalaryStatsSerializer(serializers.Serializer):
+    """Schema for the spread of one salary bound."""
+    min = serializers.IntegerField(allow_null=True)
+    median = serializers.IntegerField(allow_null=True)
+    max = serializers.IntegerField(allow_null=True)
+
+
+class CompanySalarySerializer(serializers.Serializer):
+    """Schema for a company's salary figures."""
+    min_salary = SalaryStatsSerializer()
+    max_salary = SalaryStatsSerializer()
+
+
+class RecentActivitySerializer(serializers.Serializer):
+    """Schema for a company's recent posting activity."""
+    days = serializers.IntegerField()
+    jobs = serializers.IntegerField()
+    daily = serializers.DictField(child=serializers.IntegerField())
+
+
+class CompanySummarySerializer(serializers.Serializer):
+    """Schema for the company hiring dashboard."""
+    company = serializers.IntegerField()
+    jobs = serializers.IntegerField()
+    seniority = serializers.DictField(child=serializers.IntegerField())
+    employment_type = serializers.DictField(
+        child=serializers.IntegerField()
+    )
+    salary = CompanySalarySerializer()
+    recent = RecentActivitySerializer()
+    last_activity_at = serializers.DateTimeField(allow_null=True)
+
+
+class PercentilesSerializer(serializers.Serializer):
+    """Schema for approximate salary percentiles."""
+    p10 = serializers.IntegerField(allow_null=True)
+    p50 = serializers.IntegerField(allow_null=True)
+    p90 = serializers.IntegerField(allow_null=True)
+
+
+class SalaryFiguresSerializer(serializers.Serializer):
+    """Schema for the salary percentiles of a group of jobs."""
+    count = serializers.IntegerField()
+    min_salary = PercentilesSerializer()
+    max_salary = PercentilesSerializer()
+
+
+class SalaryPercentilesSerializer(serializers.Serializer):
+    """Schema for salary statistics."""
+    relative_accuracy = serializers.FloatField()
+    overall = SalaryFiguresSerializer()
+    seniority = serializers.DictField(child=SalaryFiguresSerializer())
+    employment_type = serializers.DictField(child=SalaryFiguresSerializer())
+    area = serializers.DictField(child=SalaryFiguresSerializer())
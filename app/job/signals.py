@@ -0,0 +1,83 @@
+"""
+Signal handlers keeping job derived data in sync.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import CollectionVersion, Job
+from core.signals import jobs_bulk_created
+from job import facets, salary_stats, search, summaries
+
+
+def job_values(job):
+    """Return the concrete field values of ``job`` keyed by attname."""
+    return {field.attname: getattr(job, field.attname)
+            for field in Job._meta.concrete_fields}
+
+
+def bump_jobs_version(using):
+    """Bump the job collection version once the write is committed."""
+    transaction.on_commit(
+        lambda: CollectionVersion.bump(CollectionVersion.JOBS, using=using),
+        using=using,
+    )
+
+
+@receiver(pre_save, sender=Job)
+def job_saving(sender, instance, using, **kwargs):
+    """Remember the stored values of a job that is being updated."""
+    instance._previous_values = None
+    if instance.pk is None:
+        return
+    previous = Job.objects.using(using).filter(
+        pk=instance.pk
+    ).values(*job_values(instance)).first()
+    instance._previous_values = previous
+    if previous is not None and instance.created_at is None:
+        # An instance built without loading the row keeps its posting time.
+        instance.created_at = previous['created_at']
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, using, **kwargs):
+    """Refresh derived data for a saved job."""
+    current = job_values(instance)
+    search.index_jobs([instance], using=using)
+    previous = getattr(instance, '_previous_values', None)
+    facets.record_change(previous, current, using=using)
+    salary_stats.record_change(previous, current, using=using)
+    summaries.record_change(previous, current, using=using)
+    bump_jobs_version(using)
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, using, **kwargs):
+    """Drop derived data for a deleted job."""
+    search.unindex_jobs([instance.pk], using=using)
+    values = job_values(instance)
+    facets.record_change(values, None, using=using)
+    salary_stats.record_change(values, None, using=using)
+    summaries.record_change(values, None, using=using)
+    bump_jobs_version(using)
+
+
+@receiver(jobs_bulk_created, sender=Job)
+def jobs_created_in_bulk(sender, jobs, using, **kwargs):
+    """Refresh derived data for jobs written with ``bulk_create``."""
+    search.index_jobs(jobs, using=using)
+    deltas = Counter()
+    salary_deltas = Counter()
+    company_deltas = defaultdict(Counter)
+    for job in jobs:
+        values = job_values(job)
+        deltas.update(facets.job_facets(values))
+        salary_deltas.update(salary_stats.job_buckets(values))
+        for company_id, delta in summaries.job_deltas(None, values).items():
+            company_deltas[company_id].update(delta)
+    facets.apply_deltas(deltas, using=using)
+    salary_stats.apply_deltas(salary_deltas, using=using)
+    summaries.apply_deltas(company_deltas, using=using)
+    bump_jobs_version(using)
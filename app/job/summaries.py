@@ -0,0 +1,282 @@
+"""
+Per-company hiring summaries for the company dashboard.
+
+Each company's figures live in one ``CompanySummary`` row, adjusted by
+the job signal handlers on every create, update and delete, so serving a
+dashboard reads one row however many jobs the company has. Salaries are
+kept as ``QuantileSketch`` bucket counts plus their exact range, so the
+row stays small however many distinct salaries a company offers. Writes
+that bypass the signals are corrected by the ``rebuild_company_summaries``
+command.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import CompanySummary, Job
+from core.sketches import QuantileSketch
+
+
+# Distribution fields of ``CompanySummary`` and the job value they count.
+DISTRIBUTIONS = {
+    'seniority': 'seniority',
+    'employment_type': 'employment_type',
+}
+# Salary sketch fields of ``CompanySummary`` and the salary they count.
+SALARY_SKETCHES = {
+    'min_salaries': 'min_salary',
+    'max_salaries': 'max_salary',
+}
+# Medians are within 1% of the exact salary.
+SALARY_ACCURACY = 0.01
+RANGE_FIELD = 'salary_range'
+ACTIVITY_FIELD = 'daily_jobs'
+# Number of days of posting activity kept per company.
+ACTIVITY_DAYS = 30
+
+
+def _activity_start(now=None):
+    """Return the first day inside the activity window."""
+    return ((now or timezone.now()) -
+            timedelta(days=ACTIVITY_DAYS - 1)).date()
+
+
+_sketch = QuantileSketch(SALARY_ACCURACY)
+
+
+def summary_items(values):
+    """Return the ``(field, key)`` pairs a job counts towards.
+
+    ``values`` maps job attnames to the job's values. Salaries count
+    towards their sketch bucket and, as ``(attname, amount)`` keys of
+    ``RANGE_FIELD``, towards the salary range.
+    """
+    items = [(field, str(values[attname]))
+             for field, attname in DISTRIBUTIONS.items()]
+    for field, attname in SALARY_SKETCHES.items():
+        items.append((field, str(_sketch.key(values[attname]))))
+        items.append((RANGE_FIELD, (attname, values[attname])))
+    created = values.get('created_at')
+    if created is not None:
+        day = timezone.localdate(created)
+        if day >= _activity_start():
+            items.append((ACTIVITY_FIELD, day.isoformat()))
+    return items
+
+
+def job_deltas(before, after):
+    """Return ``{company_id: Counter}`` for a job going from ``before``
+    to ``after``; either may be None. The ``None`` key counts jobs."""
+    deltas = defaultdict(Counter)
+    if before is not None:
+        delta = deltas[before['company_id']]
+        delta.subtract(summary_items(before))
+        delta[None] -= 1
+    if after is not None:
+        delta = deltas[after['company_id']]
+        delta.update(summary_items(after))
+        delta[None] += 1
+    return deltas
+
+
+def _prune(daily, start):
+    for day in [day for day in daily if day < start.isoformat()]:
+        del daily[day]
+
+
+def _widen(bounds, amount):
+    if bounds is None:
+        return [amount, amount]
+    return [min(bounds[0], amount), max(bounds[1], amount)]
+
+
+def _update_ranges(summary, changes, using):
+    """Apply ``{(attname, amount): change}`` to the salary ranges.
+
+    Removing a salary at either end of a range re-reads that range from
+    the company's jobs, which already reflect the write.
+    """
+    ranges = summary.salary_range
+    for (attname, amount), change in changes.items():
+        bounds = ranges.get(attname)
+        if change < 0 and bounds is not None and not (
+                bounds[0] < amount < bounds[1]):
+            ranges.update(_job_ranges(summary.company_id, using))
+            break
+    for (attname, amount), change in changes.items():
+        if change > 0:
+            ranges[attname] = _widen(ranges.get(attname), amount)
+
+
+def _job_ranges(company_id, using):
+    """Return the exact salary ranges of a company's jobs."""
+    aggregates = {}
+    for attname in SALARY_SKETCHES.values():
+        aggregates[f'{attname}__min'] = Min(attname)
+        aggregates[f'{attname}__max'] = Max(attname)
+    row = Job.objects.using(using).filter(
+        company_id=company_id
+    ).aggregate(**aggregates)
+    return {attname: (None if row[f'{attname}__min'] is None else
+                      [row[f'{attname}__min'], row[f'{attname}__max']])
+            for attname in SALARY_SKETCHES.values()}
+
+
+def apply_deltas(deltas, using='default'):
+    """Apply ``{company_id: Counter}`` deltas to the stored summaries.
+
+    Rows are locked in company order, so concurrent writers to the same
+    companies cannot deadlock. A missing row is only created when jobs
+    are added; a company being deleted loses its summary first.
+    """
+    now = timezone.now()
+    start = _activity_start(now)
+    manager = CompanySummary.objects.using(using)
+    with transaction.atomic(using=using):
+        for company_id, delta in sorted(deltas.items()):
+            locked = manager.select_for_update().filter(company_id=company_id)
+            summary = locked.first()
+            if summary is None:
+                if delta[None] <= 0:
+                    continue
+                manager.get_or_create(company_id=company_id)
+                summary = locked.get()
+            ranges = {}
+            for key, change in delta.items():
+                if key is None:
+                    summary.job_count += change
+                    continue
+                field, value = key
+                if field == RANGE_FIELD:
+                    if change:
+                        ranges[value] = change
+                    continue
+                counts = getattr(summary, field)
+                counts[value] = counts.get(value, 0) + change
+                if counts[value] <= 0:
+                    del counts[value]
+            _update_ranges(summary, ranges, using)
+            _prune(summary.daily_jobs, start)
+            summary.last_activity_at = now
+            summary.save()
+
+
+def record_change(before, after, using='default'):
+    """Update the summaries for a job going from ``before`` to
+    ``after``."""
+    apply_deltas(job_deltas(before, after), using=using)
+
+
+def _stats(counts, bounds):
+    """Return min, median and max from sketch bucket ``counts`` and the
+    exact ``[min, max]`` range."""
+    sketch = QuantileSketch(SALARY_ACCURACY, {
+        int(key): count for key, count in counts.items()
+    })
+    median = sketch.quantile(0.5)
+    if median is None or not bounds:
+        return {'min': None, 'median': None, 'max': None}
+    # The bucket estimate may fall just outside the exact range.
+    median = min(max(round(median), bounds[0]), bounds[1])
+    return {'min': bounds[0], 'median': median, 'max': bounds[1]}
+
+
+def get_summary(company_id, using=None):
+    """Return the dashboard figures of ``company_id``."""
+    summary = CompanySummary.objects.using(using).filter(
+        company_id=company_id
+    ).first() or CompanySummary(company_id=company_id)
+    start = _activity_start().isoformat()
+    daily = {day: count for day, count in sorted(summary.daily_jobs.items())
+             if day >= start}
+    return {
+        'company': company_id,
+        'jobs': summary.job_count,
+        'seniority': summary.seniority,
+        'employment_type': summary.employment_type,
+        'salary': {
+            attname: _stats(getattr(summary, field),
+                            summary.salary_range.get(attname))
+            for field, attname in SALARY_SKETCHES.items()
+        },
+        'recent': {
+            'days': ACTIVITY_DAYS,
+            'jobs': sum(daily.values()),
+            'daily': daily,
+        },
+        'last_activity_at': summary.last_activity_at,
+    }
+
+
+def compute_summaries(company_ids=None, using='default'):
+    """Build unsaved summaries from the job table with ``GROUP BY``
+    queries."""
+    jobs = Job.objects.using(using)
+    if company_ids is not None:
+        jobs = jobs.filter(company_id__in=company_ids)
+    summaries = {}
+
+    def summary(company_id):
+        if company_id not in summaries:
+            summaries[company_id] = CompanySummary(company_id=company_id)
+        return summaries[company_id]
+
+    ranges = {}
+    for attname in SALARY_SKETCHES.values():
+        ranges[f'{attname}_low'] = Min(attname)
+        ranges[f'{attname}_high'] = Max(attname)
+    rows = jobs.values('company_id').annotate(
+        n=Count('id'), last=Max('updated_at'), **ranges
+    ).order_by()
+    for row in rows:
+        item = summary(row['company_id'])
+        item.job_count = row['n']
+        item.last_activity_at = row['last']
+        item.salary_range = {
+            attname: [row[f'{attname}_low'], row[f'{attname}_high']]
+            for attname in SALARY_SKETCHES.values()
+        }
+    for field, attname in DISTRIBUTIONS.items():
+        rows = jobs.values('company_id', attname).annotate(
+            n=Count('id')
+        ).order_by()
+        for row in rows:
+            getattr(summary(row['company_id']), field)[
+                str(row[attname])] = row['n']
+    for field, attname in SALARY_SKETCHES.items():
+        rows = jobs.values_list('company_id', attname).annotate(
+            n=Count('id')
+        ).order_by()
+        for company_id, amount, n in rows:
+            counts = getattr(summary(company_id), field)
+            key = str(_sketch.key(amount))
+            counts[key] = counts.get(key, 0) + n
+    rows = jobs.filter(
+        created_at__date__gte=_activity_start()
+    ).annotate(day=TruncDate('created_at')).values(
+        'company_id', 'day'
+    ).annotate(n=Count('id')).order_by()
+    for row in rows:
+        summary(row['company_id']).daily_jobs[row['day'].isoformat()] = \
+            row['n']
+    return summaries
+
+
+def rebuild(company_ids=None, using='default'):
+    """Replace stored summaries with ones computed from the job table.
+
+    Rebuilds every company, or only ``company_ids``. Returns the number
+    of summaries written.
+    """
+    with transaction.atomic(using=using):
+        summaries = compute_summaries(company_ids, using=using)
+        stale = CompanySummary.objects.using(using)
+        if company_ids is not None:
+            stale = stale.filter(company_id__in=company_ids)
+        stale.delete()
+        CompanySummary.objects.using(using).bulk_create(summaries.values())
+    return len(summaries)
@@ -0,0 +1,144 @@
+"""
+Tests for job facet counts.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.enums import Role, Seniority, Employment
+from core.models import Job, JobFacetCount
+from job import facets
+
+
+FACETS_URL = reverse('job:job-facets')
+SEARCH_URL = reverse('job:job-search')
+
+
+def create_job(company, **params):
+    """Create and return a sample job."""
+    defaults = {
+        'title': 'Sample job',
+        'description': 'Sample description',
+        'main_tasks': 'Sample tasks',
+        'min_salary': 50000,
+        'max_salary': 80000,
+        'seniority': Seniority.JUNIOR,
+        'employment_type': Employment.FULL_TIME,
+    }
+    defaults.update(params)
+    return Job.objects.create(company=company, **defaults)
+
+
+class JobFacetTests(TestCase):
+    """Test maintaining and serving facet counts."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = get_user_model().objects.create_user(
+            email='company@example.com',
+            password='testpass123',
+            role=Role.COMPANY,
+        )
+
+    def assertFacetsMatchTable(self):
+        self.assertEqual(
+            {key: count for key, count in facets.compute_facets().items()},
+            {(row.facet, row.value): row.count
+             for row in JobFacetCount.objects.filter(count__gt=0)},
+        )
+
+    def test_salary_buckets(self):
+        """Test salaries map to the expected buckets."""
+        self.assertEqual(facets.salary_bucket(0), '0-24999')
+        self.assertEqual(facets.salary_bucket(74999), '50000-74999')
+        self.assertEqual(facets.salary_bucket(75000), '75000-99999')
+        self.assertEqual(facets.salary_bucket(500000), '200000+')
+
+    def test_counts_follow_create_update_delete(self):
+        """Test counts are adjusted on every kind of job write."""
+        job = create_job(self.company)
+        create_job(self.company, seniority=Seniority.SENIOR,
+                   min_salary=120000, max_salary=150000)
+
+        loaded = Job.objects.get(pk=job.pk)
+        loaded.seniority = Seniority.SENIOR
+        loaded.save()
+        job.refresh_from_db()
+        job.employment_type = Employment.CONTRACT
+        job.save()
+        Job.objects.get(min_salary=120000).delete()
+
+        res = self.client.get(FACETS_URL)
+
+        self.assertEqual(res.data, {
+            'seniority': {Seniority.SENIOR: 1},
+            'employment_type': {Employment.CONTRACT: 1},
+            'salary': {'50000-74999': 1},
+        })
+        self.assertFacetsMatchTable()
+
+    def test_update_of_unloaded_instance(self):
+        """Test saving an instance that was not loaded from the DB."""
+        job = create_job(self.company)
+        copy = Job(pk=job.pk, company=self.company, title='Copy',
+                   description='d', main_tasks='t', min_salary=10000,
+                   max_salary=20000, seniority=Seniority.INTERN,
+                   employment_type=Employment.INTERNSHIP)
+        copy._state.adding = False
+
+        copy.save()
+
+        self.assertFacetsMatchTable()
+
+    def test_search_reads_facets_in_one_query(self):
+        """Test search results include facets from the count table."""
+        create_job(self.company, title='Python developer')
+        create_job(self.company, title='Java developer',
+                   seniority=Seniority.SENIOR)
+
+        # Collection version, matching jobs, facet counts.
+        with self.assertNumQueries(3):
+            res = self.client.get(SEARCH_URL, {'q': 'python'})
+
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['facets']['seniority'], {
+            Seniority.JUNIOR: 1, Seniority.SENIOR: 1,
+        })
+
+    def test_bulk_import_updates_facets(self):
+        """Test jobs imported in bulk are counted."""
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(fd, 'w') as feed:
+            feed.write(json.dumps({
+                'company': self.company.id, 'title': 'Imported',
+                'description': 'd', 'main_tasks': 't',
+                'min_salary': 30000, 'max_salary': 40000,
+                'seniority': Seniority.MID_LEVEL.value,
+                'employment_type': Employment.REMOTE.value,
+            }))
+        self.addCleanup(os.remove, path)
+
+        call_command('import_jobs', path, stdout=StringIO())
+
+        self.assertEqual(facets.get_facets()['employment_type'],
+                         {Employment.REMOTE: 1})
+        self.assertFacetsMatchTable()
+
+    def test_reconcile_fixes_drift(self):
+        """Test the reconcile command repairs counts after raw updates."""
+        create_job(self.company)
+        Job.objects.update(seniority=Seniority.LEAD)
+        out = StringIO()
+
+        call_command('reconcile_job_facets', stdout=out)
+
+        self.assertIn('2 corrected', out.getvalue())
+        self.assertFacetsMatchTable()
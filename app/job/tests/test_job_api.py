@@ -0,0 +1,372 @@
+"""
+Tests for the job API.
+"""
+from unittest import mock
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.enums import (
+    Role, Seniority, Employment, TechSkill, LangSkill, LangProf,
+)
+from core.models import Job
+from core.skills import language_code
+from job.serializers import JobSerializer
+
+
+JOBS_URL = reverse('job:job-list')
+JOBS_ASYNC_URL = reverse('job:job-list-async')
+
+
+def detail_url(job_id):
+    """Create and return a job detail URL."""
+    return reverse('job:job-detail', args=[job_id])
+
+
+def async_detail_url(job_id):
+    """Create and return an async job detail URL."""
+    return reverse('job:job-detail-async', args=[job_id])
+
+
+def create_company(email='company@example.com'):
+    """Create and return a company user."""
+    return get_user_model().objects.create_user(
+        email=email,
+        password='testpass123',
+        role=Role.COMPANY,
+    )
+
+
+def create_job(company, **params):
+    """Create and return a sample job."""
+    defaults = {
+        'title': 'Sample job',
+        'description': 'Sample description',
+        'main_tasks': 'Sample tasks',
+        'min_salary': 50000,
+        'max_salary': 80000,
+        'seniority': Seniority.JUNIOR,
+        'employment_type': Employment.FULL_TIME,
+    }
+    defaults.update(params)
+    return Job.objects.create(company=company, **defaults)
+
+
+class PublicJobApiTests(TestCase):
+    """Test the public job API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = create_company()
+
+    def test_list_jobs_newest_first(self):
+        """Test listing jobs returns newest jobs first."""
+        first = create_job(self.company, title='First')
+        second = create_job(self.company, title='Second')
+
+        res = self.client.get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [job['id'] for job in res.data['results']]
+        self.assertEqual(ids, [second.id, first.id])
+
+    def test_filter_by_seniority_and_employment_type(self):
+        """Test filtering jobs by seniority and employment type."""
+        match = create_job(self.company, seniority=Seniority.SENIOR,
+                           employment_type=Employment.CONTRACT)
+        create_job(self.company, seniority=Seniority.SENIOR)
+        create_job(self.company, employment_type=Employment.CONTRACT)
+
+        res = self.client.get(JOBS_URL, {
+            'seniority': Seniority.SENIOR,
+            'employment_type': Employment.CONTRACT,
+        })
+
+        ids = [job['id'] for job in res.data['results']]
+        self.assertEqual(ids, [match.id])
+
+    def test_filter_by_salary_bounds(self):
+        """Test filtering jobs by salary bounds."""
+        match = create_job(self.company, min_salary=60000, max_salary=90000)
+        create_job(self.company, min_salary=40000, max_salary=90000)
+        create_job(self.company, min_salary=60000, max_salary=120000)
+
+        res = self.client.get(JOBS_URL, {
+            'min_salary': 60000,
+            'max_salary': 100000,
+        })
+
+        ids = [job['id'] for job in res.data['results']]
+        self.assertEqual(ids, [match.id])
+
+    def test_filter_by_salary_overlap_and_containment(self):
+        """Test filtering jobs by salary range overlap and containment."""
+        wide = create_job(self.company, min_salary=50000, max_salary=90000)
+        low = create_job(self.company, min_salary=40000, max_salary=65000)
+        create_job(self.company, min_salary=85000, max_salary=95000)
+
+        overlap = self.client.get(JOBS_URL, {'salary_overlaps': '60000,80000'})
+        contain = self.client.get(JOBS_URL, {'salary_contains': '60000,80000'})
+        single = self.client.get(JOBS_URL, {'salary_contains': '62000'})
+
+        self.assertEqual([job['id'] for job in overlap.data['results']],
+                         [low.id, wide.id])
+        self.assertEqual([job['id'] for job in contain.data['results']],
+                         [wide.id])
+        self.assertEqual([job['id'] for job in single.data['results']],
+                         [low.id, wide.id])
+
+    def test_filter_by_skills(self):
+        """Test filtering jobs by all, any and language skills."""
+        english = language_code(LangSkill.ENGLISH, LangProf.ADVANCED)
+        django = create_job(self.company, skills=[
+            TechSkill.PYTHON, TechSkill.DJANGO, english,
+        ])
+        flask = create_job(self.company, skills=[
+            TechSkill.PYTHON, TechSkill.FLASK,
+            language_code(LangSkill.ENGLISH, LangProf.BEGINNER),
+        ])
+        create_job(self.company, skills=[TechSkill.JAVA])
+
+        every = self.client.get(JOBS_URL, {
+            'skills': f'{TechSkill.PYTHON},{TechSkill.DJANGO}',
+        })
+        any_of = self.client.get(JOBS_URL, {
+            'any_skills': f'{TechSkill.DJANGO},{TechSkill.FLASK}',
+        })
+        fluent = self.client.get(JOBS_URL, {'languages': 'EN:INT'})
+
+        self.assertEqual([job['id'] for job in every.data['results']],
+                         [django.id])
+        self.assertEqual([job['id'] for job in any_of.data['results']],
+                         [flask.id, django.id])
+        self.assertEqual([job['id'] for job in fluent.data['results']],
+                         [django.id])
+
+    def test_invalid_filters_return_error(self):
+        """Test invalid filter values return a bad request."""
+        for params in [
+            {'seniority': 'NOPE'},
+            {'min_salary': 'abc'},
+            {'salary_overlaps': '80000,60000'},
+            {'salary_contains': '1,2,3'},
+            {'skills': 'TECH_NOPE'},
+            {'any_skills': ','},
+            {'languages': TechSkill.PYTHON},
+        ]:
+            res = self.client.get(JOBS_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_pagination_walks_all_pages(self):
+        """Test following next links returns every job exactly once."""
+        jobs = [create_job(self.company, title=f'Job {i}') for i in range(5)]
+
+        seen = []
+        url = JOBS_URL + '?page_size=2'
+        while url:
+            res = self.client.get(url)
+            seen.extend(job['id'] for job in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(seen, [job.id for job in reversed(jobs)])
+
+    def test_deep_pages_use_keyset_not_offset(self):
+        """Test the page query seeks on the primary key without OFFSET."""
+        for i in range(3):
+            create_job(self.company, title=f'Job {i}')
+        res = self.client.get(JOBS_URL, {'page_size': 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(res.data['next'])
+
+        sql = ' '.join(query['sql'] for query in ctx.captured_queries)
+        self.assertIn('"core_job"."id" <', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_retrieve_job_detail(self):
+        """Test retrieving a job returns the detail fields."""
+        job = create_job(self.company)
+
+        res = self.client.get(detail_url(job.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['description'], job.description)
+        self.assertEqual(res.data['main_tasks'], job.main_tasks)
+        self.assertEqual(res.data['company'], self.company.id)
+        self.assertEqual(res.data['skills'], [])
+
+
+class ConditionalJobApiTests(TestCase):
+    """Test conditional requests against the job API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = create_company()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = create_job(self.company)
+
+    def test_list_not_modified(self):
+        """Test an unchanged job list answers 304 with one query."""
+        res = self.client.get(JOBS_URL)
+        etag = res['ETag']
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(JOBS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_changes_with_jobs_and_query(self):
+        """Test writes and different filters change the list ETag."""
+        etag = self.client.get(JOBS_URL)['ETag']
+        filtered = self.client.get(JOBS_URL, {'seniority': Seniority.JUNIOR})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_job(self.company, title='New job')
+        res = self.client.get(JOBS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertNotEqual(filtered['ETag'], etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_detail_not_modified(self):
+        """Test an unchanged job answers 304 without loading the row."""
+        url = detail_url(self.job.id)
+        res = self.client.get(url)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(url,
+                                     HTTP_IF_NONE_MATCH=res['ETag'])
+        since = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=res['Last-Modified']
+        )
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(since.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_modified(self):
+        """Test an updated job is sent again."""
+        url = detail_url(self.job.id)
+        etag = self.client.get(url)['ETag']
+        self.job.title = 'Changed'
+        self.job.save()
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], 'Changed')
+
+    def test_missing_job_not_found(self):
+        """Test a missing job still returns 404."""
+        res = self.client.get(detail_url(self.job.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FastReadPathTests(TestCase):
+    """Test the values() list path matches the serializers."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = create_company()
+
+    def test_list_rows_match_serializer(self):
+        """Test listed jobs render exactly like JobSerializer."""
+        jobs = [create_job(self.company, title=f'Job {i}') for i in range(3)]
+
+        res = self.client.get(JOBS_URL)
+
+        expected = JobSerializer(reversed(jobs), many=True).data
+        self.assertEqual(res.json()['results'], expected)
+
+    def test_list_skips_model_instances(self):
+        """Test the list path never builds Job instances."""
+        create_job(self.company)
+
+        with mock.patch.object(Job, 'from_db') as from_db:
+            res = self.client.get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        from_db.assert_not_called()
+
+    def test_browsable_api_still_renders(self):
+        """Test HTML clients still get the browsable API."""
+        create_job(self.company)
+
+        res = self.client.get(JOBS_URL, HTTP_ACCEPT='text/html')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('text/html', res['Content-Type'])
+
+
+class AsyncJobApiTests(TestCase):
+    """Test the async job read views."""
+
+    def setUp(self):
+        self.company = create_company()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jobs = [create_job(self.company, title=f'Job {i}')
+                         for i in range(3)]
+
+    async def test_list_matches_sync_view(self):
+        """Test the async list returns the sync list's rows."""
+        sync = await self.async_client.get(JOBS_URL)
+        res = await self.async_client.get(JOBS_ASYNC_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['results'], sync.json()['results'])
+
+    async def test_list_keyset_pages(self):
+        """Test following next walks all jobs once."""
+        res = await self.async_client.get(JOBS_ASYNC_URL, {'page_size': 2})
+        page = res.json()
+        following = await self.async_client.get(page['next'])
+
+        ids = [job['id'] for job in page['results']]
+        ids += [job['id'] for job in following.json()['results']]
+        self.assertEqual(ids, [job.id for job in reversed(self.jobs)])
+        self.assertIsNone(following.json()['next'])
+
+    async def test_list_filters_and_validation(self):
+        """Test the list shares the sync filters and their errors."""
+        res = await self.async_client.get(
+            JOBS_ASYNC_URL, {'seniority': Seniority.SENIOR}
+        )
+        bad = await self.async_client.get(
+            JOBS_ASYNC_URL, {'min_salary': 'abc'}
+        )
+
+        self.assertEqual(res.json()['results'], [])
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('min_salary', bad.json())
+
+    async def test_list_not_modified(self):
+        """Test an unchanged list answers 304."""
+        res = await self.async_client.get(JOBS_ASYNC_URL)
+
+        cached = await self.async_client.get(
+            JOBS_ASYNC_URL, headers={'If-None-Match': res['ETag']}
+        )
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_detail(self):
+        """Test the async detail matches the sync view and supports 304."""
+        job = self.jobs[0]
+        sync = await self.async_client.get(detail_url(job.id))
+        res = await self.async_client.get(async_detail_url(job.id))
+        cached = await self.async_client.get(
+            async_detail_url(job.id), headers={'If-None-Match': res['ETag']}
+        )
+        missing = await self.async_client.get(async_detail_url(0))
+
+        self.assertEqual(res.json(), sync.json())
+        self.assertEqual(res['ETag'], sync['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
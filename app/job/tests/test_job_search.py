@@ -0,0 +1,110 @@
+"""
+Tests for the job search API.
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.enums import Role, Seniority, Employment
+from core.models import Job
+
+
+SEARCH_URL = reverse('job:job-search')
+
+
+def create_job(company, **params):
+    """Create and return a sample job."""
+    defaults = {
+        'title': 'Sample job',
+        'description': 'Sample description',
+        'main_tasks': 'Sample tasks',
+        'min_salary': 50000,
+        'max_salary': 80000,
+        'seniority': Seniority.JUNIOR,
+        'employment_type': Employment.FULL_TIME,
+    }
+    defaults.update(params)
+    return Job.objects.create(company=company, **defaults)
+
+
+class JobSearchApiTests(TestCase):
+    """Test the job search API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = get_user_model().objects.create_user(
+            email='company@example.com',
+            password='testpass123',
+            role=Role.COMPANY,
+        )
+
+    def _search(self, **params):
+        res = self.client.get(SEARCH_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in res.data['results']]
+
+    def test_search_matches_all_text_fields(self):
+        """Test search finds terms in title, description and tasks."""
+        by_title = create_job(self.company, title='Python developer')
+        by_description = create_job(self.company,
+                                    description='We love python here')
+        by_tasks = create_job(self.company, main_tasks='Write Python code')
+        create_job(self.company, title='Java developer')
+
+        ids = self._search(q='python')
+
+        self.assertCountEqual(ids, [by_title.id, by_description.id,
+                                    by_tasks.id])
+
+    def test_search_ranks_title_matches_first(self):
+        """Test title matches rank above matches in other fields."""
+        by_tasks = create_job(self.company, main_tasks='Review django code')
+        by_title = create_job(self.company, title='Django engineer')
+
+        ids = self._search(q='django')
+
+        self.assertEqual(ids, [by_title.id, by_tasks.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test the search index is refreshed on save and delete."""
+        job = create_job(self.company, title='Golang developer')
+        other = create_job(self.company, title='Golang tester')
+
+        job.title = 'Rust developer'
+        job.save()
+        other.delete()
+
+        self.assertEqual(self._search(q='golang'), [])
+        self.assertEqual(self._search(q='rust'), [job.id])
+
+    def test_search_combines_with_filters(self):
+        """Test search results honour the listing filters."""
+        match = create_job(self.company, title='Senior Go developer',
+                           seniority=Seniority.SENIOR)
+        create_job(self.company, title='Junior Go developer')
+
+        ids = self._search(q='developer', seniority=Seniority.SENIOR)
+
+        self.assertEqual(ids, [match.id])
+
+    def test_search_treats_query_syntax_as_text(self):
+        """Test search operators in user input do not cause errors."""
+        create_job(self.company, title='C++ developer')
+
+        self._search(q='"c++ OR (NEAR')
+
+    def test_search_requires_query(self):
+        """Test a missing search query returns a bad request."""
+        res = self.client.get(SEARCH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_limit(self):
+        """Test the number of results is capped by limit."""
+        for i in range(3):
+            create_job(self.company, title=f'Python developer {i}')
+
+        self.assertEqual(len(self._search(q='python', limit=2)), 2)
@@ -0,0 +1,117 @@
+"""
+Tests for matching talents to jobs.
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.enums import Role, Seniority, Employment, TechSkill
+from core.models import Job, TalentProfile
+from job import matches
+
+
+MATCHES_URL = reverse('job:job-matches')
+
+
+def create_user(email, role):
+    """Create and return a user with ``role``."""
+    return get_user_model().objects.create_user(
+        email=email, password='testpass123', role=role
+    )
+
+
+def create_job(company, skills, seniority=Seniority.SENIOR, **params):
+    """Create and return a job requiring ``skills``."""
+    defaults = {
+        'title': 'Sample job',
+        'description': 'Sample description',
+        'main_tasks': 'Sample tasks',
+        'min_salary': 50000,
+        'max_salary': 80000,
+        'employment_type': Employment.FULL_TIME,
+    }
+    defaults.update(params)
+    return Job.objects.create(company=company, skills=skills,
+                              seniority=seniority, **defaults)
+
+
+class JobMatchesApiTests(TestCase):
+    """Test the job matches endpoint."""
+
+    def setUp(self):
+        matches.clear_job_index()
+        self.addCleanup(matches.clear_job_index)
+        self.company = create_user('company@example.com', Role.COMPANY)
+        self.talent = create_user('talent@example.com', Role.TALENT)
+        TalentProfile.objects.create(
+            account=self.talent, profile_description='Backend developer',
+            skills=[TechSkill.PYTHON, TechSkill.DJANGO],
+        )
+        self.full = create_job(self.company,
+                               [TechSkill.PYTHON, TechSkill.DJANGO])
+        self.half = create_job(self.company,
+                               [TechSkill.PYTHON, TechSkill.DOCKER],
+                               seniority=Seniority.INTERN)
+        create_job(self.company, [TechSkill.JAVA])
+        self.client = APIClient()
+        self.client.force_authenticate(self.talent)
+
+    def test_jobs_ranked_by_score(self):
+        """Test matching jobs are listed best first with their score."""
+        res = self.client.get(MATCHES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in res.data],
+                         [self.full.id, self.half.id])
+        self.assertEqual(res.data[0]['score'], 1.0)
+        self.assertAlmostEqual(res.data[1]['score'], 0.5)
+        self.assertEqual(res.data[0]['title'], 'Sample job')
+
+    def test_seniority_and_limit(self):
+        """Test jobs can be restricted by seniority and count."""
+        res = self.client.get(MATCHES_URL, {'seniority': Seniority.MID_LEVEL})
+
+        self.assertEqual([row['id'] for row in res.data], [self.full.id])
+
+        res = self.client.get(MATCHES_URL, {'limit': 1})
+
+        self.assertEqual([row['id'] for row in res.data], [self.full.id])
+
+    def test_index_rebuilt_when_jobs_change(self):
+        """Test the index is reused until the job collection changes."""
+        with patch.object(matches, 'job_index',
+                          wraps=matches.job_index) as build:
+            self.client.get(MATCHES_URL)
+            self.client.get(MATCHES_URL)
+            self.assertEqual(build.call_count, 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                job = create_job(self.company, [TechSkill.DJANGO])
+            res = self.client.get(MATCHES_URL)
+
+        self.assertEqual(build.call_count, 2)
+        self.assertIn(job.id, [row['id'] for row in res.data])
+
+    def test_talent_without_profile(self):
+        """Test a talent without a profile gets a 404."""
+        TalentProfile.objects.all().delete()
+
+        res = self.client.get(MATCHES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_companies_forbidden(self):
+        """Test only talents can ask for matches."""
+        token = Token.objects.create(user=self.company)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        res = client.get(MATCHES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,140 @@
+"""
+Tests for the salary percentile statistics.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.enums import Area, Role, Seniority, Employment
+from core.models import Job, SalarySketchBucket
+from core.signals import jobs_bulk_created
+from job import salary_stats
+
+
+SALARY_STATS_URL = reverse('job:salary-stats')
+
+
+def job_params(**params):
+    """Return the fields of a sample job."""
+    defaults = {
+        'title': 'Sample job',
+        'description': 'Sample description',
+        'main_tasks': 'Sample tasks',
+        'min_salary': 50000,
+        'max_salary': 80000,
+        'seniority': Seniority.JUNIOR,
+        'employment_type': Employment.FULL_TIME,
+        'area': Area.BACKEND_DEVELOPMENT,
+    }
+    defaults.update(params)
+    return defaults
+
+
+def stored_buckets():
+    """Return the non-empty stored bucket counts."""
+    return {
+        (row.dimension, row.value, row.bound, row.bucket): row.count
+        for row in SalarySketchBucket.objects.filter(count__gt=0)
+    }
+
+
+class SalaryStatsTests(TestCase):
+    """Test maintaining and serving salary percentiles."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.company = get_user_model().objects.create_user(
+            email='company@example.com',
+            password='testpass123',
+            role=Role.COMPANY,
+        )
+
+    def create_job(self, **params):
+        return Job.objects.create(company=self.company, **job_params(**params))
+
+    def assertSketchesMatchTable(self):
+        self.assertEqual(stored_buckets(),
+                         dict(salary_stats.compute_buckets()))
+
+    def test_sketches_follow_writes(self):
+        """Test bucket counts follow creates, updates and deletes."""
+        job = self.create_job()
+        self.create_job(area='', min_salary=90000, max_salary=95000)
+        self.assertSketchesMatchTable()
+
+        job.min_salary = 60000
+        job.area = Area.DEVOPS
+        job.save()
+        self.assertSketchesMatchTable()
+
+        job.delete()
+        self.assertSketchesMatchTable()
+
+    def test_bulk_created_jobs(self):
+        """Test jobs announced with jobs_bulk_created are counted."""
+        jobs = Job.objects.bulk_create([
+            Job(company=self.company,
+                **job_params(min_salary=salary, max_salary=salary + 10000))
+            for salary in range(30000, 130000, 1000)
+        ])
+        jobs_bulk_created.send(sender=Job, jobs=jobs, using='default')
+
+        self.assertSketchesMatchTable()
+
+    def test_percentiles(self):
+        """Test percentiles are within the sketch accuracy."""
+        for salary in range(10000, 110000, 1000):
+            self.create_job(min_salary=salary, max_salary=salary + 20000,
+                            seniority=Seniority.SENIOR
+                            if salary >= 60000 else Seniority.JUNIOR)
+
+        res = self.client.get(SALARY_STATS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        overall = res.data['overall']
+        self.assertEqual(overall['count'], 100)
+        for name, exact in (('p10', 19000), ('p50', 59000), ('p90', 99000)):
+            self.assertAlmostEqual(overall['min_salary'][name] / exact, 1,
+                                   delta=0.01)
+        senior = res.data['seniority'][Seniority.SENIOR]
+        self.assertEqual(senior['count'], 50)
+        self.assertAlmostEqual(senior['max_salary']['p50'] / 104000, 1,
+                               delta=0.01)
+        self.assertEqual(
+            res.data['area'][Area.BACKEND_DEVELOPMENT]['count'], 100
+        )
+
+    def test_served_from_buckets(self):
+        """Test the endpoint reads the buckets in one query."""
+        for salary in (40000, 50000, 60000):
+            self.create_job(min_salary=salary)
+
+        # Collection version, sketch buckets.
+        with self.assertNumQueries(2):
+            res = self.client.get(SALARY_STATS_URL)
+
+        self.assertEqual(res.data['employment_type'][Employment.FULL_TIME][
+            'count'], 3)
+
+    def test_empty(self):
+        """Test statistics without jobs have no percentiles."""
+        res = self.client.get(SALARY_STATS_URL)
+
+        self.assertEqual(res.data['overall']['count'], 0)
+        self.assertIsNone(res.data['overall']['min_salary']['p50'])
+
+    def test_rebuild_command(self):
+        """Test the command corrects writes that bypassed the signals."""
+        self.create_job()
+        Job.objects.update(min_salary=20000)
+        out = StringIO()
+
+        call_command('rebuild_salary_stats', stdout=out)
+
+        self.assertSketchesMatchTable()
+        self.assertIn('Rebuilt salary sketches', out.getvalue())
@@ -0,0 +1,265 @@
+"""
+Tests for the company hiring summaries.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.enums import Role, Seniority, Employment
+from core.models import CompanySummary, Job
+from core.signals import jobs_bulk_created
+from job import summaries
+
+
+DASHBOARD_URL = reverse('job:company-dashboard')
+
+
+def create_company(email='company@example.com', **params):
+    """Create and return a company user."""
+    return get_user_model().objects.create_user(
+        email=email, password='testpass123', role=Role.COMPANY, **params
+    )
+
+
+def job_params(**params):
+    """Return the fields of a sample job."""
+    defaults = {
+        'title': 'Sample job',
+        'description': 'Sample description',
+        'main_tasks': 'Sample tasks',
+        'min_salary': 50000,
+        'max_salary': 80000,
+        'seniority': Seniority.JUNIOR,
+        'employment_type': Employment.FULL_TIME,
+    }
+    defaults.update(params)
+    return defaults
+
+
+def create_job(company, **params):
+    """Create and return a sample job."""
+    return Job.objects.create(company=company, **job_params(**params))
+
+
+def stored(company):
+    """Return the comparable figures of a company's stored summary."""
+    summary = CompanySummary.objects.get(company=company)
+    return (summary.job_count, summary.seniority, summary.employment_type,
+            summary.min_salaries, summary.max_salaries, summary.salary_range,
+            summary.daily_jobs)
+
+
+class CompanySummaryTests(TestCase):
+    """Test maintaining company summaries."""
+
+    def setUp(self):
+        self.company = create_company()
+
+    def assertSummaryMatchesJobs(self, company):
+        computed = summaries.compute_summaries([company.pk])[company.pk]
+        self.assertEqual(stored(company), (
+            computed.job_count, computed.seniority,
+            computed.employment_type, computed.min_salaries,
+            computed.max_salaries, computed.salary_range,
+            computed.daily_jobs,
+        ))
+
+    def test_create_update_delete(self):
+        """Test the summary follows job writes."""
+        job = create_job(self.company)
+        create_job(self.company, seniority=Seniority.SENIOR,
+                   min_salary=90000, max_salary=120000)
+        self.assertSummaryMatchesJobs(self.company)
+
+        job.seniority = Seniority.MID_LEVEL
+        job.min_salary = 60000
+        job.save()
+        self.assertSummaryMatchesJobs(self.company)
+
+        job.delete()
+        self.assertSummaryMatchesJobs(self.company)
+        self.assertEqual(stored(self.company)[1], {Seniority.SENIOR: 1})
+
+    def test_job_moved_between_companies(self):
+        """Test both companies are updated when a job changes owner."""
+        other = create_company('other@example.com')
+        job = create_job(self.company)
+
+        job.company = other
+        job.save()
+
+        self.assertEqual(stored(self.company)[0], 0)
+        self.assertEqual(stored(other)[0], 1)
+
+    def test_bulk_created_jobs(self):
+        """Test jobs announced with jobs_bulk_created are counted."""
+        jobs = Job.objects.bulk_create([
+            Job(company=self.company, **job_params(min_salary=salary))
+            for salary in (40000, 45000, 50000)
+        ])
+        jobs_bulk_created.send(sender=Job, jobs=jobs, using='default')
+
+        self.assertSummaryMatchesJobs(self.company)
+
+    def test_deleting_company_drops_summary(self):
+        """Test deleting a company with jobs leaves no summary behind."""
+        create_job(self.company)
+
+        self.company.delete()
+
+        self.assertFalse(CompanySummary.objects.exists())
+
+    def test_salary_stats(self):
+        """Test min and max are exact and the median is within the
+        sketch accuracy."""
+        for salary in (40000, 50000, 50000, 70000):
+            create_job(self.company, min_salary=salary, max_salary=90000)
+
+        figures = summaries.get_summary(self.company.pk)
+
+        stats = figures['salary']['min_salary']
+        self.assertEqual((stats['min'], stats['max']), (40000, 70000))
+        self.assertAlmostEqual(stats['median'], 50000, delta=500)
+        self.assertEqual(figures['salary']['max_salary'],
+                         {'min': 90000, 'median': 90000, 'max': 90000})
+
+    def test_salary_state_is_bounded(self):
+        """Test close salaries share buckets instead of adding keys."""
+        for salary in range(50000, 50500, 10):
+            create_job(self.company, min_salary=salary)
+
+        self.assertLessEqual(len(stored(self.company)[3]), 2)
+        self.assertSummaryMatchesJobs(self.company)
+
+    def test_removing_extreme_salary_narrows_range(self):
+        """Test deleting the lowest and highest paid jobs updates the
+        range."""
+        low = create_job(self.company, min_salary=30000)
+        create_job(self.company, min_salary=50000)
+        high = create_job(self.company, min_salary=70000)
+
+        low.delete()
+        high.max_salary = 65000
+        high.min_salary = 60000
+        high.save()
+
+        stats = summaries.get_summary(self.company.pk)['salary']
+        self.assertEqual((stats['min_salary']['min'],
+                          stats['min_salary']['max']), (50000, 60000))
+        self.assertEqual(stats['max_salary']['max'], 80000)
+        self.assertSummaryMatchesJobs(self.company)
+
+    def test_old_activity_is_dropped(self):
+        """Test jobs posted before the window are not recent activity."""
+        job = create_job(self.company)
+        Job.objects.filter(pk=job.pk).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+        summaries.rebuild([self.company.pk])
+        create_job(self.company)
+
+        figures = summaries.get_summary(self.company.pk)
+
+        self.assertEqual(figures['jobs'], 2)
+        self.assertEqual(figures['recent']['jobs'], 1)
+
+    def test_rebuild_command(self):
+        """Test the command corrects writes that bypassed the signals."""
+        create_job(self.company)
+        Job.objects.update(seniority=Seniority.SENIOR)
+        out = StringIO()
+
+        call_command('rebuild_company_summaries', stdout=out)
+
+        self.assertSummaryMatchesJobs(self.company)
+        self.assertIn('Rebuilt 1 company summaries.', out.getvalue())
+
+
+class CompanyDashboardApiTests(TestCase):
+    """Test the company dashboard endpoint."""
+
+    def setUp(self):
+        self.company = create_company()
+        self.client = APIClient()
+
+    def test_dashboard_reads_one_row(self):
+        """Test the dashboard is served from the summary row."""
+        for _ in range(5):
+            create_job(self.company)
+        self.client.force_authenticate(self.company)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(DASHBOARD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['jobs'], 5)
+        self.assertEqual(res.data['seniority'], {Seniority.JUNIOR: 5})
+        self.assertEqual(res.data['recent']['jobs'], 5)
+
+    def test_empty_dashboard(self):
+        """Test a company without jobs gets an empty summary."""
+        self.client.force_authenticate(self.company)
+
+        res = self.client.get(DASHBOARD_URL)
+
+        self.assertEqual(res.data['jobs'], 0)
+        self.assertIsNone(res.data['salary']['min_salary']['median'])
+
+    def test_talent_forbidden(self):
+        """Test talents have no dashboard."""
+        talent = get_user_model().objects.create_user(
+            email='talent@example.com', password='testpass123',
+            role=Role.TALENT,
+        )
+        self.client.force_authenticate(talent)
+
+        res = self.client.get(DASHBOARD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_staff_picks_company(self):
+        """Test staff can view any company's dashboard."""
+        create_job(self.company)
+        staff = get_user_model().objects.create_user(
+            email='staff@example.com', password='testpass123',
+            role=Role.ADMIN, is_staff=True,
+        )
+        self.client.force_authenticate(staff)
+
+        res = self.client.get(DASHBOARD_URL, {'company': self.company.pk})
+
+        self.assertEqual(res.data['company'], self.company.pk)
+        self.assertEqual(res.data['jobs'], 1)
+
+    def test_staff_must_pick_existing_company(self):
+        """Test staff get an error instead of their own empty summary."""
+        staff = get_user_model().objects.create_user(
+            email='staff@example.com', password='testpass123',
+            role=Role.ADMIN, is_staff=True,
+        )
+        self.client.force_authenticate(staff)
+
+        res = self.client.get(DASHBOARD_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for company in [0, staff.pk]:
+            res = self.client.get(DASHBOARD_URL, {'company': company})
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_dashboard_matches_documented_format(self):
+        """Test timestamps are rendered like the serializer documents."""
+        create_job(self.company)
+        self.client.force_authenticate(self.company)
+
+        res = self.client.get(DASHBOARD_URL)
+
+        last_activity = res.json()['last_activity_at']
+        self.assertTrue(last_activity.endswith('Z'), last_activity)
@@ -0,0 +1,24 @@
+"""
+URL mappings for the job API.
+"""
+from django.urls import path
+
+from job import views
+
+
+app_name = 'job'
+
+urlpatterns = [
+    path('', views.JobListView.as_view(), name='job-list'),
+    path('search/', views.JobSearchView.as_view(), name='job-search'),
+    path('facets/', views.JobFacetsView.as_view(), name='job-facets'),
+    path('salary-stats/', views.SalaryStatsView.as_view(),
+         name='salary-stats'),
+    path('matches/', views.JobMatchesView.as_view(), name='job-matches'),
+    path('dashboard/', views.CompanyDashboardView.as_view(),
+         name='company-dashboard'),
+    path('<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+    path('async/', views.job_list_async, name='job-list-async'),
+    path('async/<int:pk>/', views.job_detail_async,
+         name='job-detail-async'),
+]
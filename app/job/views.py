@@ -1,3 +1,470 @@
-from django.shortcuts import render
+"""
+Views for the job API.
+"""
+import hashlib
 
-# Create your views here.
+from django.utils.decorators import method_decorator
+from django.utils.translation import gettext as _
+from django.views.decorators.http import condition, require_safe
+
+from rest_framework import generics, permissions
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+    OpenApiTypes,
+)
+
+from core.enums import Role, Seniority, Employment
+from core.http import json_response, not_modified
+from core.mixins import ValuesListMixin
+from core.models import CollectionVersion, Job, TalentProfile, User
+from core.skills import SKILL_CODE_SET
+from job.facets import get_facets
+from job.pagination import JobCursorPagination
+from job.search import search_jobs
+from job.serializers import (
+    CompanySummarySerializer,
+    JobSerializer,
+    JobDetailSerializer,
+    JobSearchResultSerializer,
+    JobFacetsSerializer,
+    JobMatchSerializer,
+    SalaryPercentilesSerializer,
+)
+from job.matches import matching_jobs
+from job.salary_stats import get_salary_stats
+from job.summaries import get_summary
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+)
+from user.permissions import IsCompanyOrStaff, IsTalent
+
+
+def _choice_param(params, name, choices):
+    """Return a validated choice query parameter or None."""
+    value = params.get(name)
+    if value is None:
+        return None
+    if value not in choices.values:
+        raise ValidationError({name: _('Invalid choice.')})
+    return value
+
+
+def _int_param(params, name):
+    """Return a validated integer query parameter or None."""
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: _('A valid integer is required.')})
+
+
+def _range_param(params, name):
+    """Return a validated ``lower,upper`` query parameter or None.
+
+    A single value is treated as a range containing only that value.
+    """
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        bounds = [int(bound) for bound in value.split(',')]
+    except ValueError:
+        bounds = []
+    if len(bounds) == 1:
+        bounds = bounds * 2
+    if len(bounds) != 2 or bounds[0] > bounds[1]:
+        raise ValidationError(
+            {name: _('Expected "lower,upper" with lower <= upper.')}
+        )
+    return bounds
+
+
+def _codes_param(params, name):
+    """Return the validated comma separated skill codes or None."""
+    value = params.get(name)
+    if value is None:
+        return None
+    codes = [code.strip() for code in value.split(',') if code.strip()]
+    if not codes or not SKILL_CODE_SET.issuperset(codes):
+        raise ValidationError({name: _('Expected known skill codes.')})
+    return codes
+
+
+def _languages_param(params, name):
+    """Return validated ``language:level`` pairs or None."""
+    codes = _codes_param(params, name)
+    if codes is None:
+        return None
+    languages = [code.split(':') for code in codes]
+    if any(len(language) != 2 for language in languages):
+        raise ValidationError(
+            {name: _('Expected "language:level" codes.')}
+        )
+    return languages
+
+
+def _limit_param(params, default=20, maximum=100, name='limit'):
+    """Return the validated result limit."""
+    limit = _int_param(params, name)
+    if limit is None:
+        return default
+    if limit < 1:
+        raise ValidationError({name: _('Must be a positive integer.')})
+    return min(limit, maximum)
+
+
+def filter_jobs(queryset, params):
+    """Apply the job listing filters in ``params`` to ``queryset``."""
+    seniority = _choice_param(params, 'seniority', Seniority)
+    employment_type = _choice_param(params, 'employment_type', Employment)
+    min_salary = _int_param(params, 'min_salary')
+    max_salary = _int_param(params, 'max_salary')
+    salary_overlaps = _range_param(params, 'salary_overlaps')
+    salary_contains = _range_param(params, 'salary_contains')
+    skills = _codes_param(params, 'skills')
+    any_skills = _codes_param(params, 'any_skills')
+    languages = _languages_param(params, 'languages')
+
+    if seniority is not None:
+        queryset = queryset.filter(seniority=seniority)
+    if employment_type is not None:
+        queryset = queryset.filter(employment_type=employment_type)
+    if min_salary is not None:
+        queryset = queryset.filter(min_salary__gte=min_salary)
+    if max_salary is not None:
+        queryset = queryset.filter(max_salary__lte=max_salary)
+    if salary_overlaps is not None:
+        queryset = queryset.salary_overlaps(*salary_overlaps)
+    if salary_contains is not None:
+        queryset = queryset.salary_contains(*salary_contains)
+    if skills is not None:
+        queryset = queryset.has_all_skills(skills)
+    if any_skills is not None:
+        queryset = queryset.has_any_skills(any_skills)
+    for language, level in languages or []:
+        queryset = queryset.speaks(language, level)
+
+    return queryset
+
+
+def _jobs_version(request):
+    """Return the job collection version, read once per request."""
+    if not hasattr(request, '_jobs_version'):
+        request._jobs_version = CollectionVersion.current(
+            CollectionVersion.JOBS
+        )
+    return request._jobs_version
+
+
+def collection_etag(version, request):
+    """ETag for a job collection response: version plus query."""
+    key = f'{version}:{request.get_full_path()}'
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def job_collection_etag(request, *args, **kwargs):
+    return collection_etag(_jobs_version(request)[0], request)
+
+
+def job_collection_last_modified(request, *args, **kwargs):
+    return _jobs_version(request)[1]
+
+
+def _job_updated_at(request, pk):
+    """Return when job ``pk`` last changed, read once per request."""
+    if not hasattr(request, '_job_updated_at'):
+        request._job_updated_at = Job.objects.filter(pk=pk).values_list(
+            'updated_at', flat=True
+        ).first()
+    return request._job_updated_at
+
+
+def detail_etag(pk, updated_at):
+    """ETag for a single job."""
+    return f'job-{pk}-{updated_at.timestamp()}'
+
+
+def job_etag(request, pk, *args, **kwargs):
+    updated_at = _job_updated_at(request, pk)
+    if updated_at is None:
+        return None
+    return detail_etag(pk, updated_at)
+
+
+def job_last_modified(request, pk, *args, **kwargs):
+    return _job_updated_at(request, pk)
+
+
+collection_condition = method_decorator(
+    condition(etag_func=job_collection_etag,
+              last_modified_func=job_collection_last_modified),
+    name='get',
+)
+
+
+JOB_FILTER_PARAMETERS = [
+    OpenApiParameter('seniority', OpenApiTypes.STR, enum=Seniority.values),
+    OpenApiParameter('employment_type', OpenApiTypes.STR,
+                     enum=Employment.values),
+    OpenApiParameter(
+        'min_salary', OpenApiTypes.INT,
+        description='Only jobs whose minimum salary is at least this.'
+    ),
+    OpenApiParameter(
+        'max_salary', OpenApiTypes.INT,
+        description='Only jobs whose maximum salary is at most this.'
+    ),
+    OpenApiParameter(
+        'salary_overlaps', OpenApiTypes.STR,
+        description='Only jobs whose salary range overlaps "lower,upper".'
+    ),
+    OpenApiParameter(
+        'salary_contains', OpenApiTypes.STR,
+        description=(
+            'Only jobs whose salary range covers "lower,upper" '
+            'or a single value.'
+        )
+    ),
+    OpenApiParameter(
+        'skills', OpenApiTypes.STR,
+        description='Only jobs requiring all of these comma separated '
+                    'skill codes.'
+    ),
+    OpenApiParameter(
+        'any_skills', OpenApiTypes.STR,
+        description='Only jobs requiring at least one of these comma '
+                    'separated skill codes.'
+    ),
+    OpenApiParameter(
+        'languages', OpenApiTypes.STR,
+        description=(
+            'Only jobs asking for each comma separated "language:level" '
+            'code at that level or above, e.g. "EN:INT".'
+        )
+    ),
+]
+
+
+@collection_condition
+@extend_schema_view(get=extend_schema(parameters=JOB_FILTER_PARAMETERS))
+class JobListView(ValuesListMixin, generics.ListAPIView):
+    """List jobs, newest first, with keyset pagination."""
+    serializer_class = JobSerializer
+    pagination_class = JobCursorPagination
+
+    def get_queryset(self):
+        """Return filtered jobs."""
+        return filter_jobs(Job.objects.all(), self.request.query_params)
+
+
+@method_decorator(
+    condition(etag_func=job_etag, last_modified_func=job_last_modified),
+    name='get',
+)
+class JobDetailView(generics.RetrieveAPIView):
+    """Retrieve a single job."""
+    serializer_class = JobDetailSerializer
+    queryset = Job.objects.all()
+
+
+@collection_condition
+@extend_schema_view(
+    get=extend_schema(
+        parameters=[
+            OpenApiParameter('q', OpenApiTypes.STR, required=True,
+                             description='Search terms.'),
+            OpenApiParameter('limit', OpenApiTypes.INT,
+                             description='Maximum number of results.'),
+        ] + JOB_FILTER_PARAMETERS,
+        responses=JobSearchResultSerializer,
+    )
+)
+class JobSearchView(ValuesListMixin, generics.ListAPIView):
+    """Full-text search over job title, description and tasks.
+
+    Results come with the facet counts of the whole job board.
+    """
+    serializer_class = JobSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        """Return the best matching jobs."""
+        params = self.request.query_params
+        query = params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': _('This parameter is required.')})
+        limit = _limit_param(params)
+        queryset = filter_jobs(Job.objects.all(), params)
+        return search_jobs(queryset, query)[:limit]
+
+    def list(self, request, *args, **kwargs):
+        return Response({
+            'results': list(self.get_rows(self.get_queryset())),
+            'facets': get_facets(),
+        })
+
+
+@collection_condition
+class JobFacetsView(APIView):
+    """Job counts per seniority, employment type and salary bucket."""
+
+    @extend_schema(responses=JobFacetsSerializer)
+    def get(self, request):
+        return Response(get_facets())
+
+
+@collection_condition
+class SalaryStatsView(APIView):
+    """Salary percentiles per seniority, employment type and area.
+
+    Percentiles come from quantile sketches and are within
+    ``relative_accuracy`` of the exact values.
+    """
+
+    @extend_schema(responses=SalaryPercentilesSerializer)
+    def get(self, request):
+        return Response(get_salary_stats())
+
+
+class JobMatchesView(APIView):
+    """Jobs best matching the authenticated talent's skills.
+
+    A job's score is the share of its required skills the talent has.
+    With ``seniority`` only jobs within one level of it are returned.
+    """
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsTalent]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('seniority', OpenApiTypes.STR,
+                             enum=Seniority.values),
+            OpenApiParameter('limit', OpenApiTypes.INT,
+                             description='Maximum number of results.'),
+        ],
+        responses=JobMatchSerializer(many=True),
+    )
+    def get(self, request):
+        params = request.query_params
+        seniority = _choice_param(params, 'seniority', Seniority)
+        limit = _limit_param(params)
+        skills = TalentProfile.objects.filter(
+            account_id=request.user.pk
+        ).values_list('skills', flat=True).first()
+        if skills is None:
+            raise NotFound(_('Talent profile not found.'))
+
+        matches = matching_jobs(skills, k=limit, seniority=seniority)
+        rows = {row['id']: row for row in Job.objects.filter(
+            pk__in=[pk for pk, _score in matches]
+        ).values(*JobSerializer.Meta.fields)}
+        return Response([{**rows[pk], 'score': score}
+                         for pk, score in matches if pk in rows])
+
+
+class CompanyDashboardView(APIView):
+    """Hiring summary of the authenticated company.
+
+    Served from the company's ``CompanySummary`` row, so the cost does not
+    grow with its number of jobs. Staff pick the company with ``company``,
+    which they must pass unless they are a company themselves.
+    """
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsCompanyOrStaff]
+
+    @extend_schema(
+        parameters=[OpenApiParameter(
+            'company', OpenApiTypes.INT,
+            description='Company to summarize (staff only, required '
+                        'for staff that are not a company).',
+        )],
+        responses=CompanySummarySerializer,
+    )
+    def get(self, request):
+        user = request.user
+        company_id = user.pk
+        if user.is_staff:
+            requested = _int_param(request.query_params, 'company')
+            if requested is None and user.role != Role.COMPANY:
+                raise ValidationError(
+                    {'company': _('This parameter is required.')}
+                )
+            if requested is not None:
+                if not User.objects.filter(pk=requested,
+                                           role=Role.COMPANY).exists():
+                    raise NotFound(_('Company not found.'))
+                company_id = requested
+        return Response(
+            CompanySummarySerializer(get_summary(company_id)).data
+        )
+
+
+@require_safe
+async def job_list_async(request):
+    """List jobs, newest first, without leaving the event loop.
+
+    Takes the job list filters plus ``page_size`` and a ``before`` job id
+    as the keyset cursor; ``next`` links to the following page.
+    """
+    params = request.GET
+    try:
+        queryset = filter_jobs(Job.objects.all(), params)
+        page_size = _limit_param(
+            params, default=JobCursorPagination.page_size,
+            maximum=JobCursorPagination.max_page_size, name='page_size',
+        )
+        before = _int_param(params, 'before')
+    except ValidationError as exc:
+        return json_response(exc.detail, status=400)
+
+    version, updated_at = await CollectionVersion.acurrent(
+        CollectionVersion.JOBS
+    )
+    etag = collection_etag(version, request)
+    response = not_modified(request, etag, updated_at)
+    if response is not None:
+        return response
+
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    rows = queryset.order_by('-id').values(*JobSerializer.Meta.fields)
+    results = [row async for row in rows[:page_size + 1]]
+
+    next_url = None
+    if len(results) > page_size:
+        results = results[:page_size]
+        query = params.copy()
+        query['before'] = results[-1]['id']
+        next_url = request.build_absolute_uri(
+            f'{request.path}?{query.urlencode()}'
+        )
+    return json_response({'next': next_url, 'results': results},
+                         etag=etag, last_modified=updated_at)
+
+
+@require_safe
+async def job_detail_async(request, pk):
+    """Retrieve a single job without leaving the event loop."""
+    fields = JobDetailSerializer.Meta.fields
+    job = await Job.objects.filter(pk=pk).values(
+        *fields, 'updated_at'
+    ).afirst()
+    if job is None:
+        return json_response({'detail': _('Not found.')}, status=404)
+
+    updated_at = job.pop('updated_at')
+    etag = detail_etag(pk, updated_at)
+    response = not_modified(request, etag, updated_at)
+    if response is not None:
+        return response
+    return json_response(job, etag=etag, last_modified=updated_at)
@@ -0,0 +1,220 @@
+"""
+Authentication classes for the user API.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext as _
+
+from rest_framework import authentication, exceptions
+from rest_framework.authtoken.models import Token
+
+from core.db.routers import reads_from_replicas, use_primary
+from user.tokens import verify_access
+
+
+class LocalTokenCache:
+    """Bounded in-process LRU cache whose entries expire after ``ttl``.
+
+    Entries are copied on the way in and out, so a view mutating
+    ``request.user`` never changes what the next request sees.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, value):
+        self.set(key, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoTokenCache:
+    """Token cache stored in one of the ``CACHES`` backends.
+
+    Use this when several worker processes must see each other's
+    invalidations.
+    """
+    key_prefix = 'auth-token:'
+
+    def __init__(self, alias, ttl):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.cache.get(self.key_prefix + key)
+
+    def set(self, key, value):
+        self.cache.set(self.key_prefix + key, value, self.ttl)
+
+    async def aget(self, key):
+        return await self.cache.aget(self.key_prefix + key)
+
+    async def aset(self, key, value):
+        await self.cache.aset(self.key_prefix + key, value, self.ttl)
+
+    def delete(self, key):
+        self.cache.delete(self.key_prefix + key)
+
+    def clear(self):
+        self.cache.clear()
+
+
+# Longest a per-process cache entry may outlive an invalidation made by
+# another worker.
+LOCAL_MAX_TTL = 5
+
+_token_cache = None
+
+
+def get_token_cache():
+    """Return the token cache configured by ``TOKEN_AUTH_CACHE``."""
+    global _token_cache
+    if _token_cache is None:
+        config = settings.TOKEN_AUTH_CACHE
+        if config['BACKEND'] == 'django':
+            _token_cache = DjangoTokenCache(config['CACHE_ALIAS'],
+                                            config['TTL'])
+        else:
+            _token_cache = LocalTokenCache(
+                config['MAX_SIZE'], min(config['TTL'], LOCAL_MAX_TTL)
+            )
+    return _token_cache
+
+
+@receiver(setting_changed)
+def reset_token_cache(setting, **kwargs):
+    global _token_cache
+    if setting == 'TOKEN_AUTH_CACHE':
+        _token_cache = None
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """Token authentication that caches the token to user lookup.
+
+    Cache entries are dropped when the token is deleted or its user is
+    saved (see ``user.signals``), and expire after ``TOKEN_AUTH_CACHE``
+    ``TTL`` seconds at the latest (``LOCAL_MAX_TTL`` for the per-process
+    cache, whose invalidations other workers never see).
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            user, token = super().authenticate_credentials(key)
+        except exceptions.AuthenticationFailed:
+            if not reads_from_replicas():
+                raise
+            # The token may not have replicated yet.
+            with use_primary():
+                user, token = super().authenticate_credentials(key)
+        cache.set(key, (user, token))
+        return user, token
+
+
+class SignedTokenAuthentication(authentication.BaseAuthentication):
+    """Authenticate ``Bearer`` access tokens without a database query.
+
+    ``request.user`` is a ``user.tokens.TokenUser``; views needing the
+    full user load it with ``user.tokens.resolve_user``.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = authentication.get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return verify_access(token), token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+async def aauthenticate_token(request):
+    """Async counterpart of ``CachedTokenAuthentication.authenticate``.
+
+    Returns ``(user, token)``, or None when the request carries no token,
+    and raises ``AuthenticationFailed`` for bad tokens. Shares the token
+    cache with the sync views. Signed ``Bearer`` tokens are accepted too
+    and yield a ``TokenUser``.
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if not auth or auth[0].lower() not in ('token', 'bearer'):
+        return None
+    if len(auth) != 2:
+        raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+    key = auth[1]
+    if auth[0].lower() == 'bearer':
+        return verify_access(key), key
+
+    cache = get_token_cache()
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+
+    tokens = Token.objects.select_related('user')
+    try:
+        token = await tokens.aget(key=key)
+    except Token.DoesNotExist:
+        if not reads_from_replicas():
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        # The token may not have replicated yet.
+        with use_primary():
+            try:
+                token = await tokens.aget(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+    await cache.aset(key, (token.user, token))
+    return token.user, token
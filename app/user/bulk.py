@@ -0,0 +1,66 @@
+"""
+Batch user registration.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+from user.hashing import hash_passwords
+from user.serializers import BatchUserSerializer
+
+
+def validate_users(rows, using='default'):
+    """Validate a batch of registration ``rows``.
+
+    Return ``(valid, errors)``, both keyed by row index: ``valid`` holds the
+    validated data and ``errors`` the per-field error lists. Emails are
+    checked against each other and against existing users in one query.
+    """
+    user_model = get_user_model()
+    valid, errors = {}, {}
+    seen = set()
+
+    for index, row in enumerate(rows):
+        serializer = BatchUserSerializer(data=row)
+        if not serializer.is_valid():
+            errors[index] = serializer.errors
+            continue
+        data = dict(serializer.validated_data)
+        data['email'] = user_model.objects.normalize_email(data['email'])
+        if data['email'] in seen:
+            errors[index] = {'email': [_('Duplicate email in this batch.')]}
+            continue
+        seen.add(data['email'])
+        valid[index] = data
+
+    existing = set(
+        user_model.objects.using(using)
+        .filter(email__in=seen)
+        .values_list('email', flat=True)
+    )
+    for index, data in list(valid.items()):
+        if data['email'] in existing:
+            errors[index] = {
+                'email': [_('user with this email already exists.')]
+            }
+            del valid[index]
+
+    return valid, errors
+
+
+def create_users(validated, using='default'):
+    """Create users from validated rows with a single ``bulk_create``.
+
+    Passwords are hashed in parallel across the hashing processes.
+    """
+    user_model = get_user_model()
+    hashes = hash_passwords(data['password'] for data in validated)
+    users = [
+        user_model(
+            password=password_hash,
+            **{k: v for k, v in data.items() if k != 'password'},
+        )
+        for data, password_hash in zip(validated, hashes)
+    ]
+    with transaction.atomic(using=using):
+        return user_model.objects.using(using).bulk_create(users)
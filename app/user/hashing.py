@@ -0,0 +1,139 @@
+"""
+Password hashing off the request thread.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class PoolSaturated(Exception):
+    """The hashing pool has no free slot for more work."""
+
+
+class BoundedExecutor:
+    """Thread pool that rejects work instead of queueing it forever.
+
+    At most ``max_workers`` jobs run and ``max_pending`` more wait; past
+    that ``run()`` raises ``PoolSaturated`` straight away. hashlib releases
+    the GIL while running PBKDF2, so the threads hash in parallel.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='password-hasher',
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` in the pool and return its result."""
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturated()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Hold the slot until the thread is done, even if the awaiting
+        # request goes away first.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_executor = None
+
+
+def get_password_executor():
+    """Return the pool configured by ``PASSWORD_HASHER_POOL``."""
+    global _executor
+    if _executor is None:
+        config = settings.PASSWORD_HASHER_POOL
+        _executor = BoundedExecutor(config['MAX_WORKERS'],
+                                    config['MAX_PENDING'])
+    return _executor
+
+
+_process_pool = None
+
+
+def _init_hashing_process():
+    django.setup()
+
+
+def get_hashing_processes():
+    """Return the process pool used to hash batches of new passwords.
+
+    Workers come from a fork server (or are spawned where that is not
+    available) so they never inherit the web worker's threads or database
+    connections.
+    """
+    global _process_pool
+    if _process_pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in methods else 'spawn'
+        )
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASHER_POOL['PROCESSES'],
+            mp_context=context,
+            initializer=_init_hashing_process,
+        )
+    return _process_pool
+
+
+@receiver(setting_changed)
+def reset_password_executor(setting, **kwargs):
+    global _executor, _process_pool
+    if setting != 'PASSWORD_HASHER_POOL':
+        return
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False)
+        _process_pool = None
+
+
+def hash_passwords(passwords):
+    """Return ``make_password()`` for each of ``passwords``, in order.
+
+    Batches of ``PARALLEL_THRESHOLD`` passwords or more are spread over
+    the hashing processes; smaller ones are not worth the round trip.
+    """
+    passwords = list(passwords)
+    config = settings.PASSWORD_HASHER_POOL
+    if len(passwords) < config['PARALLEL_THRESHOLD']:
+        return [make_password(password) for password in passwords]
+    pool = get_hashing_processes()
+    chunksize = max(1, len(passwords) // (config['PROCESSES'] * 4))
+    return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def verify_password(password, encoded):
+    """Check ``password`` against the ``encoded`` hash.
+
+    Return ``(is_correct, new_hash)``; ``new_hash`` is set when the stored
+    hash uses outdated parameters and should be replaced. With no stored
+    hash, a throwaway hash is computed so unknown and known accounts take
+    the same time to reject.
+    """
+    if encoded is None:
+        make_password(password)
+        return False, None
+
+    upgraded = []
+    is_correct = check_password(
+        password, encoded,
+        setter=lambda raw: upgraded.append(make_password(raw)),
+    )
+    return is_correct, upgraded[0] if upgraded else None
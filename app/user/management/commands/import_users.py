@@ -0,0 +1,83 @@
+"""
+Django command to register users from a JSONL or CSV file.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from core.feeds import RowError, feed_format, open_feed, read_rows
+from user.bulk import create_users, validate_users
+
+
+class Command(BaseCommand):
+    """Django command to register users in batches."""
+    help = 'Register users from a JSONL or CSV file in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='User file, or - for stdin.')
+        parser.add_argument(
+            '--format', choices=['jsonl', 'csv'],
+            help='File format. Defaults to the file extension.'
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options['path']
+        fmt = options['format'] or feed_format(path)
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+        self.using = options['database']
+        self.created = self.failed = 0
+
+        try:
+            stream = open_feed(path)
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+
+        with stream:
+            batch = []
+            for line_number, row in read_rows(stream, fmt):
+                if isinstance(row, RowError):
+                    self.report(line_number, row)
+                    continue
+                batch.append((line_number, row))
+                if len(batch) >= batch_size:
+                    self.flush(batch)
+                    batch = []
+            self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {self.created} users, skipped {self.failed} rows.'
+        ))
+
+    def report(self, line_number, error):
+        """Report a rejected row without stopping the import."""
+        self.failed += 1
+        self.stderr.write(f'Line {line_number}: {error}')
+
+    def flush(self, batch):
+        """Validate ``batch`` and create its valid users."""
+        if not batch:
+            return
+        valid, errors = validate_users([row for _, row in batch],
+                                       using=self.using)
+        for index in sorted(errors):
+            self.report(batch[index][0], '; '.join(
+                f'{field}: {" ".join(str(m) for m in messages)}'
+                for field, messages in errors[index].items()
+            ))
+
+        if not valid:
+            return
+        try:
+            create_users([valid[index] for index in sorted(valid)],
+                         using=self.using)
+        except DatabaseError as e:
+            self.failed += len(valid)
+            self.stderr.write(
+                f'Lines {batch[0][0]}-{batch[-1][0]}: batch failed: {e}'
+            )
+            return
+        self.created += len(valid)
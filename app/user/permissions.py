@@ -0,0 +1,27 @@
+"""
+Permissions for the user API.
+"""
+from rest_framework import permissions
+
+from core.enums import Role
+
+
+class IsCompanyOrStaff(permissions.BasePermission):
+    """Allow company accounts and staff members."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated and
+            (user.is_staff or user.role == Role.COMPANY)
+        )
+
+
+class IsTalent(permissions.BasePermission):
+    """Allow talent accounts."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated and user.role == Role.TALENT
+        )
@@ -0,0 +1,17 @@
+"""
+OpenAPI descriptions of the user API authentication schemes.
+"""
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+
+
+class SignedTokenScheme(OpenApiAuthenticationExtension):
+    """Describe ``SignedTokenAuthentication`` as HTTP bearer auth."""
+    target_class = 'user.authentication.SignedTokenAuthentication'
+    name = 'signedTokenAuth'
+
+    def get_security_definition(self, auto_schema):
+        return {
+            'type': 'http',
+            'scheme': 'bearer',
+            'description': 'Signed access token from the token endpoint.',
+        }
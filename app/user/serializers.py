@@ -9,8 +9,10 @@ from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from core.mixins import TimedSerializerMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for the user object."""
 
     class Meta:
@@ -39,14 +41,32 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class AuthTokenSerializer(serializers.Serializer):
-    """Serializer for the user auth token."""
+class BatchUserSerializer(UserSerializer):
+    """Serializer for one user of a batch registration.
+
+    Email uniqueness is checked for the whole batch at once by
+    ``user.bulk.validate_users`` instead of with one query per row.
+    """
+
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = {
+            **UserSerializer.Meta.extra_kwargs,
+            'email': {'validators': []},
+        }
+
+
+class AuthCredentialsSerializer(TimedSerializerMixin, serializers.Serializer):
+    """Serializer for login credentials."""
     email = serializers.EmailField()
     password = serializers.CharField(
         style={'input_type': 'password'},
         trim_whitespace=False,
     )
 
+
+class AuthTokenSerializer(AuthCredentialsSerializer):
+    """Serializer for the user auth token."""
+
     def validate(self, attrs):
         """Validate and authenticate the user."""
         email = attrs.get('email')
@@ -62,3 +82,16 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """Serializer for a signed refresh token."""
+    refresh = serializers.CharField(trim_whitespace=False)
+
+
+class TokenPairSerializer(serializers.Serializer):
+    """Schema for a signed access and refresh token pair."""
+    access = serializers.CharField()
+    refresh = serializers.CharField()
+    token_type = serializers.CharField()
+    expires_in = serializers.IntegerField()
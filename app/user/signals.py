@@ -0,0 +1,29 @@
+"""
+Signal handlers keeping the token cache in sync.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from user.authentication import get_token_cache
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Forget a deleted token."""
+    get_token_cache().delete(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, using, **kwargs):
+    """Forget the tokens of an updated or deactivated user."""
+    if created:
+        return
+    cache = get_token_cache()
+    keys = Token.objects.using(using).filter(
+        user_id=instance.pk
+    ).values_list('key', flat=True)
+    for key in keys:
+        cache.delete(key)
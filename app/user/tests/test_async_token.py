@@ -0,0 +1,106 @@
+"""
+Tests for the async token endpoint.
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework import status
+
+from user.hashing import PoolSaturated
+
+
+TOKEN_ASYNC_URL = reverse('user:token-async')
+
+
+def create_user(**params):
+    """Create and return new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class AsyncTokenApiTests(TestCase):
+    """Test the async token endpoint."""
+
+    def setUp(self):
+        self.user = create_user(
+            email='test@test.com',
+            password='test-user-password123',
+            role='TALENT',
+        )
+
+    async def test_create_token_for_user(self):
+        """Test generates token for valid credentials."""
+        res = await self.async_client.post(TOKEN_ASYNC_URL, {
+            'email': 'test@test.com',
+            'password': 'test-user-password123',
+        }, content_type='application/json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        token = await Token.objects.aget(user=self.user)
+        self.assertEqual(res.json(), {'token': token.key})
+
+    async def test_create_token_accepts_form_data(self):
+        """Test form-encoded credentials are accepted."""
+        res = await self.async_client.post(TOKEN_ASYNC_URL, {
+            'email': 'test@test.com',
+            'password': 'test-user-password123',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def test_create_token_bad_credentials(self):
+        """Test returns error if credentials are incorrect."""
+        for email, password in [('test@test.com', 'badpass'),
+                                ('nobody@test.com', 'badpass')]:
+            res = await self.async_client.post(TOKEN_ASYNC_URL, {
+                'email': email,
+                'password': password,
+            }, content_type='application/json')
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertNotIn('token', res.json())
+
+    async def test_create_token_inactive_user(self):
+        """Test inactive users do not get a token."""
+        self.user.is_active = False
+        await self.user.asave()
+
+        res = await self.async_client.post(TOKEN_ASYNC_URL, {
+            'email': 'test@test.com',
+            'password': 'test-user-password123',
+        }, content_type='application/json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_create_token_blank_password(self):
+        """Test posting a blank password returns an error."""
+        res = await self.async_client.post(TOKEN_ASYNC_URL, {
+            'email': 'test@test.com',
+            'password': '',
+        }, content_type='application/json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', res.json())
+
+    async def test_saturated_pool_returns_back_pressure(self):
+        """Test a full hashing pool answers 503 with Retry-After."""
+        with patch('user.hashing.BoundedExecutor.run',
+                   side_effect=PoolSaturated):
+            res = await self.async_client.post(TOKEN_ASYNC_URL, {
+                'email': 'test@test.com',
+                'password': 'test-user-password123',
+            }, content_type='application/json')
+
+        self.assertEqual(res.status_code,
+                         status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res['Retry-After'], '1')
+
+    async def test_get_not_allowed(self):
+        """Test GET is not allowed for the endpoint."""
+        res = await self.async_client.get(TOKEN_ASYNC_URL)
+
+        self.assertEqual(res.status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,236 @@
+"""
+Tests for the cached token authentication.
+"""
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.db.routers import reads_from_replicas, routing_scope
+from user.authentication import (
+    LOCAL_MAX_TTL,
+    CachedTokenAuthentication,
+    DjangoTokenCache,
+    LocalTokenCache,
+    get_token_cache,
+)
+
+
+ME_URL = reverse('user:me')
+ME_ASYNC_URL = reverse('user:me-async')
+
+
+def create_user(**params):
+    """Create and return new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class LocalTokenCacheTests(TestCase):
+    """Test the in-process token cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache drops the least recently used entry."""
+        cache = LocalTokenCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_entries_expire(self):
+        """Test entries are not returned after their TTL."""
+        cache = LocalTokenCache(max_size=2, ttl=0)
+        cache.set('a', 1)
+
+        self.assertIsNone(cache.get('a'))
+
+    def test_returns_copies(self):
+        """Test mutating a returned value does not change the cache."""
+        cache = LocalTokenCache(max_size=2, ttl=60)
+        cache.set('a', {'name': 'original'})
+        cache.get('a')['name'] = 'changed'
+
+        self.assertEqual(cache.get('a'), {'name': 'original'})
+
+
+class TokenCacheConfigTests(TestCase):
+    """Test choosing the token cache from settings."""
+
+    def test_default_cache_is_shared(self):
+        """Test the default backend is the Django cache."""
+        self.assertIsInstance(get_token_cache(), DjangoTokenCache)
+
+    @override_settings(TOKEN_AUTH_CACHE={
+        'BACKEND': 'local', 'CACHE_ALIAS': 'default',
+        'MAX_SIZE': 100, 'TTL': 300,
+    })
+    def test_local_cache_ttl_is_capped(self):
+        """Test per-process entries expire within seconds."""
+        cache = get_token_cache()
+
+        self.assertIsInstance(cache, LocalTokenCache)
+        self.assertEqual(cache.ttl, LOCAL_MAX_TTL)
+
+
+@override_settings(TOKEN_AUTH_CACHE={
+    'BACKEND': 'local', 'CACHE_ALIAS': 'default',
+    'MAX_SIZE': 100, 'TTL': 300,
+})
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating with cached tokens."""
+
+    def setUp(self):
+        self.user = create_user(
+            first_name='Test',
+            last_name='User',
+            email='test@test.com',
+            password='test-password123',
+            role='TALENT',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeated_requests_skip_token_lookup(self):
+        """Test only the first request resolves the token in the DB."""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_deleted_token_is_rejected(self):
+        """Test a deleted token stops authenticating immediately."""
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test deactivating a user invalidates the cached token."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_updated_user_is_reloaded(self):
+        """Test profile updates are visible on the next request."""
+        self.client.get(ME_URL)
+        self.client.patch(ME_URL, {'first_name': 'Updated'})
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['first_name'], 'Updated')
+
+    def test_deleted_user_is_rejected(self):
+        """Test deleting a user invalidates the cached token."""
+        self.client.get(ME_URL)
+        self.user.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNone(get_token_cache().get(self.token.key))
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_unreplicated_token_found_on_primary(self):
+        """Test a token missing on the replica is looked up on the primary."""
+        calls = []
+
+        def lookup(key):
+            calls.append(reads_from_replicas())
+            if len(calls) == 1:
+                raise AuthenticationFailed('Invalid token.')
+            return self.user, self.token
+
+        authentication = CachedTokenAuthentication()
+        with routing_scope(), patch.object(
+            TokenAuthentication, 'authenticate_credentials',
+            side_effect=lookup,
+        ):
+            user, token = authentication.authenticate_credentials('new-key')
+
+        self.assertEqual(calls, [True, False])
+        self.assertEqual(user, self.user)
+
+
+class AsyncTokenAuthenticationTests(TestCase):
+    """Test the async profile view and token authentication."""
+
+    def setUp(self):
+        self.user = create_user(
+            email='test@test.com',
+            password='test-password123',
+            role='TALENT',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.headers = {'Authorization': f'Token {self.token.key}'}
+
+    async def test_profile_matches_sync_view(self):
+        """Test the async profile equals the sync one."""
+        sync = await self.async_client.get(ME_URL, headers=self.headers)
+        res = await self.async_client.get(ME_ASYNC_URL, headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), sync.json())
+
+    def test_shares_token_cache(self):
+        """Test the async view reuses tokens cached by the sync view."""
+        self.client.get(ME_URL, headers=self.headers)
+
+        with self.assertNumQueries(0):
+            res = async_to_sync(self.async_client.get)(
+                ME_ASYNC_URL, headers=self.headers
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def test_profile_not_modified(self):
+        """Test an unchanged profile answers 304."""
+        res = await self.async_client.get(ME_ASYNC_URL, headers=self.headers)
+
+        cached = await self.async_client.get(
+            ME_ASYNC_URL,
+            headers={**self.headers, 'If-None-Match': res['ETag']},
+        )
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_rejects_missing_and_bad_tokens(self):
+        """Test requests without a valid token are unauthorized."""
+        missing = await self.async_client.get(ME_ASYNC_URL)
+        bad = await self.async_client.get(
+            ME_ASYNC_URL, headers={'Authorization': 'Token nope'}
+        )
+
+        self.assertEqual(missing.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(bad.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(bad['WWW-Authenticate'], 'Token')
+
+    async def test_inactive_user_rejected(self):
+        """Test tokens of inactive users are refused."""
+        self.user.is_active = False
+        await self.user.asave()
+
+        res = await self.async_client.get(ME_ASYNC_URL, headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,45 @@
+"""
+Test user management commands.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+
+class ImportUsersCommandTests(TestCase):
+    """Test the import_users command."""
+
+    def write_file(self, rows):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        with os.fdopen(fd, 'w') as users:
+            users.write('\n'.join(json.dumps(row) for row in rows))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_users_reports_bad_rows(self):
+        """Test valid rows are created and invalid rows are reported."""
+        get_user_model().objects.create_user(
+            email='taken@example.com',
+            password='testpass123',
+            role='TALENT',
+        )
+        rows = [
+            {'email': f'user{i}@example.com', 'password': 'testpass123',
+             'first_name': 'Test', 'last_name': 'User', 'role': 'TALENT'}
+            for i in range(3)
+        ]
+        rows[1]['email'] = 'taken@example.com'
+        out, err = StringIO(), StringIO()
+
+        call_command('import_users', self.write_file(rows),
+                     '--batch-size', '2', stdout=out, stderr=err)
+
+        self.assertIn('Created 2 users, skipped 1 rows.', out.getvalue())
+        self.assertIn('Line 2: email:', err.getvalue())
+        user = get_user_model().objects.get(email='user2@example.com')
+        self.assertTrue(user.check_password('testpass123'))
@@ -0,0 +1,72 @@
+"""
+Tests for the password hashing pools.
+"""
+import asyncio
+import threading
+
+from django.test import SimpleTestCase, override_settings
+from django.contrib.auth.hashers import check_password, make_password
+
+from user.hashing import (
+    BoundedExecutor,
+    PoolSaturated,
+    hash_passwords,
+    verify_password,
+)
+
+
+class BoundedExecutorTests(SimpleTestCase):
+    """Test the bounded hashing pool."""
+
+    def test_rejects_work_when_saturated(self):
+        """Test work beyond the pool's capacity is rejected."""
+        executor = BoundedExecutor(max_workers=1, max_pending=0)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0)
+            with self.assertRaises(PoolSaturated):
+                await executor.run(lambda: None)
+            release.set()
+            await running
+            return await executor.run(lambda: 'free again')
+
+        self.assertEqual(asyncio.run(scenario()), 'free again')
+
+    def test_verify_password_flags_outdated_hashes(self):
+        """Test verification reports a replacement for outdated hashes."""
+        outdated = make_password('secret', hasher='pbkdf2_sha1')
+
+        self.assertEqual(verify_password('wrong', outdated), (False, None))
+        is_correct, new_hash = verify_password('secret', outdated)
+        self.assertTrue(is_correct)
+        self.assertTrue(new_hash.startswith('pbkdf2_sha256$'))
+
+
+class HashPasswordsTests(SimpleTestCase):
+    """Test hashing batches of passwords."""
+
+    def _assert_hashes(self, passwords):
+        hashes = hash_passwords(passwords)
+
+        self.assertEqual(len(hashes), len(passwords))
+        for password, encoded in zip(passwords, hashes):
+            self.assertTrue(check_password(password, encoded))
+
+    @override_settings(PASSWORD_HASHER_POOL={
+        'MAX_WORKERS': 1, 'MAX_PENDING': 0,
+        'PROCESSES': 2, 'PARALLEL_THRESHOLD': 100,
+    })
+    def test_small_batches_hash_in_process(self):
+        """Test batches under the threshold are hashed serially."""
+        self._assert_hashes(['first-pass', 'second-pass'])
+
+    @override_settings(PASSWORD_HASHER_POOL={
+        'MAX_WORKERS': 1, 'MAX_PENDING': 0,
+        'PROCESSES': 2, 'PARALLEL_THRESHOLD': 2,
+    })
+    def test_large_batches_hash_across_processes(self):
+        """Test batches over the threshold are hashed in the pool."""
+        self._assert_hashes([f'password-{i}' for i in range(4)])
@@ -0,0 +1,245 @@
+"""
+Tests for the signed access and refresh tokens.
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core.models import RevokedToken
+from user.tokens import TokenUser, issue_tokens, verify_access
+
+
+TOKEN_URL = reverse('user:token')
+TOKEN_ASYNC_URL = reverse('user:token-async')
+REFRESH_URL = reverse('user:token-refresh')
+REVOKE_URL = reverse('user:token-revoke')
+ME_URL = reverse('user:me')
+ME_ASYNC_URL = reverse('user:me-async')
+CREATE_BATCH_URL = reverse('user:create-batch')
+
+SIGNED = {'MODE': 'signed', 'ACCESS_TTL': 300, 'REFRESH_TTL': 3600}
+
+
+def create_user(**params):
+    """Create and return new user."""
+    defaults = {
+        'email': 'test@example.com',
+        'password': 'testpass123',
+        'first_name': 'Test',
+        'last_name': 'User',
+        'role': 'TALENT',
+    }
+    defaults.update(params)
+    return get_user_model().objects.create_user(**defaults)
+
+
+def bearer(token):
+    """Return the Authorization header for an access token."""
+    return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+
+class SignedTokenTests(TestCase):
+    """Test issuing and verifying signed tokens."""
+
+    def setUp(self):
+        self.user = create_user(role='COMPANY', is_staff=True)
+
+    def test_access_token_round_trip(self):
+        """Test the access token carries id, role and staff flag."""
+        tokens = issue_tokens(self.user)
+
+        with self.assertNumQueries(0):
+            user = verify_access(tokens['access'])
+
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.role, 'COMPANY')
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.is_authenticated)
+
+    def test_tampered_token_rejected(self):
+        """Test a modified payload fails the signature check."""
+        access = issue_tokens(self.user)['access']
+        tampered = ('x' if access[0] != 'x' else 'y') + access[1:]
+
+        with self.assertRaises(AuthenticationFailed):
+            verify_access(tampered)
+
+    def test_refresh_token_is_not_an_access_token(self):
+        """Test tokens are signed with distinct salts."""
+        refresh = issue_tokens(self.user)['refresh']
+
+        with self.assertRaises(AuthenticationFailed):
+            verify_access(refresh)
+
+    def test_expired_access_token_rejected(self):
+        """Test access tokens expire after ACCESS_TTL."""
+        access = issue_tokens(self.user)['access']
+        later = timezone.now().timestamp() + 301
+
+        with patch('time.time', return_value=later), \
+                self.assertRaises(AuthenticationFailed):
+            verify_access(access)
+
+
+@override_settings(AUTH_TOKENS=SIGNED)
+class SignedTokenApiTests(TestCase):
+    """Test the signed token endpoints."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+
+    def login(self):
+        res = self.client.post(TOKEN_URL, {'email': 'test@example.com',
+                                           'password': 'testpass123'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_login_issues_token_pair(self):
+        """Test the token endpoint returns signed tokens, not a row."""
+        tokens = self.login()
+
+        self.assertEqual(tokens['token_type'], 'Bearer')
+        self.assertEqual(tokens['expires_in'], 300)
+        self.assertIn('refresh', tokens)
+        self.assertFalse(Token.objects.exists())
+
+    def test_me_with_access_token(self):
+        """Test the profile view loads the user behind the token."""
+        tokens = self.login()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL, **bearer(tokens['access']))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], 'test@example.com')
+
+    def test_update_with_access_token(self):
+        """Test the authenticated user can be updated."""
+        tokens = self.login()
+
+        res = self.client.patch(ME_URL, {'first_name': 'New'},
+                                **bearer(tokens['access']))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'New')
+
+    def test_permission_check_needs_no_auth_query(self):
+        """Test role based permissions are answered from the token."""
+        access = issue_tokens(self.user)['access']
+
+        with self.assertNumQueries(0):
+            res = self.client.post(CREATE_BATCH_URL, [], format='json',
+                                   **bearer(access))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deleted_user_rejected(self):
+        """Test views loading the user fail once it is gone."""
+        access = issue_tokens(self.user)['access']
+        self.user.delete()
+
+        res = self.client.get(ME_URL, **bearer(access))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_rotates_tokens(self):
+        """Test a refresh token can be used exactly once."""
+        tokens = self.login()
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['refresh'], tokens['refresh'])
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_inactive_user(self):
+        """Test deactivated users cannot refresh."""
+        tokens = self.login()
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_after_password_change(self):
+        """Test changing the password invalidates refresh tokens."""
+        tokens = self.login()
+        self.user.set_password('newpass456')
+        self.user.save()
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke(self):
+        """Test a revoked refresh token cannot be used."""
+        tokens = self.login()
+
+        res = self.client.post(REVOKE_URL, {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_list_prunes_expired_entries(self):
+        """Test revocations are forgotten once the token has expired."""
+        RevokedToken.objects.create(
+            jti='old', expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        tokens = self.login()
+
+        self.client.post(REVOKE_URL, {'refresh': tokens['refresh']})
+
+        self.assertEqual(RevokedToken.objects.count(), 1)
+        self.assertFalse(RevokedToken.objects.filter(jti='old').exists())
+
+    def test_opaque_tokens_still_accepted(self):
+        """Test existing opaque tokens keep working in signed mode."""
+        token = Token.objects.create(user=self.user)
+
+        res = self.client.get(ME_URL, HTTP_AUTHORIZATION=f'Token {token}')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+@override_settings(AUTH_TOKENS=SIGNED)
+class AsyncSignedTokenApiTests(TestCase):
+    """Test the async views with signed tokens."""
+
+    def setUp(self):
+        self.user = create_user()
+
+    async def test_async_login_issues_token_pair(self):
+        """Test the async token endpoint honours the token mode."""
+        res = await self.async_client.post(TOKEN_ASYNC_URL, {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+        }, content_type='application/json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['token_type'], 'Bearer')
+
+    async def test_async_me_with_access_token(self):
+        """Test the async profile view accepts access tokens."""
+        access = issue_tokens(self.user)['access']
+
+        res = await self.async_client.get(
+            ME_ASYNC_URL, headers={'Authorization': f'Bearer {access}'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['email'], 'test@example.com')
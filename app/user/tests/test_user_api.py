@@ -10,6 +10,7 @@ from rest_framework import status
 
 
 CREATE_USER_URL = reverse('user:create')
+CREATE_BATCH_URL = reverse('user:create-batch')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
 
@@ -165,6 +166,25 @@ class PrivateUserApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
+    def test_retrieve_profile_not_modified(self):
+        """Test an unchanged profile answers 304 without queries."""
+        res = self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_profile_modified_after_update(self):
+        """Test a profile update changes the ETag."""
+        etag = self.client.get(ME_URL)['ETag']
+        self.client.patch(ME_URL, {'first_name': 'Changed'})
+
+        res = self.client.get(ME_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['first_name'], 'Changed')
+
     def test_update_user_profile(self):
         """Test updating the user profile for the authenticated user."""
         payload = {
@@ -180,3 +200,83 @@ class PrivateUserApiTests(TestCase):
         self.assertEqual(self.user.last_name, payload['last_name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class UserBatchApiTests(TestCase):
+    """Test the batch registration API."""
+
+    def setUp(self):
+        self.company = create_user(
+            email='company@test.com',
+            password='test-password123',
+            role='COMPANY',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.company)
+
+    def user_payload(self, index, **params):
+        payload = {
+            'email': f'user{index}@example.com',
+            'password': 'testpass123',
+            'first_name': 'Test',
+            'last_name': f'User {index}',
+            'role': 'TALENT',
+        }
+        payload.update(params)
+        return payload
+
+    def test_create_users_in_batch(self):
+        """Test a valid batch creates every user with a usable password."""
+        payload = [self.user_payload(i) for i in range(3)]
+
+        res = self.client.post(CREATE_BATCH_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([user['email'] for user in res.data],
+                         [user['email'] for user in payload])
+        for item in payload:
+            user = get_user_model().objects.get(email=item['email'])
+            self.assertTrue(user.check_password(item['password']))
+            self.assertNotIn('password', res.data[0])
+
+    def test_batch_reports_errors_per_item(self):
+        """Test invalid rows are reported by index and nothing is saved."""
+        payload = [
+            self.user_payload(0),
+            self.user_payload(1, password='abc'),
+            self.user_payload(2, email='company@test.com'),
+            self.user_payload(0, last_name='Duplicate'),
+            self.user_payload(4, role='CANDIDATE'),
+        ]
+
+        res = self.client.post(CREATE_BATCH_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {item['index']: item['errors'] for item in res.data['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertIn('password', errors[1])
+        self.assertIn('email', errors[2])
+        self.assertIn('email', errors[3])
+        self.assertIn('role', errors[4])
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_batch_requires_list(self):
+        """Test a payload that is not a list is rejected."""
+        res = self.client.post(CREATE_BATCH_URL, self.user_payload(0),
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_not_allowed_for_talents(self):
+        """Test talent accounts cannot register users in batch."""
+        talent = create_user(
+            email='talent@test.com',
+            password='test-password123',
+            role='TALENT',
+        )
+        self.client.force_authenticate(user=talent)
+
+        res = self.client.post(CREATE_BATCH_URL, [self.user_payload(0)],
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
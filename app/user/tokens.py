@@ -0,0 +1,182 @@
+"""
+Signed access and refresh tokens.
+
+Access tokens carry the user's id, role and staff flag and are verified
+with an HMAC over ``SECRET_KEY``, without a database query. They cannot
+be revoked, so they are short-lived. Refresh tokens are single use:
+refreshing revokes the presented token and issues a new pair. They also
+carry a fingerprint of the password hash, so changing the password
+invalidates every outstanding refresh token.
+"""
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from rest_framework import exceptions
+
+from core.models import RevokedToken
+
+ACCESS_SALT = 'user.tokens.access'
+REFRESH_SALT = 'user.tokens.refresh'
+PASSWORD_SALT = 'user.tokens.password'
+
+
+class TokenUser:
+    """User described by a verified access token.
+
+    Exposes what permission checks need without loading the user. Views
+    that need the full user call ``get_user()``, which loads it once.
+    """
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+    is_superuser = False
+
+    def __init__(self, payload):
+        self.pk = self.id = payload['u']
+        self.role = payload['r']
+        self.is_staff = bool(payload['s'])
+        self._user = None
+
+    def get_user(self):
+        """Return the ``User`` this token was issued to."""
+        if self._user is None:
+            self._user = load_user(self.pk)
+        return self._user
+
+    async def aget_user(self):
+        """Async version of ``get_user``."""
+        if self._user is None:
+            self._user = await aload_user(self.pk)
+        return self._user
+
+    def __str__(self):
+        return f'TokenUser {self.pk}'
+
+
+def resolve_user(user):
+    """Return the model instance behind ``request.user``."""
+    if isinstance(user, TokenUser):
+        return user.get_user()
+    return user
+
+
+def password_fingerprint(user):
+    """Return a short digest that changes with ``user``'s password."""
+    return salted_hmac(PASSWORD_SALT, user.password).hexdigest()[:16]
+
+
+def issue_tokens(user):
+    """Return a new access and refresh token pair for ``user``."""
+    config = settings.AUTH_TOKENS
+    access = signing.dumps(
+        {'u': user.pk, 'r': user.role, 's': int(user.is_staff)},
+        salt=ACCESS_SALT,
+    )
+    refresh = signing.dumps(
+        {'u': user.pk, 'j': secrets.token_urlsafe(12),
+         'p': password_fingerprint(user)},
+        salt=REFRESH_SALT,
+    )
+    return {
+        'access': access,
+        'refresh': refresh,
+        'token_type': 'Bearer',
+        'expires_in': config['ACCESS_TTL'],
+    }
+
+
+def verify_access(token):
+    """Return the ``TokenUser`` of a valid access token.
+
+    Raises ``AuthenticationFailed`` for expired or tampered tokens.
+    """
+    try:
+        payload = signing.loads(token, salt=ACCESS_SALT,
+                                max_age=settings.AUTH_TOKENS['ACCESS_TTL'])
+    except signing.SignatureExpired:
+        raise exceptions.AuthenticationFailed(_('Token has expired.'))
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed(_('Invalid token.'))
+    return TokenUser(payload)
+
+
+def _load_refresh(token):
+    try:
+        return signing.loads(token, salt=REFRESH_SALT,
+                             max_age=settings.AUTH_TOKENS['REFRESH_TTL'])
+    except signing.SignatureExpired:
+        raise exceptions.AuthenticationFailed(_('Token has expired.'))
+    except signing.BadSignature:
+        raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+
+def _revoke(payload):
+    """Add a refresh token to the revocation list.
+
+    Returns False if it already was revoked. The unique ``jti`` makes the
+    insert itself the check, so two concurrent refreshes with the same
+    token cannot both succeed. Expired entries are pruned on the way.
+    """
+    now = timezone.now()
+    ttl = timedelta(seconds=settings.AUTH_TOKENS['REFRESH_TTL'])
+    RevokedToken.objects.filter(expires_at__lt=now).delete()
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=payload['j'],
+                                        expires_at=now + ttl)
+    except IntegrityError:
+        return False
+    return True
+
+
+def refresh_tokens(token):
+    """Exchange a refresh token for a new token pair.
+
+    The presented token is revoked, so it works only once. Tokens issued
+    before the user's last password change are rejected.
+    """
+    payload = _load_refresh(token)
+    user = load_user(payload['u'])
+    if not constant_time_compare(payload.get('p', ''),
+                                 password_fingerprint(user)):
+        raise exceptions.AuthenticationFailed(_('Token has been revoked.'))
+    if not _revoke(payload):
+        raise exceptions.AuthenticationFailed(_('Token has been revoked.'))
+    return issue_tokens(user)
+
+
+def revoke_token(token):
+    """Revoke a refresh token, e.g. on logout."""
+    _revoke(_load_refresh(token))
+
+
+def load_user(pk):
+    """Return the active user ``pk`` or fail authentication."""
+    user = get_user_model()._default_manager.filter(
+        pk=pk, is_active=True
+    ).first()
+    if user is None:
+        raise exceptions.AuthenticationFailed(
+            _('User inactive or deleted.')
+        )
+    return user
+
+
+async def aload_user(pk):
+    """Async version of ``load_user``."""
+    user = await get_user_model()._default_manager.filter(
+        pk=pk, is_active=True
+    ).afirst()
+    if user is None:
+        raise exceptions.AuthenticationFailed(
+            _('User inactive or deleted.')
+        )
+    return user
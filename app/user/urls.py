@@ -10,6 +10,14 @@ app_name = 'user'
 
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
+    path('create/batch/', views.CreateUserBatchView.as_view(),
+         name='create-batch'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
-    path('me/', views.ManageUserView.as_view(), name='me')
+    path('token/async/', views.create_token_async, name='token-async'),
+    path('token/refresh/', views.RefreshTokenView.as_view(),
+         name='token-refresh'),
+    path('token/revoke/', views.RevokeTokenView.as_view(),
+         name='token-revoke'),
+    path('me/', views.ManageUserView.as_view(), name='me'),
+    path('me/async/', views.me_async, name='me-async'),
 ]
@@ -1,14 +1,52 @@
 """
 Views for the user API.
 """
-from rest_framework import generics, authentication, permissions
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.utils.translation import gettext as _
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import (
+    condition,
+    require_POST,
+    require_safe,
+)
+
+from rest_framework import generics, permissions, status
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from drf_spectacular.utils import extend_schema
 
+from core.http import json_response, not_modified
+from user.authentication import (
+    CachedTokenAuthentication,
+    SignedTokenAuthentication,
+    aauthenticate_token,
+)
+from user.bulk import create_users, validate_users
+from user.hashing import PoolSaturated, get_password_executor, verify_password
+from user.permissions import IsCompanyOrStaff
 from user.serializers import (
     UserSerializer,
+    AuthCredentialsSerializer,
     AuthTokenSerializer,
+    RefreshTokenSerializer,
+    TokenPairSerializer,
     )
+from user.tokens import (
+    TokenUser,
+    issue_tokens,
+    refresh_tokens,
+    resolve_user,
+    revoke_token,
+)
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -16,18 +54,220 @@ class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
+class CreateUserBatchView(generics.GenericAPIView):
+    """Create many users in one request.
+
+    Every row is validated first; if any row fails, nothing is created and
+    the errors are returned per row index.
+    """
+    serializer_class = UserSerializer
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated, IsCompanyOrStaff]
+    max_batch_size = 1000
+
+    @extend_schema(request=UserSerializer(many=True),
+                   responses={201: UserSerializer(many=True)})
+    def post(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {'detail': _('Expected a non-empty list of users.')},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > self.max_batch_size:
+            return Response(
+                {'detail': _('At most %(max)d users per request.') % {
+                    'max': self.max_batch_size}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        valid, errors = validate_users(rows)
+        if errors:
+            return Response(
+                {'errors': [{'index': index, 'errors': errors[index]}
+                            for index in sorted(errors)]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            users = create_users([valid[index]
+                                  for index in range(len(rows))])
+        except IntegrityError:
+            return Response(
+                {'detail': _('Some of these users were just created by '
+                             'another request.')},
+                status=status.HTTP_409_CONFLICT,
+            )
+        serializer = self.get_serializer(users, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+def signed_tokens_enabled():
+    """Return whether logins issue signed tokens instead of opaque ones."""
+    return settings.AUTH_TOKENS['MODE'] == 'signed'
+
+
 class CreateTokenView(ObtainAuthToken):
-    """Create a new auth token for user."""
+    """Create a new auth token for user.
+
+    Issues a signed access and refresh token pair when
+    ``AUTH_TOKENS['MODE']`` is ``'signed'``.
+    """
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
+    def post(self, request, *args, **kwargs):
+        if not signed_tokens_enabled():
+            return super().post(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(issue_tokens(serializer.validated_data['user']))
+
+
+class RefreshTokenGrantView(generics.GenericAPIView):
+    """Base for views authenticated by the refresh token in the body.
+
+    Any ``Authorization`` header is ignored, so an expired access token
+    sent along does not get in the way.
+    """
+    serializer_class = RefreshTokenSerializer
+    authentication_classes = []
+
+    def get_authenticate_header(self, request):
+        return SignedTokenAuthentication.keyword
+
+
+class RefreshTokenView(RefreshTokenGrantView):
+    """Exchange a refresh token for a new token pair."""
+
+    @extend_schema(responses={200: TokenPairSerializer})
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(refresh_tokens(serializer.validated_data['refresh']))
+
+
+class RevokeTokenView(RefreshTokenGrantView):
+    """Revoke a refresh token, e.g. on logout."""
 
+    @extend_schema(responses={204: None})
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke_token(serializer.validated_data['refresh'])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def user_etag(user):
+    """ETag for a user's profile."""
+    return f'user-{user.pk}-{user.updated_at.timestamp()}'
+
+
+def me_etag(request, *args, **kwargs):
+    return user_etag(resolve_user(request.user))
+
+
+def me_last_modified(request, *args, **kwargs):
+    return resolve_user(request.user).updated_at
+
+
+@method_decorator(
+    condition(etag_func=me_etag, last_modified_func=me_last_modified),
+    name='get',
+)
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         """Retrieve and return the authenticated user."""
-        return self.request.user
+        return resolve_user(self.request.user)
+
+
+@csrf_exempt
+@require_POST
+async def create_token_async(request):
+    """Create a new auth token for user without blocking the event loop.
+
+    Served natively by the ASGI application. Password verification runs in
+    the bounded hashing pool; when it is full the client gets a 503 with
+    ``Retry-After`` rather than waiting in an unbounded queue.
+    """
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'detail': _('Malformed JSON.')}, status=400)
+    else:
+        data = request.POST
+
+    serializer = AuthCredentialsSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    email = serializer.validated_data['email']
+    password = serializer.validated_data['password']
+
+    user_model = get_user_model()
+    try:
+        user = await user_model._default_manager.aget(
+            **{user_model.USERNAME_FIELD: email}
+        )
+    except user_model.DoesNotExist:
+        user = None
+
+    try:
+        is_correct, new_hash = await get_password_executor().run(
+            verify_password, password, user.password if user else None
+        )
+    except PoolSaturated:
+        response = JsonResponse(
+            {'detail': _('Too many logins in progress, try again shortly.')},
+            status=503,
+        )
+        response['Retry-After'] = '1'
+        return response
+
+    if not is_correct or not user.is_active:
+        msg = _('Unable to authenticate with provided credentials.')
+        return JsonResponse({'non_field_errors': [msg]}, status=400)
+
+    if new_hash:
+        user.password = new_hash
+        await user.asave(update_fields=['password'])
+
+    if signed_tokens_enabled():
+        return JsonResponse(issue_tokens(user))
+    token, created = await Token.objects.aget_or_create(user=user)
+    return JsonResponse({'token': token.key})
+
+
+@require_safe
+async def me_async(request):
+    """Retrieve the authenticated user without leaving the event loop.
+
+    Authenticates with the same token cache as ``ManageUserView``.
+    """
+    try:
+        auth = await aauthenticate_token(request)
+        user = auth and auth[0]
+        if isinstance(user, TokenUser):
+            user = await user.aget_user()
+    except AuthenticationFailed as exc:
+        auth, detail = None, exc.detail
+    else:
+        detail = _('Authentication credentials were not provided.')
+    if auth is None:
+        response = json_response({'detail': detail}, status=401)
+        response['WWW-Authenticate'] = 'Token'
+        return response
+
+    etag = user_etag(user)
+    response = not_modified(request, etag, user.updated_at)
+    if response is not None:
+        return response
+    return json_response(UserSerializer(user).data, etag=etag,
+                         last_modified=user.updated_at)